@@ -0,0 +1,209 @@
+"""
+Hit ratio of the W-TinyLFU response cache against plain LRU on access traces.
+
+Both caches are bounded by the same number of bytes. Each trace is replayed
+against both: a request that misses stores its payload weight. The request
+hit ratio and the byte hit ratio (the share of bytes served from memory) are
+reported for each cache size.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_cache                        # synthetic traces
+    python -m benchmarks.bench_cache --trace recorded.jsonl --capacity-mb 4 16
+
+A recorded trace is a JSON-lines file with one ``{"key": ..., "size": ...}``
+object per request, ``size`` being the response body in bytes. Without one,
+traces are synthesized from the server's traffic shape:
+
+- ``zipf``: forecast and state-alert URLs with Zipf-distributed popularity;
+- ``zipf+nationwide``: the same, plus periodic multi-megabyte one-off fetches
+  (nationwide or ad hoc area alert queries);
+- ``zipf+scan``: the same, plus batch sweeps over coordinates that are never
+  requested again.
+"""
+
+import argparse
+import itertools
+import json
+import random
+from collections import OrderedDict
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any
+
+from src.weather.tinylfu import WTinyLFUCache
+
+Trace = list[tuple[str, int]]
+
+
+class LRUCache:
+    """
+    Byte-bounded least-recently-used cache, the baseline policy.
+    """
+
+    def __init__(self, max_weight: int) -> None:
+        self.max_weight = max_weight
+        self.weight = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        self._entries.move_to_end(key)
+        return item[0]
+
+    def put(self, key: Hashable, value: Any, weight: int) -> bool:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.weight -= old[1]
+        if weight > self.max_weight:
+            return False
+        self._entries[key] = (value, weight)
+        self.weight += weight
+        while self.weight > self.max_weight:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.weight -= evicted
+        return True
+
+
+def _zipf_sampler(rng: random.Random, keys: list[str], exponent: float):
+    cumulative = list(
+        itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(len(keys)))
+    )
+    return lambda count: rng.choices(keys, cum_weights=cumulative, k=count)
+
+
+def synthetic_trace(
+    kind: str = "zipf", requests: int = 100_000, seed: int = 1
+) -> Trace:
+    """
+    Generate a trace in the server's traffic shape.
+
+    Args:
+        kind: ``zipf``, ``zipf+nationwide`` or ``zipf+scan``.
+        requests: Number of requests.
+        seed: Random seed; the same arguments give the same trace.
+
+    Returns:
+        Trace: ``(key, size)`` pairs in request order.
+    """
+    rng = random.Random(seed)
+    forecasts = [
+        f"/gridpoints/X{n % 120}/{n},{n * 7 % 100}/forecast" for n in range(5000)
+    ]
+    states = [f"/alerts/active?area=S{n}" for n in range(56)]
+    sizes = {key: rng.randint(12_000, 40_000) for key in forecasts}
+    sizes.update({key: rng.randint(2_000, 400_000) for key in states})
+    sample_forecast = _zipf_sampler(rng, forecasts, 0.9)
+    sample_state = _zipf_sampler(rng, states, 0.8)
+    trace: Trace = []
+    one_offs = 0
+    while len(trace) < requests:
+        if rng.random() < 0.8:
+            key = sample_forecast(1)[0]
+        else:
+            key = sample_state(1)[0]
+        trace.append((key, sizes[key]))
+        position = len(trace)
+        if kind == "zipf+nationwide" and position % 250 == 0:
+            one_offs += 1
+            trace.append((f"/alerts/active?q={one_offs}", rng.randint(2, 8) << 20))
+        elif kind == "zipf+scan" and position % 2000 == 0:
+            for _ in range(300):
+                one_offs += 1
+                trace.append((f"/points/scan/{one_offs}", rng.randint(12_000, 40_000)))
+    return trace[:requests]
+
+
+def load_trace(path: Path) -> Trace:
+    """
+    Read a recorded JSON-lines trace.
+    """
+    trace: Trace = []
+    with path.open() as lines:
+        for line in lines:
+            if line.strip():
+                record = json.loads(line)
+                trace.append((str(record["key"]), int(record["size"])))
+    return trace
+
+
+def replay(cache: Any, trace: Trace) -> dict[str, float]:
+    """
+    Replay a trace, storing each miss, and return hit ratios.
+    """
+    hits = hit_bytes = total_bytes = 0
+    for key, size in trace:
+        total_bytes += size
+        if cache.get(key) is not None:
+            hits += 1
+            hit_bytes += size
+        else:
+            cache.put(key, True, size)
+    return {
+        "hit_ratio": round(hits / len(trace), 4) if trace else 0.0,
+        "byte_hit_ratio": round(hit_bytes / total_bytes, 4) if total_bytes else 0.0,
+    }
+
+
+def run(traces: dict[str, Trace], capacities_mb: list[float]) -> list[dict[str, Any]]:
+    """
+    Replay every trace against both policies at every capacity.
+
+    Returns:
+        list[dict[str, Any]]: One row per trace and capacity.
+    """
+    rows = []
+    for name, trace in traces.items():
+        for capacity in capacities_mb:
+            max_weight = int(capacity * 1024 * 1024)
+            rows.append(
+                {
+                    "trace": name,
+                    "capacity_mb": capacity,
+                    "lru": replay(LRUCache(max_weight), trace),
+                    "w_tinylfu": replay(WTinyLFUCache(max_weight), trace),
+                }
+            )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", type=Path, action="append", default=[])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--capacity-mb", type=float, nargs="+", default=[4.0, 16.0, 64.0]
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args()
+
+    if args.trace:
+        traces = {path.name: load_trace(path) for path in args.trace}
+    else:
+        traces = {
+            kind: synthetic_trace(kind, args.requests, args.seed)
+            for kind in ("zipf", "zipf+nationwide", "zipf+scan")
+        }
+    rows = run(traces, args.capacity_mb)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    print(
+        f"{'trace':<20}{'MB':>6}{'LRU hit':>10}{'TinyLFU hit':>13}"
+        f"{'LRU byte':>10}{'TinyLFU byte':>14}"
+    )
+    for row in rows:
+        lru, tiny = row["lru"], row["w_tinylfu"]
+        print(
+            f"{row['trace']:<20}{row['capacity_mb']:>6g}"
+            f"{lru['hit_ratio']:>10.3f}{tiny['hit_ratio']:>13.3f}"
+            f"{lru['byte_hit_ratio']:>10.3f}{tiny['byte_hit_ratio']:>14.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,316 @@
+"""
+Micro-benchmarks for the per-call CPU hot paths, with a regression check.
+
+Covers JSON decoding and streamed alert parsing of small-state, large-state
+and nationwide alert payloads, ``get_alerts_data`` feature extraction, alert
+and forecast formatting, and tool input validation. Timings are divided by a
+fixed pure-Python calibration loop, so a baseline saved on one machine can be
+checked on another without the network or a stub server.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_micro                     # print timings
+    python -m benchmarks.bench_micro --save-baseline     # record a baseline
+    python -m benchmarks.bench_micro --check             # fail on regressions
+
+Payloads are synthesized in the NWS shape by default. Recorded responses can
+be used instead by passing ``--payload-dir`` with ``small_state.json``,
+``large_state.json`` and ``nationwide.json``.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from typing import Any
+
+from benchmarks.stub_nws import alert_feature, forecast_payload
+from src.weather.json_stream import FeatureStreamParser
+from src.weather.models import Alert, parse_forecast_payload
+from src.weather.render import RenderCache
+from src.weather.server import (
+    US_STATES,
+    format_alert,
+    get_alerts_data,
+    is_valid_state,
+    validate_coordinates,
+)
+
+BASELINE = Path(__file__).resolve().parent / "baseline_micro.json"
+PAYLOADS = ("small_state", "large_state", "nationwide")
+CHUNK_SIZE = 65536
+
+
+def polygon(lon: float, lat: float, vertices: int) -> dict[str, Any]:
+    """
+    Return a closed polygon with ``vertices`` points, like NWS alert geometry.
+    """
+    ring = [
+        [round(lon + (i % 7) * 0.01, 4), round(lat + (i // 7) * 0.01, 4)]
+        for i in range(vertices)
+    ]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def synthetic_alerts(
+    states: list[str], per_state: int, description_bytes: int, vertices: int
+) -> dict[str, Any]:
+    """
+    Build an alerts FeatureCollection in the NWS shape.
+    """
+    features = []
+    for state in states:
+        for n in range(per_state):
+            feature = alert_feature(state, n, description_bytes)
+            feature["geometry"] = polygon(-120.0 + n % 10, 35.0 + n % 7, vertices)
+            features.append(feature)
+    return {"type": "FeatureCollection", "features": features, "title": "Alerts"}
+
+
+def load_payloads(payload_dir: Path | None) -> dict[str, bytes]:
+    """
+    Return raw alert payloads by name, recorded or synthesized.
+    """
+    if payload_dir is not None:
+        return {name: (payload_dir / f"{name}.json").read_bytes() for name in PAYLOADS}
+    payloads = {
+        "small_state": synthetic_alerts(["CA"], 4, 800, 12),
+        "large_state": synthetic_alerts(["TX"], 150, 1500, 40),
+        "nationwide": synthetic_alerts(sorted(US_STATES), 30, 1200, 40),
+    }
+    return {name: json.dumps(data).encode() for name, data in payloads.items()}
+
+
+class PayloadClient:
+    """
+    Stand-in for ``NWSClient`` that returns one parsed payload.
+    """
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+
+    async def _make_request(self, url: str) -> dict[str, Any]:
+        return self.payload
+
+
+def run_ready(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine that never suspends, without event loop overhead.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("benchmarked coroutine suspended")
+
+
+def stream_parse(text: str) -> dict[str, Any]:
+    """
+    Parse an alerts body in chunks, building ``Alert`` objects as it goes.
+    """
+    parser = FeatureStreamParser(Alert.from_feature)
+    for start in range(0, len(text), CHUNK_SIZE):
+        parser.feed(text[start : start + CHUNK_SIZE])
+    return parser.close()
+
+
+def build_benchmarks(payloads: dict[str, bytes]) -> dict[str, Callable[[], Any]]:
+    """
+    Return zero-argument callables to time, by benchmark name.
+    """
+    benchmarks: dict[str, Callable[[], Any]] = {}
+    for name, raw in payloads.items():
+        text = raw.decode()
+        benchmarks[f"decode_json[{name}]"] = lambda raw=raw: json.loads(raw)
+        benchmarks[f"stream_parse_alerts[{name}]"] = lambda text=text: stream_parse(
+            text
+        )
+
+    large = json.loads(payloads["large_state"])
+    client = PayloadClient(large)
+    benchmarks["get_alerts_data[large_state]"] = lambda: run_ready(
+        get_alerts_data("TX", client=client)
+    )
+
+    alerts = [Alert.from_feature(feature) for feature in large["features"]]
+    benchmarks["format_alert[large_state]"] = lambda: [
+        format_alert(alert) for alert in alerts
+    ]
+    uncached = RenderCache(max_entries=0)
+    memoized = RenderCache()
+    benchmarks["render_alerts[large_state]"] = lambda: uncached.render(
+        "alerts", "text", alerts
+    )
+    benchmarks["render_alerts_memoized[large_state]"] = lambda: memoized.render(
+        "alerts", "text", alerts
+    )
+    benchmarks["render_alerts_json[large_state]"] = lambda: uncached.render(
+        "alerts", "json", alerts
+    )
+
+    forecast = parse_forecast_payload(forecast_payload("STB", 1, 2, 14, hourly=False))
+    periods = forecast["properties"]["periods"]
+    benchmarks["format_forecast"] = lambda: uncached.render(
+        "forecast", "text", periods[:5]
+    )
+
+    states = ["CA", "ny", "TX", "ZZ", "", None, 123, "WY", "C1", "CAL"]
+    benchmarks["validate_state[x10]"] = lambda: [is_valid_state(s) for s in states]
+    points = [(34.05, -118.25), ("40.7", "-74.0"), (91, 0), ("x", 1), (None, None)]
+    benchmarks["validate_coordinates[x5]"] = lambda: [
+        validate_coordinates(lat, lon) for lat, lon in points
+    ]
+    return benchmarks
+
+
+def time_call(fn: Callable[[], Any], min_time: float, repeat: int) -> float:
+    """
+    Return the best per-call time of ``fn`` in seconds.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    best = min([elapsed, *timer.repeat(repeat=repeat - 1, number=number)])
+    return best / number
+
+
+def calibrate(min_time: float, repeat: int) -> float:
+    """
+    Time a fixed pure-Python workload used to normalize results across hosts.
+    """
+
+    def workload() -> int:
+        total = 0
+        for i in range(2000):
+            total += len(str(i)) * (i % 7)
+        return total
+
+    return time_call(workload, min_time, repeat)
+
+
+def run(
+    payloads: dict[str, bytes],
+    min_time: float = 0.1,
+    repeat: int = 5,
+    only: str | None = None,
+    rounds: int = 3,
+) -> dict[str, Any]:
+    """
+    Time every benchmark and return raw and normalized results.
+
+    Args:
+        payloads: Raw alert payloads by name.
+        min_time: Minimum seconds per timing run.
+        repeat: Timing runs per benchmark; the fastest is kept.
+        only: Substring selecting a subset of benchmarks.
+        rounds: Passes over all benchmarks; each keeps its best pass.
+
+    Returns:
+        dict[str, Any]: ``calibration_us`` (fastest calibration run) and, per
+        benchmark, ``us`` (per call) and ``normalized`` (per call divided by
+        the calibration time measured just before it).
+    """
+    benchmarks = {
+        name: fn
+        for name, fn in build_benchmarks(payloads).items()
+        if not only or only in name
+    }
+    calibrations = []
+    results: dict[str, dict[str, float]] = {}
+    for _ in range(max(1, rounds)):
+        for name, fn in benchmarks.items():
+            # Calibrate next to every benchmark so drifting host speed (CPU
+            # frequency changes, noisy neighbours) affects both sides equally
+            calibration = calibrate(min_time, repeat)
+            seconds = time_call(fn, min_time, repeat)
+            calibrations.append(calibration)
+            normalized = seconds / calibration
+            best = results.get(name)
+            if best is None or normalized < best["normalized"]:
+                results[name] = {
+                    "us": round(seconds * 1e6, 3),
+                    "normalized": round(normalized, 4),
+                }
+    calibration = min(calibrations, default=0.0)
+    return {"calibration_us": round(calibration * 1e6, 3), "benchmarks": results}
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[tuple[str, float]]:
+    """
+    Return ``(name, ratio)`` for benchmarks slower than baseline by more than
+    ``tolerance`` (0.5 allows a 50% slowdown), using normalized timings.
+    """
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if not reference:
+            continue
+        ratio = result["normalized"] / reference["normalized"]
+        if ratio > 1.0 + tolerance:
+            regressions.append((name, round(ratio, 3)))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payload-dir", type=Path)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--only", help="run benchmarks whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args()
+
+    current = run(
+        load_payloads(args.payload_dir),
+        args.min_time,
+        args.repeat,
+        args.only,
+        args.rounds,
+    )
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    if args.json:
+        print(json.dumps(current, indent=2))
+    else:
+        print(f"calibration: {current['calibration_us']} µs")
+        print(f"{'benchmark':<42}{'µs/call':>12}{'normalized':>12}{'vs base':>10}")
+        for name, result in current["benchmarks"].items():
+            reference = (baseline or {"benchmarks": {}})["benchmarks"].get(name)
+            ratio = (
+                f"{result['normalized'] / reference['normalized']:.2f}x"
+                if reference
+                else "-"
+            )
+            print(f"{name:<42}{result['us']:>12}{result['normalized']:>12}{ratio:>10}")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Saved baseline {args.baseline}")
+        return 0
+    if args.check:
+        if baseline is None:
+            print(f"No baseline at {args.baseline}", file=sys.stderr)
+            return 1
+        regressions = compare(current, baseline, args.tolerance)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio}x baseline", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
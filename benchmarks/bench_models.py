@@ -0,0 +1,146 @@
+"""
+Memory and construction-time comparison of typed models against plain dicts.
+
+Builds ``--count`` alerts and forecast periods both as the per-item dicts the
+server used to pass around and as ``Alert``/``ForecastPeriod`` objects, and
+reports the retained memory and build time of each.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_models --count 50000
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.weather.models import Alert, ForecastPeriod
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+ALERT_PROPERTIES = (
+    "headline",
+    "event",
+    "severity",
+    "areaDesc",
+    "description",
+    "instruction",
+)
+
+
+def alert_dict(feature: dict[str, Any]) -> dict[str, Any]:
+    """
+    Build the per-alert summary dict (plus zones) used before typed models.
+    """
+    props = feature.get("properties", {})
+    summary = {name: props.get(name) for name in ALERT_PROPERTIES}
+    summary["zones"] = list((props.get("geocode") or {}).get("UGC") or [])
+    return summary
+
+
+def period_dict(period: dict[str, Any]) -> dict[str, Any]:
+    """
+    Copy of a raw forecast period, as the server kept it before typed models.
+    """
+    return dict(period)
+
+
+def synthetic_alerts(count: int) -> list[dict[str, Any]]:
+    """
+    Return ``count`` distinct alert features derived from the sample fixture.
+    """
+    template = json.loads((FIXTURES / "sample_alerts_response.json").read_text())
+    base = template["features"]
+    features = []
+    for i in range(count):
+        feature = json.loads(json.dumps(base[i % len(base)]))
+        feature["id"] = f"{feature['id']}.{i}"
+        feature["properties"]["headline"] = f"{feature['properties']['headline']} #{i}"
+        features.append(feature)
+    return features
+
+
+def synthetic_periods(count: int) -> list[dict[str, Any]]:
+    """
+    Return ``count`` distinct forecast periods derived from the sample fixture.
+    """
+    template = json.loads((FIXTURES / "sample_forecast_response.json").read_text())
+    base = template["properties"]["periods"]
+    periods = []
+    for i in range(count):
+        period = dict(base[i % len(base)])
+        period["name"] = f"{period['name']} #{i}"
+        periods.append(period)
+    return periods
+
+
+def measure(
+    build: Callable[[Any], Any], items: list[Any], repeat: int
+) -> tuple[int, float]:
+    """
+    Return the retained bytes of ``build`` applied to every item and the best
+    per-item construction time in microseconds.
+    """
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    built = [build(item) for item in items]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del built
+    seconds = min(
+        timeit.repeat(lambda: [build(item) for item in items], number=1, repeat=repeat)
+    )
+    return retained, seconds / len(items) * 1e6
+
+
+def run(count: int, repeat: int) -> list[dict[str, Any]]:
+    """
+    Run every comparison and return one result row per representation.
+    """
+    alerts = synthetic_alerts(count)
+    periods = synthetic_periods(count)
+    cases = [
+        ("alert", "dict", alert_dict, alerts),
+        ("alert", "Alert", Alert.from_feature, alerts),
+        ("period", "dict", period_dict, periods),
+        ("period", "ForecastPeriod", ForecastPeriod.from_api, periods),
+    ]
+    rows = []
+    for kind, representation, build, items in cases:
+        retained, per_item_us = measure(build, items, repeat)
+        rows.append(
+            {
+                "kind": kind,
+                "representation": representation,
+                "count": count,
+                "bytes_per_item": round(retained / count, 1),
+                "build_us_per_item": round(per_item_us, 3),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print JSON rows")
+    args = parser.parse_args()
+    rows = run(args.count, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'kind':<8}{'representation':<16}{'bytes/item':>12}{'build µs/item':>16}")
+    for row in rows:
+        print(
+            f"{row['kind']:<8}{row['representation']:<16}"
+            f"{row['bytes_per_item']:>12}{row['build_us_per_item']:>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
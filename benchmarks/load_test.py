@@ -0,0 +1,373 @@
+"""
+End-to-end load test of the MCP server against a local stub NWS.
+
+Starts ``benchmarks.stub_nws`` and the real ``mcp.streamable_http_app()``
+under uvicorn on loopback ports, points the shared upstream pool at the stub,
+then drives the server with many concurrent MCP client sessions. Reports
+requests/sec, latency percentiles and upstream calls per tool call, and
+writes the results as JSON so runs can be compared across commits.
+
+Run from the repository root::
+
+    python -m benchmarks.load_test --clients 50 --calls 40 --latency 0.05
+
+All three parts share one process and event loop, so absolute numbers include
+client overhead; compare runs made with the same settings on the same host.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import socket
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.stub_nws import StubConfig, StubNWS
+from src.weather import http_pool
+from src.weather.http_pool import PoolConfig, UpstreamPool
+from src.weather.rate_limit import AdaptiveRateLimiter
+from src.weather.server import US_STATES, mcp
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class StubTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that sends every request to the stub server over loopback.
+
+    Requests keep their original URL (and so their cache keys and endpoint
+    names); only the connection target is rewritten. The inner connection
+    pool is recreated if the pool closes its client between sessions.
+    """
+
+    def __init__(self, port: int, limits: httpx.Limits) -> None:
+        self.port = port
+        self.limits = limits
+        self._inner: httpx.AsyncHTTPTransport | None = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport(limits=self.limits)
+        request.url = request.url.copy_with(
+            scheme="http", host="127.0.0.1", port=self.port
+        )
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            inner, self._inner = self._inner, None
+            await inner.aclose()
+
+
+@dataclass
+class Workload:
+    """
+    Mix of tool calls issued by each simulated client.
+
+    Attributes:
+        forecast_weight: Relative share of ``get_forecast`` calls.
+        alerts_weight: Relative share of ``get_alerts`` calls.
+        locations: Distinct coordinates forecasts are drawn from.
+        states: State codes alerts are drawn from.
+        seed: Seed for drawing calls.
+    """
+
+    forecast_weight: float = 3.0
+    alerts_weight: float = 1.0
+    locations: int = 200
+    states: list[str] = field(default_factory=lambda: sorted(US_STATES))
+    seed: int = 0
+
+    def calls(self, client: int, count: int) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Return the tool calls one client makes, deterministically per client.
+        """
+        rng = random.Random(f"{self.seed}:{client}")
+        coordinates = Workload.coordinates(self.locations, self.seed)
+        choices = []
+        for _ in range(count):
+            if rng.random() * (self.forecast_weight + self.alerts_weight) < (
+                self.forecast_weight
+            ):
+                lat, lon = rng.choice(coordinates)
+                choices.append(("get_forecast", {"latitude": lat, "longitude": lon}))
+            else:
+                choices.append(("get_alerts", {"state": rng.choice(self.states)}))
+        return choices
+
+    @staticmethod
+    def coordinates(count: int, seed: int) -> list[tuple[float, float]]:
+        """
+        Return ``count`` reproducible coordinates in the contiguous US.
+        """
+        rng = random.Random(seed)
+        return [
+            (round(rng.uniform(25.0, 49.0), 4), round(rng.uniform(-124.0, -67.0), 4))
+            for _ in range(count)
+        ]
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """
+    Return the nearest-rank percentile of an already sorted list.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def latency_summary(seconds: list[float]) -> dict[str, float]:
+    """
+    Summarize latencies (in seconds) as milliseconds.
+    """
+    ordered = sorted(seconds)
+    mean = sum(ordered) / len(ordered) if ordered else 0.0
+    return {
+        "p50": round(percentile(ordered, 50) * 1000, 3),
+        "p95": round(percentile(ordered, 95) * 1000, 3),
+        "p99": round(percentile(ordered, 99) * 1000, 3),
+        "max": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+        "mean": round(mean * 1000, 3),
+    }
+
+
+def loopback_socket() -> socket.socket:
+    """
+    Bind a listening socket to an ephemeral loopback port.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+async def serve(app: Any) -> tuple[uvicorn.Server, asyncio.Task, int]:
+    """
+    Serve an ASGI app on a loopback port until ``server.should_exit`` is set.
+    """
+    sock = loopback_socket()
+    server = uvicorn.Server(
+        uvicorn.Config(app, log_level="warning", lifespan="on", access_log=False)
+    )
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task, sock.getsockname()[1]
+
+
+async def run_client(
+    url: str,
+    calls: list[tuple[str, dict[str, Any]]],
+    latencies: dict[str, list[float]],
+    outcomes: dict[str, int],
+) -> None:
+    """
+    Open one MCP session and issue ``calls`` sequentially.
+    """
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for tool, arguments in calls:
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool(tool, arguments)
+                except Exception:
+                    outcomes["failed"] += 1
+                    continue
+                latencies[tool].append(time.perf_counter() - started)
+                if result.isError:
+                    outcomes["tool_errors"] += 1
+                else:
+                    outcomes["ok"] += 1
+
+
+def git_revision() -> str | None:
+    """
+    Return the current short commit hash, if available.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_load_test(
+    clients: int,
+    calls_per_client: int,
+    stub_config: StubConfig,
+    workload: Workload,
+    nws_rate: float | None = None,
+) -> dict[str, Any]:
+    """
+    Run one load test and return its results.
+
+    Args:
+        clients: Concurrent MCP client sessions.
+        calls_per_client: Tool calls each session makes.
+        stub_config: Behaviour of the stub upstream.
+        workload: Tool call mix.
+        nws_rate: Upstream requests/second allowed by the rate limiter
+            (defaults to the server's configured limit).
+
+    Returns:
+        dict[str, Any]: Configuration, throughput, latency and upstream counts.
+    """
+    stub = StubNWS(stub_config)
+    stub_server, stub_task, stub_port = await serve(stub.app)
+    config = PoolConfig.from_env()
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    previous_pool = http_pool._shared_pool
+    limiter = (
+        AdaptiveRateLimiter(rate=nws_rate, burst=max(1, int(nws_rate)))
+        if nws_rate
+        else None
+    )
+    pool = UpstreamPool(
+        config=config, limiter=limiter, transport=StubTransport(stub_port, limits)
+    )
+    http_pool._shared_pool = pool
+    mcp_server, mcp_task, mcp_port = await serve(mcp.streamable_http_app())
+    url = f"http://127.0.0.1:{mcp_port}{mcp.settings.streamable_http_path}"
+    latencies: dict[str, list[float]] = defaultdict(list)
+    outcomes: dict[str, int] = defaultdict(int)
+    try:
+        stub.reset()
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                run_client(
+                    url, workload.calls(i, calls_per_client), latencies, outcomes
+                )
+                for i in range(clients)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        mcp_server.should_exit = True
+        await mcp_task
+        stub_server.should_exit = True
+        await stub_task
+        http_pool._shared_pool = previous_pool
+    completed = sum(len(values) for values in latencies.values())
+    upstream = {name: count for name, count in stub.calls.items() if name}
+    upstream_total = sum(upstream.values())
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "config": {
+            "clients": clients,
+            "nws_rate": pool.limiter.max_rate,
+            "calls_per_client": calls_per_client,
+            "stub": asdict(stub_config),
+            "workload": {
+                "forecast_weight": workload.forecast_weight,
+                "alerts_weight": workload.alerts_weight,
+                "locations": workload.locations,
+                "states": len(workload.states),
+                "seed": workload.seed,
+            },
+        },
+        "results": {
+            "tool_calls": completed,
+            "outcomes": dict(outcomes),
+            "duration_s": round(elapsed, 3),
+            "requests_per_second": round(completed / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": latency_summary(
+                [value for values in latencies.values() for value in values]
+            ),
+            "latency_ms_by_tool": {
+                tool: latency_summary(values) for tool, values in latencies.items()
+            },
+            "upstream": {
+                "calls": upstream_total,
+                "calls_per_tool_call": (
+                    round(upstream_total / completed, 4) if completed else 0.0
+                ),
+                "by_endpoint": upstream,
+                "statuses": {str(k): v for k, v in stub.statuses.items()},
+            },
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=25, help="calls per client")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--alerts-per-state", type=int, default=10)
+    parser.add_argument("--description-bytes", type=int, default=600)
+    parser.add_argument("--max-age", type=int, default=60)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--forecast-weight", type=float, default=3.0)
+    parser.add_argument("--alerts-weight", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--nws-rate", type=float, help="upstream requests/second (default: server's)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="results file (default: benchmarks/results/)"
+    )
+    args = parser.parse_args()
+    # The server and client log every request at INFO, which would dominate
+    # the measurement
+    for name in ("", "mcp", "httpx", "uvicorn"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    stub_config = StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        alerts_per_state=args.alerts_per_state,
+        description_bytes=args.description_bytes,
+        max_age=args.max_age,
+        seed=args.seed,
+    )
+    workload = Workload(
+        forecast_weight=args.forecast_weight,
+        alerts_weight=args.alerts_weight,
+        locations=args.locations,
+        seed=args.seed,
+    )
+    report = asyncio.run(
+        run_load_test(args.clients, args.calls, stub_config, workload, args.nws_rate)
+    )
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"load-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    results = report["results"]
+    print(json.dumps(results, indent=2))
+    print(f"Saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Local ASGI stand-in for api.weather.gov used by the load-test harness.
+
+Serves ``/points``, gridpoint ``/forecast`` (and ``/forecast/hourly``) and
+``/alerts/active`` with synthetic but realistically shaped payloads. Latency,
+error rate, payload size and cache lifetime are configurable, and every
+request is counted per endpoint so a load test can report how many upstream
+calls each tool call cost.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from src.weather.http_pool import NWS_API_BASE, endpoint_name
+from src.weather.states import US_STATES
+
+
+@dataclass
+class StubConfig:
+    """
+    Behaviour of the stub upstream.
+
+    Attributes:
+        latency: Mean response delay in seconds.
+        jitter: Delay varies uniformly by this fraction of ``latency``.
+        error_rate: Probability that a request fails with a 500 or 503.
+        alerts_per_state: Alert features returned for each state.
+        description_bytes: Approximate size of each alert description.
+        forecast_periods: Periods in a 12-hourly forecast.
+        hourly_periods: Periods in an hourly forecast.
+        max_age: ``Cache-Control`` max-age sent with successful responses.
+        seed: Seed for the delay/error random generator.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.5
+    error_rate: float = 0.0
+    alerts_per_state: int = 10
+    description_bytes: int = 600
+    forecast_periods: int = 14
+    hourly_periods: int = 156
+    max_age: int = 60
+    seed: int = 0
+
+
+def grid_for(lat: float, lon: float) -> tuple[str, int, int]:
+    """
+    Return a deterministic (office, x, y) grid cell for coordinates.
+    """
+    return "STB", int((lon + 180.0) * 20) % 400, int((lat + 90.0) * 20) % 400
+
+
+def points_payload(lat: float, lon: float) -> dict[str, Any]:
+    """
+    Build a ``/points`` response in the shape NWS returns.
+    """
+    office, x, y = grid_for(lat, lon)
+    grid = f"{NWS_API_BASE}/gridpoints/{office}/{x},{y}"
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {
+            "gridId": office,
+            "gridX": x,
+            "gridY": y,
+            "forecast": f"{grid}/forecast",
+            "forecastHourly": f"{grid}/forecast/hourly",
+            "forecastGridData": grid,
+            "forecastZone": f"{NWS_API_BASE}/zones/forecast/STZ{x % 1000:03d}",
+        },
+    }
+
+
+def forecast_payload(office: str, x: int, y: int, count: int, hourly: bool) -> dict:
+    """
+    Build a gridpoint forecast (or hourly forecast) with ``count`` periods.
+    """
+    periods = []
+    for i in range(count):
+        day = i // (24 if hourly else 2)
+        hour = i % 24 if hourly else (6 if i % 2 == 0 else 18)
+        daytime = 6 <= hour < 18
+        temperature = 60 + (x + y + i * 3) % 25 - (0 if daytime else 10)
+        periods.append(
+            {
+                "number": i + 1,
+                "name": "" if hourly else f"Day {day + 1} {'' if daytime else 'Night'}",
+                "startTime": f"2024-01-{day + 1:02d}T{hour:02d}:00:00-08:00",
+                "endTime": f"2024-01-{day + 1:02d}T{hour:02d}:59:00-08:00",
+                "isDaytime": daytime,
+                "temperature": temperature,
+                "temperatureUnit": "F",
+                "temperatureTrend": None,
+                "probabilityOfPrecipitation": {
+                    "unitCode": "wmoUnit:percent",
+                    "value": (x * 7 + i * 13) % 100,
+                },
+                "windSpeed": f"{5 + i % 15} mph",
+                "windDirection": ["N", "NE", "E", "SE", "S", "SW", "W", "NW"][i % 8],
+                "icon": f"{NWS_API_BASE}/icons/land/day/few?size=medium",
+                "shortForecast": "Partly Cloudy",
+                "detailedForecast": (
+                    ""
+                    if hourly
+                    else f"Partly cloudy, with a high near {temperature}. "
+                    f"West wind {5 + i % 15} mph."
+                ),
+            }
+        )
+    cell = [[-122.0 + x / 100, 37.0 + y / 100], [-121.99 + x / 100, 37.0 + y / 100]]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [cell + [cell[0]]]},
+        "properties": {
+            "updateTime": "2024-01-01T00:00:00+00:00",
+            "generatedAt": "2024-01-01T00:05:00+00:00",
+            "units": "us",
+            "periods": periods,
+        },
+    }
+
+
+def alert_feature(state: str, n: int, description_bytes: int) -> dict[str, Any]:
+    """
+    Build one alert feature for a state.
+    """
+    zones = [f"{state}Z{(n * 3 + k) % 999:03d}" for k in range(3)]
+    text = "* WHAT...Gusty winds and rough surf expected. " * max(
+        1, description_bytes // 48
+    )
+    lon, lat = -120.0 + n % 10, 35.0 + n % 7
+    return {
+        "id": f"{NWS_API_BASE}/alerts/urn:oid:stub.{state}.{n}",
+        "type": "Feature",
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [[lon, lat], [lon + 0.5, lat], [lon + 0.5, lat + 0.5], [lon, lat]]
+            ],
+        },
+        "properties": {
+            "id": f"urn:oid:stub.{state}.{n}",
+            "areaDesc": f"Zone {n} of {state}",
+            "geocode": {"SAME": [f"0{n:05d}"], "UGC": zones},
+            "affectedZones": [f"{NWS_API_BASE}/zones/forecast/{z}" for z in zones],
+            "sent": "2024-01-01T12:00:00-08:00",
+            "expires": "2024-01-01T18:00:00-08:00",
+            "status": "Actual",
+            "messageType": "Alert",
+            "severity": ["Minor", "Moderate", "Severe"][n % 3],
+            "certainty": "Likely",
+            "urgency": "Expected",
+            "event": ["Wind Advisory", "Flood Watch", "Heat Advisory"][n % 3],
+            "headline": f"Advisory {n} issued for {state}",
+            "description": text,
+            "instruction": "Secure outdoor objects.",
+            "parameters": {"NWSheadline": [f"Advisory {n} for {state}"]},
+        },
+    }
+
+
+class StubNWS:
+    """
+    Stub upstream application with request counters.
+    """
+
+    def __init__(self, config: StubConfig | None = None) -> None:
+        """
+        Initialize the stub and its routes.
+
+        Args:
+            config: Stub behaviour; defaults to ``StubConfig()``.
+        """
+        self.config = config if config is not None else StubConfig()
+        self.random = random.Random(self.config.seed)
+        self.calls: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._bodies: dict[str, tuple[bytes, str]] = {}
+        self.app = Starlette(
+            routes=[
+                Route("/", self.root),
+                Route("/points/{lat},{lon}", self.points),
+                Route("/gridpoints/{office}/{x:int},{y:int}/forecast", self.forecast),
+                Route(
+                    "/gridpoints/{office}/{x:int},{y:int}/forecast/hourly",
+                    self.hourly,
+                ),
+                Route("/alerts/active", self.alerts),
+            ]
+        )
+
+    def reset(self) -> None:
+        """
+        Zero the request counters.
+        """
+        self.calls.clear()
+        self.statuses.clear()
+
+    async def _respond(self, request: Request, build: Any) -> Response:
+        config = self.config
+        self.calls[endpoint_name(str(request.url))] += 1
+        if config.latency > 0:
+            spread = config.latency * config.jitter
+            await asyncio.sleep(
+                max(0.0, config.latency + self.random.uniform(-spread, spread))
+            )
+        if self.random.random() < config.error_rate:
+            status = self.random.choice((500, 503))
+            self.statuses[status] += 1
+            return Response(b'{"title": "Unexpected Problem"}', status_code=status)
+        key = str(request.url)
+        cached = self._bodies.get(key)
+        if cached is None:
+            body = json.dumps(build()).encode()
+            cached = self._bodies[key] = (body, hashlib.md5(body).hexdigest())
+        body, digest = cached
+        headers = {
+            "Cache-Control": f"public, max-age={config.max_age}",
+            "ETag": f'"{digest}"',
+            "Content-Type": "application/geo+json",
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            self.statuses[304] += 1
+            return Response(status_code=304, headers=headers)
+        self.statuses[200] += 1
+        return Response(body, headers=headers)
+
+    async def root(self, request: Request) -> Response:
+        return Response(b'{"status": "OK"}')
+
+    async def points(self, request: Request) -> Response:
+        lat = float(request.path_params["lat"])
+        lon = float(request.path_params["lon"])
+        return await self._respond(request, lambda: points_payload(lat, lon))
+
+    async def forecast(self, request: Request) -> Response:
+        office, x, y = (request.path_params[k] for k in ("office", "x", "y"))
+        count = self.config.forecast_periods
+        return await self._respond(
+            request, lambda: forecast_payload(office, x, y, count, hourly=False)
+        )
+
+    async def hourly(self, request: Request) -> Response:
+        office, x, y = (request.path_params[k] for k in ("office", "x", "y"))
+        count = self.config.hourly_periods
+        return await self._respond(
+            request, lambda: forecast_payload(office, x, y, count, hourly=True)
+        )
+
+    async def alerts(self, request: Request) -> Response:
+        area = request.query_params.get("area")
+        states = sorted(area.split(",")) if area else sorted(US_STATES)
+        per_state = self.config.alerts_per_state
+        size = self.config.description_bytes
+
+        def build() -> dict[str, Any]:
+            features = [
+                alert_feature(state, n, size)
+                for state in states
+                for n in range(per_state)
+            ]
+            return {
+                "type": "FeatureCollection",
+                "features": features,
+                "title": "Current watches, warnings, and advisories",
+                "updated": "2024-01-01T12:00:00+00:00",
+            }
+
+        return await self._respond(request, build)
@@ -0,0 +1,337 @@
+"""
+Nationwide active-alerts snapshot with an in-memory index.
+
+In snapshot mode the server fetches ``/alerts/active`` for the whole country
+on a background schedule and indexes the result by state, zone, event and
+severity. ``get_alerts_data`` then answers from the index without an upstream
+call. Each refresh builds a new ``AlertsIndex`` and swaps it in with a single
+assignment, so readers never observe a partially built index.
+
+Alert polygons are also indexed spatially (see ``geo.PolygonIndex``), so
+"which alerts cover this point?" is answered in-process. Without snapshot
+mode, the first point query fetches the nationwide alerts itself and then
+starts the background refresher, so later queries stay local too.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from src.weather.geo import PolygonIndex
+from src.weather.http_pool import NWS_API_BASE
+from src.weather.models import Alert
+from src.weather.nws_client import NWSClient
+
+logger = logging.getLogger(__name__)
+
+NATIONWIDE_ALERTS_URL = f"{NWS_API_BASE}/alerts/active"
+
+
+class AlertsIndex:
+    """
+    Immutable lookup tables over one nationwide alerts payload.
+
+    Every alert is converted to an ``Alert`` once; the per-state, per-zone,
+    per-event and per-severity tables hold references to the same objects.
+    """
+
+    __slots__ = (
+        "by_state",
+        "by_zone",
+        "by_event",
+        "by_severity",
+        "built_at",
+        "polygons",
+    )
+
+    def __init__(
+        self,
+        by_state: dict[str, list[Alert]],
+        by_zone: dict[str, list[Alert]],
+        by_event: dict[str, list[Alert]],
+        by_severity: dict[str, list[Alert]],
+        built_at: float,
+        polygons: PolygonIndex[Alert] | None = None,
+    ) -> None:
+        self.by_state = by_state
+        self.by_zone = by_zone
+        self.by_event = by_event
+        self.by_severity = by_severity
+        self.built_at = built_at
+        self.polygons = polygons if polygons is not None else PolygonIndex([])
+
+    @classmethod
+    def build(cls, data: dict[str, Any], now: float | None = None) -> "AlertsIndex":
+        """
+        Index a nationwide ``/alerts/active`` FeatureCollection.
+
+        Args:
+            data: Parsed alerts response.
+            now: Build timestamp (defaults to ``time.time()``).
+
+        Returns:
+            AlertsIndex: The populated index.
+
+        Raises:
+            ValueError: If the payload has no ``features`` list.
+        """
+        features = data.get("features") if data else None
+        if not isinstance(features, list):
+            raise ValueError("Malformed response: missing or invalid 'features' key")
+        by_state: dict[str, list[Alert]] = defaultdict(list)
+        by_zone: dict[str, list[Alert]] = defaultdict(list)
+        by_event: dict[str, list[Alert]] = defaultdict(list)
+        by_severity: dict[str, list[Alert]] = defaultdict(list)
+        alerts = [Alert.coerce(feature, with_geometry=True) for feature in features]
+        for alert in alerts:
+            for state in alert.states:
+                by_state[state].append(alert)
+            for zone in alert.zones:
+                by_zone[zone].append(alert)
+            if alert.event:
+                by_event[alert.event].append(alert)
+            if alert.severity:
+                by_severity[alert.severity].append(alert)
+        return cls(
+            dict(by_state),
+            dict(by_zone),
+            dict(by_event),
+            dict(by_severity),
+            time.time() if now is None else now,
+            PolygonIndex([(alert.geometry, alert) for alert in alerts]),
+        )
+
+    def for_state(self, state: str) -> list[Alert]:
+        """
+        Return the active alerts for a two-letter state code.
+        """
+        return list(self.by_state.get(state, ()))
+
+    def for_zone(self, zone: str) -> list[Alert]:
+        """
+        Return the active alerts for a UGC zone or county code.
+        """
+        return list(self.by_zone.get(zone, ()))
+
+    def for_point(
+        self, latitude: float, longitude: float, zones: Iterable[str] = ()
+    ) -> list[Alert]:
+        """
+        Return the active alerts covering a point.
+
+        Args:
+            latitude: Latitude of the point.
+            longitude: Longitude of the point.
+            zones: UGC codes known to contain the point. Alerts issued for
+                those zones without a polygon are included too.
+
+        Returns:
+            list[Alert]: Polygon matches first, then zone matches, without
+            duplicates.
+        """
+        alerts = self.polygons.query(longitude, latitude)
+        seen = {id(alert) for alert in alerts}
+        for zone in zones:
+            for alert in self.by_zone.get(zone, ()):
+                if not alert.geometry and id(alert) not in seen:
+                    seen.add(id(alert))
+                    alerts.append(alert)
+        return alerts
+
+    def for_event(self, event: str) -> list[Alert]:
+        """
+        Return the active alerts of an event type (e.g. ``"Tornado Warning"``).
+        """
+        return list(self.by_event.get(event, ()))
+
+    def for_severity(self, severity: str) -> list[Alert]:
+        """
+        Return the active alerts with a severity (e.g. ``"Severe"``).
+        """
+        return list(self.by_severity.get(severity, ()))
+
+
+class AlertsSnapshot:
+    """
+    Background refresher that keeps a current ``AlertsIndex``.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        interval: float = 60.0,
+        max_age: float | None = None,
+    ) -> None:
+        """
+        Initialize the snapshot without fetching anything.
+
+        Args:
+            enabled: Whether snapshot mode is on.
+            interval: Seconds between nationwide refreshes.
+            max_age: Age in seconds after which the index is considered stale
+                and callers fall back to per-state requests (defaults to three
+                refresh intervals).
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.max_age = max_age if max_age is not None else interval * 3
+        self.index: AlertsIndex | None = None
+        self.refreshes = 0
+        self.failures = 0
+        self._source: Any = None
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._holders = 0
+
+    @classmethod
+    def from_env(cls) -> "AlertsSnapshot":
+        """
+        Build a snapshot from ``WEATHER_ALERTS_SNAPSHOT*`` environment variables.
+        """
+        interval = os.environ.get("WEATHER_ALERTS_SNAPSHOT_INTERVAL")
+        return cls(
+            enabled=os.environ.get("WEATHER_ALERTS_SNAPSHOT", "").lower()
+            in ("1", "true", "yes"),
+            interval=float(interval) if interval else 60.0,
+        )
+
+    def current(self, now: float | None = None) -> AlertsIndex | None:
+        """
+        Return the current index if snapshot mode is on and it is not stale.
+        """
+        return self._fresh(now) if self.enabled else None
+
+    def _fresh(self, now: float | None = None) -> AlertsIndex | None:
+        index = self.index
+        if index is None:
+            return None
+        if (time.time() if now is None else now) - index.built_at > self.max_age:
+            return None
+        return index
+
+    async def refresh(self, client: NWSClient | None = None) -> AlertsIndex:
+        """
+        Fetch nationwide alerts and atomically swap in a new index.
+
+        A payload identical to the last one (e.g. revalidated with a 304) only
+        refreshes the index timestamp instead of re-indexing.
+
+        Args:
+            client: NWSClient to fetch with (defaults to a new one).
+
+        Returns:
+            AlertsIndex: The index now being served.
+        """
+        if client is None:
+            client = NWSClient()
+        data = await client._make_request(NATIONWIDE_ALERTS_URL)
+        index = self.index
+        if index is not None and data is self._source:
+            index = AlertsIndex(
+                index.by_state,
+                index.by_zone,
+                index.by_event,
+                index.by_severity,
+                time.time(),
+                index.polygons,
+            )
+        else:
+            index = AlertsIndex.build(data)
+        self._source = data
+        self.index = index
+        self.refreshes += 1
+        return index
+
+    async def lookup_index(self, client: NWSClient | None = None) -> AlertsIndex:
+        """
+        Return a current index of all active alerts, fetching one if needed.
+
+        Without snapshot mode, the first call fetches the nationwide alerts
+        itself and starts the background refresher, so later calls are
+        answered from memory like in snapshot mode. A call only waits for the
+        download again if the refresher has fallen behind by ``max_age``.
+
+        Args:
+            client: NWSClient to fetch with (defaults to a new one).
+
+        Returns:
+            AlertsIndex: An index of every active alert.
+
+        Raises:
+            httpx.HTTPError: If the nationwide alerts cannot be fetched.
+            ValueError: If the payload is malformed.
+        """
+        index = self._fresh()
+        if index is None:
+            async with self._lock:
+                index = self._fresh()
+                if index is None:
+                    index = await self.refresh(client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(refresh_first=False))
+        return index
+
+    async def run(self, refresh_first: bool = True) -> None:
+        """
+        Refresh forever, sleeping ``interval`` (with jitter) between attempts.
+
+        Args:
+            refresh_first: Whether to refresh before the first sleep.
+        """
+        if not refresh_first:
+            await asyncio.sleep(self.interval * random.uniform(0.9, 1.1))
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Nationwide alerts refresh failed: %r", e)
+            await asyncio.sleep(self.interval * random.uniform(0.9, 1.1))
+
+    def start(self) -> None:
+        """
+        Start the background refresh task if snapshot mode is enabled.
+        """
+        if not self.enabled:
+            return
+        self._holders += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background refresh task once the last holder releases it.
+
+        A refresher started on demand by ``lookup_index`` has no holders and
+        is stopped by any call.
+        """
+        if self.enabled:
+            self._holders = max(0, self._holders - 1)
+        if self._holders or self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+_shared_alerts_snapshot: AlertsSnapshot | None = None
+
+
+def get_shared_alerts_snapshot() -> AlertsSnapshot:
+    """
+    Return the process-wide ``AlertsSnapshot``, creating it on first use.
+
+    Returns:
+        AlertsSnapshot: The shared snapshot.
+    """
+    global _shared_alerts_snapshot
+    if _shared_alerts_snapshot is None:
+        _shared_alerts_snapshot = AlertsSnapshot.from_env()
+    return _shared_alerts_snapshot
@@ -0,0 +1,272 @@
+"""
+Per-endpoint circuit breakers for upstream NWS calls.
+
+Once the recent failure rate of an endpoint (``points``, ``gridpoints``,
+``alerts``, ...) crosses a threshold the circuit opens and calls fail
+immediately instead of waiting for a timeout. After a cool-down a single
+half-open probe is let through; its outcome closes or re-opens the circuit.
+"""
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TypedDict, Unpack
+
+import httpx
+
+from src.weather.http_pool import endpoint_name
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """
+    Raised instead of calling an endpoint whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a sliding time window.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60.0,
+        open_duration: float = 30.0,
+    ) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: Endpoint the breaker protects.
+            failure_threshold: Failure ratio within ``window`` that opens it.
+            min_calls: Calls required in the window before it can open.
+            window: Seconds of call outcomes considered.
+            open_duration: Seconds to stay open before a half-open probe.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.window = window
+        self.open_duration = open_duration
+        self.state = CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self.opened = 0
+        self.rejected = 0
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def failure_rate(self, now: float | None = None) -> float:
+        """
+        Return the failure ratio of calls within the window.
+        """
+        self._trim(time.monotonic() if now is None else now)
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    def outcome_counts(self, now: float | None = None) -> tuple[int, int]:
+        """
+        Return ``(calls, failures)`` recorded within the window.
+        """
+        self._trim(time.monotonic() if now is None else now)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return len(self._outcomes), failures
+
+    def allow(self, now: float | None = None) -> bool:
+        """
+        Return True if a call may go upstream now.
+
+        While open, only one half-open probe is admitted once the cool-down has
+        elapsed (or the previous probe has been outstanding for that long).
+        """
+        now = time.monotonic() if now is None else now
+        if self.state == CLOSED:
+            return True
+        if now - self._opened_at < self.open_duration:
+            self.rejected += 1
+            return False
+        if (
+            self._probe_started is not None
+            and now - self._probe_started < self.open_duration
+        ):
+            self.rejected += 1
+            return False
+        self.state = HALF_OPEN
+        self._probe_started = now
+        return True
+
+    def record_success(self, now: float | None = None) -> None:
+        """
+        Record a successful call; a successful probe closes the circuit.
+        """
+        now = time.monotonic() if now is None else now
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self._probe_started = None
+            self._outcomes.clear()
+        self._outcomes.append((now, True))
+        self._trim(now)
+
+    def record_failure(self, now: float | None = None) -> None:
+        """
+        Record a failed call, opening the circuit if the threshold is crossed.
+        """
+        now = time.monotonic() if now is None else now
+        if self.state != CLOSED:
+            self._open(now)
+            return
+        self._outcomes.append((now, False))
+        self._trim(now)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and self.failure_rate(now) >= self.failure_threshold
+        ):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self._probe_started = None
+        self.opened += 1
+
+
+class BreakerSettings(TypedDict, total=False):
+    """
+    Optional ``CircuitBreaker`` parameters shared by a registry.
+    """
+
+    failure_threshold: float
+    min_calls: int
+    window: float
+    open_duration: float
+
+
+class CircuitBreakers:
+    """
+    Registry of one ``CircuitBreaker`` per NWS endpoint.
+    """
+
+    def __init__(self, **settings: Unpack[BreakerSettings]) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            **settings: Keyword arguments passed to every ``CircuitBreaker``.
+        """
+        self.settings = settings
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreakers":
+        """
+        Build a registry from ``WEATHER_BREAKER_*`` environment variables.
+        """
+        settings: BreakerSettings = {}
+        if os.environ.get("WEATHER_BREAKER_MIN_CALLS"):
+            settings["min_calls"] = int(os.environ["WEATHER_BREAKER_MIN_CALLS"])
+        if os.environ.get("WEATHER_BREAKER_THRESHOLD"):
+            threshold = float(os.environ["WEATHER_BREAKER_THRESHOLD"])
+            settings["failure_threshold"] = threshold
+        if os.environ.get("WEATHER_BREAKER_WINDOW"):
+            settings["window"] = float(os.environ["WEATHER_BREAKER_WINDOW"])
+        if os.environ.get("WEATHER_BREAKER_OPEN_SECONDS"):
+            duration = float(os.environ["WEATHER_BREAKER_OPEN_SECONDS"])
+            settings["open_duration"] = duration
+        return cls(**settings)
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """
+        Return the breaker for the endpoint a URL belongs to.
+        """
+        name = endpoint_name(url)
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **self.settings)
+        return breaker
+
+    def states(self) -> dict[str, str]:
+        """
+        Return the state of every breaker by endpoint name.
+        """
+        return {name: b.state for name, b in self._breakers.items()}
+
+    def breakers(self) -> dict[str, CircuitBreaker]:
+        """
+        Return every breaker created so far by endpoint name.
+        """
+        return dict(self._breakers)
+
+
+@dataclass
+class Staleness:
+    """
+    Oldest stale payload served to the current tool call, in seconds.
+    """
+
+    age: float | None = None
+
+    def record(self, age: float) -> None:
+        """
+        Note that a payload ``age`` seconds old was served.
+        """
+        self.age = age if self.age is None else max(self.age, age)
+
+
+_staleness: ContextVar[Staleness | None] = ContextVar("staleness", default=None)
+
+
+@contextmanager
+def track_staleness() -> Iterator[Staleness]:
+    """
+    Collect the age of any stale fallback payloads served inside the block.
+
+    Yields:
+        Staleness: Updated whenever a stale payload is served.
+    """
+    staleness = Staleness()
+    token = _staleness.set(staleness)
+    try:
+        yield staleness
+    finally:
+        _staleness.reset(token)
+
+
+def record_stale(age: float) -> None:
+    """
+    Report a stale fallback to the enclosing ``track_staleness`` block, if any.
+    """
+    staleness = _staleness.get()
+    if staleness is not None:
+        staleness.record(age)
+
+
+_shared_breakers: CircuitBreakers | None = None
+
+
+def get_shared_breakers() -> CircuitBreakers:
+    """
+    Return the process-wide ``CircuitBreakers``, creating them on first use.
+
+    Returns:
+        CircuitBreakers: The shared registry.
+    """
+    global _shared_breakers
+    if _shared_breakers is None:
+        _shared_breakers = CircuitBreakers.from_env()
+    return _shared_breakers
@@ -0,0 +1,325 @@
+"""
+Optional SQLite-backed second tier for the HTTP response cache.
+
+Parsed NWS payloads are written to a SQLite database (in WAL mode), together
+with their freshness and validators. A new process, such as each stdio launch
+by an MCP host, can then answer from a warm cache. It can also revalidate with
+``ETag``/``Last-Modified`` instead of downloading again. Several server
+processes on one host can share the file: WAL lets readers run alongside the
+single writer, and writers wait for the lock through ``busy_timeout``.
+
+The database is bounded two ways. Entries stale for longer than ``max_stale``
+are dropped. Past ``max_bytes``, the least recently read entries go first.
+Pages freed by eviction are returned to the filesystem with incremental
+vacuuming once they make up a large share of the file. Disk errors are logged
+and treated as cache misses; the disk tier never fails a request.
+
+``DiskCache`` itself is synchronous. ``ResponseCache`` runs every call on one
+worker thread, so SQLite and JSON work never blocks the event loop and the
+connection is never used from two threads at once.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.weather.models import encode_model
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fresh_until REAL NOT NULL,
+    lifetime REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_fresh ON responses (fresh_until);
+"""
+# Reads refresh ``accessed_at`` at most this often, so hot keys do not turn
+# every cache hit into a write
+ACCESS_RESOLUTION = 60.0
+# Run eviction after this many writes
+EVICT_EVERY = 100
+# Vacuum once free pages exceed this share of the file
+VACUUM_FREE_RATIO = 0.25
+
+
+class DiskCache:
+    """
+    Key/value store of serialized payloads with expiry and validators.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_stale: float = 7 * 24 * 3600,
+        decode: Callable[[str, Any], Any] | None = None,
+    ) -> None:
+        """
+        Open (creating if needed) the database.
+
+        Args:
+            path: SQLite database file.
+            max_bytes: Upper bound on stored payload bytes.
+            max_stale: Seconds past expiry an entry is kept for revalidation
+                and stale fallback.
+            decode: Called as ``decode(key, payload)`` on every payload read
+                back, e.g. to rebuild typed models from plain JSON.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.decode = decode
+        self.reads = 0
+        self.hits = 0
+        self.writes = 0
+        self.evictions = 0
+        self.vacuums = 0
+        self.errors = 0
+        self._writes_since_evict = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db: sqlite3.Connection | None = None
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the connection, (re)opening it after ``close``.
+        """
+        if self._db is None:
+            db = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            # auto_vacuum only takes effect before the first table is created
+            db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    @classmethod
+    def from_env(
+        cls, decode: Callable[[str, Any], Any] | None = None
+    ) -> "DiskCache | None":
+        """
+        Build a disk cache from ``WEATHER_DISK_CACHE_*`` environment variables.
+
+        Returns:
+            DiskCache | None: The cache, or None when ``WEATHER_DISK_CACHE_PATH``
+            is unset or the database cannot be opened.
+        """
+        path = os.environ.get("WEATHER_DISK_CACHE_PATH")
+        if not path:
+            return None
+        max_mb = os.environ.get("WEATHER_DISK_CACHE_MAX_MB")
+        max_stale = os.environ.get("WEATHER_DISK_CACHE_MAX_STALE")
+        try:
+            return cls(
+                path,
+                max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else 256 << 20,
+                max_stale=float(max_stale) if max_stale else 7 * 24 * 3600,
+                decode=decode,
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Disk cache at %s disabled: %r", path, e)
+            return None
+
+    def _failed(self, action: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("Disk cache %s failed: %r", action, error)
+
+    def get(self, key: str, now: float | None = None) -> dict[str, Any] | None:
+        """
+        Return a stored entry as a dict of its columns, or None if absent.
+
+        The ``payload`` is decoded (and passed through ``decode``).
+        """
+        now = time.time() if now is None else now
+        self.reads += 1
+        try:
+            db = self._connect()
+            row = db.execute(
+                "SELECT payload, fresh_until, lifetime, etag, last_modified, size,"
+                " stored_at, accessed_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[7] > ACCESS_RESOLUTION:
+                db.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            payload = json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._failed("read", e)
+            return None
+        self.hits += 1
+        if self.decode is not None:
+            payload = self.decode(key, payload)
+        return {
+            "payload": payload,
+            "fresh_until": row[1],
+            "lifetime": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "size": row[5],
+            "stored_at": row[6],
+        }
+
+    def put(
+        self,
+        key: str,
+        payload: Any,
+        fresh_until: float,
+        lifetime: float,
+        etag: str | None,
+        last_modified: str | None,
+        stored_at: float,
+        now: float | None = None,
+    ) -> None:
+        """
+        Store (or replace) an entry.
+        """
+        now = time.time() if now is None else now
+        try:
+            text = json.dumps(payload, default=encode_model, separators=(",", ":"))
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    text,
+                    fresh_until,
+                    lifetime,
+                    etag,
+                    last_modified,
+                    len(text),
+                    stored_at,
+                    now,
+                ),
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._failed("write", e)
+            return
+        self.writes += 1
+        self._writes_since_evict += 1
+        if self._writes_since_evict >= EVICT_EVERY:
+            self.evict(now)
+
+    def refresh(
+        self,
+        key: str,
+        fresh_until: float,
+        lifetime: float,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """
+        Update an entry's freshness and validators after a revalidation.
+        """
+        try:
+            self._connect().execute(
+                "UPDATE responses SET fresh_until = ?, lifetime = ?, etag = ?,"
+                " last_modified = ? WHERE key = ?",
+                (fresh_until, lifetime, etag, last_modified, key),
+            )
+        except sqlite3.Error as e:
+            self._failed("refresh", e)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry, if present.
+        """
+        try:
+            self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self._failed("delete", e)
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Apply the eviction and vacuum policy.
+
+        Drops entries stale for longer than ``max_stale``, then the least
+        recently read entries until stored bytes are under 90% of
+        ``max_bytes``, then vacuums if free pages exceed a quarter of the file.
+
+        Returns:
+            int: Entries removed.
+        """
+        now = time.time() if now is None else now
+        self._writes_since_evict = 0
+        try:
+            db = self._connect()
+            removed = db.execute(
+                "DELETE FROM responses WHERE fresh_until < ?",
+                (now - self.max_stale,),
+            ).rowcount
+            total = db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                target = total - int(self.max_bytes * 0.9)
+                keys = []
+                for key, size in db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at"
+                ):
+                    if target <= 0:
+                        break
+                    keys.append((key,))
+                    target -= size
+                db.executemany("DELETE FROM responses WHERE key = ?", keys)
+                removed += len(keys)
+            self.evictions += removed
+            self._maybe_vacuum(db)
+        except sqlite3.Error as e:
+            self._failed("eviction", e)
+            return 0
+        return removed
+
+    def _maybe_vacuum(self, db: sqlite3.Connection) -> None:
+        pages = db.execute("PRAGMA page_count").fetchone()[0]
+        free = db.execute("PRAGMA freelist_count").fetchone()[0]
+        if pages and free / pages > VACUUM_FREE_RATIO:
+            db.execute("PRAGMA incremental_vacuum").fetchall()
+            self.vacuums += 1
+
+    def __len__(self) -> int:
+        try:
+            return (
+                self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            )
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        """
+        Close the database connection; the next call reopens it.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return disk cache counters.
+        """
+        return {
+            "reads": self.reads,
+            "hits": self.hits,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "vacuums": self.vacuums,
+            "errors": self.errors,
+        }
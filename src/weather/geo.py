@@ -0,0 +1,261 @@
+"""
+Polygon geometry and a grid-hash spatial index for point queries.
+
+GeoJSON ``Polygon``/``MultiPolygon`` coordinates are converted once into
+compact NumPy rings (``(n, 2)`` float arrays of longitude, latitude).
+``PolygonIndex`` puts the edges of every indexed shape into flat arrays, and
+hashes each shape's bounding box into the cells of a fixed-size grid. A point
+query looks up its grid cell and keeps the shapes whose bounding box contains
+the point. It then runs a single vectorized even-odd (ray casting) test over
+all the candidate edges at once. Holes and multi-part shapes need no special
+handling: every ring of a shape takes part in the same parity count.
+"""
+
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+Rings = tuple[np.ndarray, ...]
+
+
+def parse_rings(geometry: dict[str, Any] | None) -> Rings:
+    """
+    Convert a GeoJSON polygon geometry into NumPy rings.
+
+    Args:
+        geometry: GeoJSON ``Polygon`` or ``MultiPolygon`` (or None).
+
+    Returns:
+        Rings: Every ring (outer boundaries and holes) as a ``(n, 2)`` float64
+        array of ``(longitude, latitude)``; empty for missing, unsupported or
+        malformed geometry.
+    """
+    if not isinstance(geometry, dict):
+        return ()
+    coordinates: Any = geometry.get("coordinates")
+    if geometry.get("type") == "Polygon":
+        polygons = [coordinates]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = coordinates
+    else:
+        return ()
+    rings = []
+    try:
+        for polygon in polygons:
+            for ring in polygon:
+                array = np.asarray(ring, dtype=np.float64)[:, :2]
+                if len(array) >= 3:
+                    rings.append(array)
+    except (TypeError, ValueError, IndexError):
+        return ()
+    return tuple(rings)
+
+
+def _ring_crossings(ring: np.ndarray, longitude: float, latitude: float) -> int:
+    """
+    Count the edges of one ring crossed by a ray east of the point.
+    """
+    x, y = ring[:, 0], ring[:, 1]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    dy = yn - y
+    slope = np.divide(xn - x, dy, out=np.zeros_like(dy), where=dy != 0)
+    crosses = ((y > latitude) != (yn > latitude)) & (
+        longitude < x + slope * (latitude - y)
+    )
+    return int(np.count_nonzero(crosses))
+
+
+def rings_to_geojson(rings: Rings) -> dict[str, Any] | None:
+    """
+    Return rings as GeoJSON that ``parse_rings`` reads back.
+
+    Rings do not record which polygon they came from, so the nesting is
+    rebuilt: a ring inside an odd number of other rings is a hole of the
+    innermost of them, any other ring is an outer boundary.
+
+    Returns:
+        dict[str, Any] | None: A ``Polygon`` for a single outer boundary, a
+        ``MultiPolygon`` for several, or None without rings.
+    """
+    if not rings:
+        return None
+    # Rings containing each ring, tested with its first vertex
+    parents = [
+        [
+            j
+            for j, other in enumerate(rings)
+            if j != i and _ring_crossings(other, *ring[0]) % 2
+        ]
+        for i, ring in enumerate(rings)
+    ]
+    polygons: dict[int, list[list[list[float]]]] = {}
+    for i in range(len(rings)):
+        if len(parents[i]) % 2 == 0:
+            polygons[i] = [rings[i].tolist()]
+    for i in range(len(rings)):
+        if len(parents[i]) % 2:
+            # The innermost outer boundary around it is the one with the most
+            # containers; overlapping (malformed) rings may leave none
+            outers = [j for j in parents[i] if j in polygons]
+            if outers:
+                outer = max(outers, key=lambda j: len(parents[j]))
+                polygons[outer].append(rings[i].tolist())
+            else:
+                polygons[i] = [rings[i].tolist()]
+    if len(polygons) == 1:
+        return {"type": "Polygon", "coordinates": next(iter(polygons.values()))}
+    return {"type": "MultiPolygon", "coordinates": list(polygons.values())}
+
+
+# Approximate metres per degree of latitude (and of longitude at the equator)
+METERS_PER_DEGREE = 111_195.0
+
+
+def rings_contain(rings: Rings, longitude: float, latitude: float) -> bool:
+    """
+    Return True if a point is inside the shape formed by ``rings``.
+
+    Tests the rings directly (even-odd over all of them), without building
+    an index.
+    """
+    return sum(_ring_crossings(ring, longitude, latitude) for ring in rings) % 2 == 1
+
+
+def rings_bounds(rings: Rings) -> tuple[float, float, float, float]:
+    """
+    Return the ``(west, south, east, north)`` bounding box of non-empty rings.
+    """
+    stacked = np.concatenate(rings)
+    west, south = stacked.min(axis=0)
+    east, north = stacked.max(axis=0)
+    return float(west), float(south), float(east), float(north)
+
+
+def edge_distance(rings: Rings, longitude: float, latitude: float) -> float:
+    """
+    Return the distance in metres from a point to the nearest ring edge.
+
+    Uses an equirectangular projection around the point, which is accurate to
+    well under a percent at the scale of forecast grid cells.
+    """
+    if not rings:
+        return math.inf
+    scale = math.cos(math.radians(latitude))
+    points = np.concatenate(rings)
+    ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+    ax = (points[:, 0] - longitude) * scale
+    ay = points[:, 1] - latitude
+    dx = (ends[:, 0] - longitude) * scale - ax
+    dy = ends[:, 1] - latitude - ay
+    length = dx * dx + dy * dy
+    # Position of the closest point along each edge, clamped to the edge
+    t = np.clip(
+        np.divide(
+            -(ax * dx + ay * dy), length, out=np.zeros_like(length), where=length > 0
+        ),
+        0.0,
+        1.0,
+    )
+    distance = np.hypot(ax + t * dx, ay + t * dy).min()
+    return float(distance) * METERS_PER_DEGREE
+
+
+class PolygonIndex(Generic[T]):
+    """
+    Immutable grid-hash index of shapes, each carrying a value.
+    """
+
+    def __init__(
+        self, shapes: Sequence[tuple[Rings, T]], cell_degrees: float = 1.0
+    ) -> None:
+        """
+        Index shapes.
+
+        Args:
+            shapes: ``(rings, value)`` pairs; shapes without rings are skipped.
+            cell_degrees: Grid cell size in degrees.
+        """
+        self.cell = cell_degrees
+        self.values: list[T] = []
+        bounds = []
+        starts = [0]
+        x1, y1, y2, slope = [], [], [], []
+        for rings, value in shapes:
+            if not rings:
+                continue
+            for ring in rings:
+                x, y = ring[:, 0], ring[:, 1]
+                xn, yn = np.roll(x, -1), np.roll(y, -1)
+                dy = yn - y
+                x1.append(x)
+                y1.append(y)
+                y2.append(yn)
+                # Horizontal edges never cross the ray; give them any slope
+                slope.append(
+                    np.divide(xn - x, dy, out=np.zeros_like(dy), where=dy != 0)
+                )
+            stacked = np.concatenate(rings)
+            bounds.append((*stacked.min(axis=0), *stacked.max(axis=0)))
+            starts.append(starts[-1] + sum(len(ring) for ring in rings))
+            self.values.append(value)
+        empty = np.empty(0)
+        self._x1 = np.concatenate(x1) if x1 else empty
+        self._y1 = np.concatenate(y1) if y1 else empty
+        self._y2 = np.concatenate(y2) if y2 else empty
+        self._slope = np.concatenate(slope) if slope else empty
+        self._starts = np.asarray(starts, dtype=np.intp)
+        self._bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self._grid: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for shape, (west, south, east, north) in enumerate(bounds):
+            for gx in range(self._cell_of(west), self._cell_of(east) + 1):
+                for gy in range(self._cell_of(south), self._cell_of(north) + 1):
+                    self._grid[(gx, gy)].append(shape)
+        self._grid = dict(self._grid)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _cell_of(self, degrees: float) -> int:
+        return math.floor(degrees / self.cell)
+
+    def candidates(self, longitude: float, latitude: float) -> list[int]:
+        """
+        Return the shapes whose bounding box contains the point.
+        """
+        shapes = self._grid.get((self._cell_of(longitude), self._cell_of(latitude)), ())
+        if not shapes:
+            return []
+        bounds = self._bounds[shapes]
+        inside = (
+            (bounds[:, 0] <= longitude)
+            & (longitude <= bounds[:, 2])
+            & (bounds[:, 1] <= latitude)
+            & (latitude <= bounds[:, 3])
+        )
+        return [shape for shape, hit in zip(shapes, inside) if hit]
+
+    def query(self, longitude: float, latitude: float) -> list[T]:
+        """
+        Return the values of every shape containing the point, in index order.
+        """
+        shapes = self.candidates(longitude, latitude)
+        if not shapes:
+            return []
+        starts = self._starts[shapes]
+        ends = self._starts[np.asarray(shapes) + 1]
+        edges = np.concatenate(
+            [np.arange(start, end) for start, end in zip(starts, ends)]
+        )
+        y1 = self._y1[edges]
+        crosses = ((y1 > latitude) != (self._y2[edges] > latitude)) & (
+            longitude < self._x1[edges] + self._slope[edges] * (latitude - y1)
+        )
+        # Crossings per shape: the candidate edge runs are contiguous
+        offsets = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+        counts = np.add.reduceat(crosses.astype(np.intp), offsets)
+        return [self.values[shape] for shape, n in zip(shapes, counts) if n % 2]
@@ -0,0 +1,192 @@
+"""
+Local spatial index of NWS forecast grid cells.
+
+Every ``/points`` resolution names a forecast office grid cell, and the
+forecast for that cell carries the cell's polygon (about 2.5 km across). Once
+both have been seen, any other coordinate inside the same cell resolves to the
+same forecast URLs, so ``NWSClient.resolve_point`` can answer it locally
+instead of calling ``/points``.
+
+Cells are hashed by bounding box into buckets of a fixed size in degrees. A
+lookup only tests the cells in the point's bucket. Points within ``margin``
+metres of a cell edge are not answered: the published cell polygon and the
+server's own assignment of a point to a cell can disagree slightly there, so
+those points still go to ``/points``.
+"""
+
+import math
+import os
+from collections import OrderedDict
+from typing import Any
+
+from src.weather.geo import (
+    Rings,
+    edge_distance,
+    parse_rings,
+    rings_bounds,
+    rings_contain,
+)
+from src.weather.points_cache import PointResolution
+
+Bounds = tuple[float, float, float, float]
+
+
+class GridCellIndex:
+    """
+    Map of known grid cells to the resolution of a point inside them.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        margin: float = 150.0,
+        bucket_degrees: float = 0.05,
+        max_cells: int = 50_000,
+    ) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            enabled: Whether cells are recorded and looked up.
+            margin: Metres from a cell edge within which points are not
+                resolved locally.
+            bucket_degrees: Size of the hash buckets, in degrees.
+            max_cells: Upper bound on cells held; the oldest are dropped first.
+        """
+        self.enabled = enabled
+        self.margin = margin
+        self.bucket = bucket_degrees
+        self.max_cells = max_cells
+        # Each cell's rings, bounding box and resolution, computed once on add
+        self._cells: OrderedDict[str, tuple[Rings, Bounds, PointResolution]] = (
+            OrderedDict()
+        )
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.edge_fallbacks = 0
+
+    @classmethod
+    def from_env(cls) -> "GridCellIndex":
+        """
+        Build an index from ``WEATHER_GRID_INDEX*`` environment variables.
+        """
+        margin = os.environ.get("WEATHER_GRID_INDEX_MARGIN")
+        return cls(
+            enabled=os.environ.get("WEATHER_GRID_INDEX", "1").lower()
+            in ("1", "true", "yes"),
+            margin=float(margin) if margin else 150.0,
+        )
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def _bucket_range(self, bounds: Bounds) -> list[tuple[int, int]]:
+        west, south, east, north = bounds
+        return [
+            (gx, gy)
+            for gx in range(
+                math.floor(west / self.bucket), math.floor(east / self.bucket) + 1
+            )
+            for gy in range(
+                math.floor(south / self.bucket), math.floor(north / self.bucket) + 1
+            )
+        ]
+
+    def add(self, resolution: PointResolution, geometry: dict[str, Any] | None) -> bool:
+        """
+        Record the cell of a resolution from its forecast's geometry.
+
+        Args:
+            resolution: Resolution of a point inside the cell.
+            geometry: GeoJSON polygon of the cell (the forecast's geometry).
+
+        Returns:
+            bool: True if the cell was added; False if it was already known,
+            the index is disabled or the geometry is unusable.
+        """
+        key = resolution.forecast
+        if not self.enabled or key in self._cells:
+            return False
+        rings = parse_rings(geometry)
+        if not rings:
+            return False
+        bounds = rings_bounds(rings)
+        self._cells[key] = (rings, bounds, resolution)
+        for bucket in self._bucket_range(bounds):
+            self._buckets.setdefault(bucket, set()).add(key)
+        while len(self._cells) > self.max_cells:
+            self._remove(next(iter(self._cells)))
+        return True
+
+    def discard(self, forecast_url: str) -> None:
+        """
+        Forget a cell (e.g. after its forecast URL stopped working).
+        """
+        if forecast_url in self._cells:
+            self._remove(forecast_url)
+
+    def _remove(self, key: str) -> None:
+        _, bounds, _ = self._cells.pop(key)
+        for bucket in self._bucket_range(bounds):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def lookup(self, latitude: float, longitude: float) -> PointResolution | None:
+        """
+        Resolve a point from a known cell containing it.
+
+        Returns:
+            PointResolution | None: The cell's resolution, or None if no known
+            cell contains the point at least ``margin`` metres from its edges.
+        """
+        if not self.enabled:
+            return None
+        bucket = (
+            math.floor(longitude / self.bucket),
+            math.floor(latitude / self.bucket),
+        )
+        for key in self._buckets.get(bucket, ()):
+            rings, (west, south, east, north), resolution = self._cells[key]
+            if not (west <= longitude <= east and south <= latitude <= north):
+                continue
+            if not rings_contain(rings, longitude, latitude):
+                continue
+            if edge_distance(rings, longitude, latitude) < self.margin:
+                self.edge_fallbacks += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return resolution
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return cell count and lookup counters.
+        """
+        return {
+            "entries": len(self._cells),
+            "hits": self.hits,
+            "misses": self.misses,
+            "edge_fallbacks": self.edge_fallbacks,
+        }
+
+
+_shared_grid_index: GridCellIndex | None = None
+
+
+def get_shared_grid_index() -> GridCellIndex:
+    """
+    Return the process-wide ``GridCellIndex``, creating it on first use.
+
+    Returns:
+        GridCellIndex: The shared index.
+    """
+    global _shared_grid_index
+    if _shared_grid_index is None:
+        _shared_grid_index = GridCellIndex.from_env()
+    return _shared_grid_index
@@ -0,0 +1,331 @@
+"""
+Decoding of raw ``/gridpoints/{office}/{x},{y}`` forecast data.
+
+The raw gridpoint endpoint returns dozens of layers (``temperature``,
+``windGust``, ``quantitativePrecipitation``, ...), each a list of
+``{"validTime": "2024-01-01T12:00:00+00:00/PT3H", "value": 12.3}`` objects.
+Each layer is decoded once into a ``TimeSeries``: start offsets and durations
+in seconds plus values, all in NumPy arrays. It can then be resampled to a
+uniform hourly grid with a single ``searchsorted``.
+
+Decoded gridpoints are cached by gridpoint and ``updateTime``. A response
+that is revalidated, or re-downloaded without a new forecast run, reuses the
+decoded layers.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?"
+    r"(?:(?P<seconds>\d+)S)?)?$"
+)
+_SECONDS = {"days": 86400, "hours": 3600, "minutes": 60, "seconds": 1}
+HOUR = 3600
+
+# Layers whose values are totals over their interval rather than levels; they
+# are spread evenly over the hours of the interval when resampled
+ACCUMULATED_LAYERS = frozenset(
+    {"quantitativePrecipitation", "snowfallAmount", "iceAccumulation"}
+)
+
+UNITS = {
+    "degC": "°C",
+    "degF": "°F",
+    "km_h-1": "km/h",
+    "m_s-1": "m/s",
+    "percent": "%",
+    "mm": "mm",
+    "m": "m",
+    "degree_(angle)": "°",
+}
+
+
+def parse_duration(text: str) -> int:
+    """
+    Return the seconds in an ISO 8601 duration such as ``PT3H`` or ``P1DT6H``.
+
+    Raises:
+        ValueError: If the duration is malformed or empty.
+    """
+    match = _DURATION.match(text)
+    if match is None or not any(match.groupdict().values()):
+        raise ValueError(f"Invalid ISO 8601 duration: {text!r}")
+    return sum(
+        int(value) * _SECONDS[name]
+        for name, value in match.groupdict().items()
+        if value
+    )
+
+
+def parse_valid_time(text: str) -> tuple[int, int]:
+    """
+    Parse a ``validTime`` interval (``"<start>/<duration>"``).
+
+    Returns:
+        tuple[int, int]: Start in epoch seconds and duration in seconds.
+
+    Raises:
+        ValueError: If the interval is malformed.
+    """
+    start, _, duration = text.partition("/")
+    return int(datetime.fromisoformat(start).timestamp()), parse_duration(duration)
+
+
+def unit_label(uom: str | None) -> str:
+    """
+    Return a short label for a ``wmoUnit:...`` unit of measure.
+    """
+    code = (uom or "").rpartition(":")[2]
+    return UNITS.get(code, code)
+
+
+@dataclass(frozen=True)
+class TimeSeries:
+    """
+    One gridpoint layer as arrays of intervals.
+
+    Attributes:
+        origin: Epoch seconds of the first interval's start.
+        offsets: Start of each interval, in seconds after ``origin``.
+        durations: Length of each interval, in seconds.
+        values: Value over each interval (NaN where null).
+        unit: Short unit label (e.g. ``"km/h"``).
+        accumulated: Whether values are totals over their interval.
+    """
+
+    origin: int
+    offsets: np.ndarray
+    durations: np.ndarray
+    values: np.ndarray
+    unit: str = ""
+    accumulated: bool = False
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_layer(
+        cls, layer: dict[str, Any], accumulated: bool = False
+    ) -> "TimeSeries":
+        """
+        Decode a layer's ``values`` list.
+
+        Args:
+            layer: Layer object with ``uom`` and ``values``.
+            accumulated: Whether values are totals over their interval.
+
+        Returns:
+            TimeSeries: The decoded intervals, sorted by start.
+
+        Raises:
+            ValueError: If the layer or one of its intervals is malformed.
+        """
+        entries = layer.get("values")
+        if not isinstance(entries, list):
+            raise ValueError("Malformed layer: 'values' is not a list.")
+        count = len(entries)
+        starts = np.empty(count, dtype=np.int64)
+        durations = np.empty(count, dtype=np.int32)
+        values = np.empty(count, dtype=np.float32)
+        try:
+            for i, entry in enumerate(entries):
+                starts[i], durations[i] = parse_valid_time(entry["validTime"])
+                value = entry.get("value")
+                values[i] = np.nan if value is None else value
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            raise ValueError(f"Malformed layer value: {e!r}") from None
+        order = np.argsort(starts, kind="stable")
+        origin = int(starts[order[0]]) if count else 0
+        return cls(
+            origin=origin,
+            offsets=(starts[order] - origin).astype(np.int32),
+            durations=durations[order],
+            values=values[order],
+            unit=unit_label(layer.get("uom")),
+            accumulated=accumulated,
+        )
+
+    def hourly(self, start: int, hours: int) -> np.ndarray:
+        """
+        Resample to a uniform hourly grid.
+
+        Each hour takes the value of the interval covering its start;
+        accumulated values are divided evenly over their interval's hours.
+
+        Args:
+            start: Epoch seconds of the first hour.
+            hours: Number of hours.
+
+        Returns:
+            np.ndarray: ``hours`` float64 values, NaN where no interval
+            covers the hour.
+        """
+        times = (start - self.origin) + HOUR * np.arange(hours, dtype=np.int64)
+        if not len(self):
+            return np.full(hours, np.nan)
+        index = np.searchsorted(self.offsets, times, side="right") - 1
+        clipped = np.maximum(index, 0)
+        covered = (index >= 0) & (
+            times < self.offsets[clipped] + self.durations[clipped]
+        )
+        values = self.values[clipped].astype(np.float64)
+        if self.accumulated:
+            values /= np.maximum(self.durations[clipped] / HOUR, 1.0)
+        return np.where(covered, values, np.nan)
+
+
+@dataclass(frozen=True)
+class Gridpoint:
+    """
+    Decoded raw forecast data of one grid cell.
+
+    Attributes:
+        update_time: The forecast run's ``updateTime``.
+        layers: Decoded layers by API name (e.g. ``"windGust"``).
+    """
+
+    update_time: str | None
+    layers: dict[str, TimeSeries]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "Gridpoint":
+        """
+        Decode every time-series layer of a gridpoint response.
+
+        Properties that are not layers (``elevation``, ``weather``, ...) or
+        whose intervals cannot be decoded are skipped.
+
+        Raises:
+            ValueError: If the payload has no ``properties`` object.
+        """
+        props = payload.get("properties") if isinstance(payload, dict) else None
+        if not isinstance(props, dict):
+            raise ValueError("Malformed response: missing 'properties'.")
+        layers = {}
+        for name, layer in props.items():
+            if not isinstance(layer, dict) or not isinstance(layer.get("values"), list):
+                continue
+            try:
+                layers[name] = TimeSeries.from_layer(
+                    layer, accumulated=name in ACCUMULATED_LAYERS
+                )
+            except ValueError:
+                continue
+        return cls(update_time=props.get("updateTime"), layers=layers)
+
+
+def layer_extremes(series: TimeSeries, start: int, hours: int) -> dict[str, Any]:
+    """
+    Summarize a layer over the hours from ``start``.
+
+    Args:
+        series: Decoded layer.
+        start: Epoch seconds of the first hour.
+        hours: Number of hours.
+
+    Returns:
+        dict[str, Any]: ``max`` with its ``max_time`` (ISO 8601, UTC),
+        ``min`` and ``mean`` of the hourly values (``total`` too for
+        accumulated layers), each rounded to 0.1; None if no hour has data.
+    """
+    values = series.hourly(start, hours)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return {"max": None, "max_time": None, "min": None, "mean": None}
+    peak = int(np.nanargmax(values))
+    summary = {
+        "max": round(float(values[peak]), 1),
+        "max_time": datetime.fromtimestamp(start + peak * HOUR, UTC).isoformat(),
+        "min": round(float(np.nanmin(values)), 1),
+        "mean": round(float(values[valid].mean()), 1),
+    }
+    if series.accumulated:
+        summary["total"] = round(float(values[valid].sum()), 1)
+    return summary
+
+
+class GridpointCache:
+    """
+    LRU of decoded gridpoints keyed by gridpoint, valid for one ``updateTime``.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Decoded gridpoints kept before the least recently
+                used is dropped.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Gridpoint] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "GridpointCache":
+        """
+        Build a cache sized by ``WEATHER_GRIDPOINT_CACHE_ENTRIES``.
+        """
+        value = os.environ.get("WEATHER_GRIDPOINT_CACHE_ENTRIES")
+        return cls(max_entries=int(value) if value else 256)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def decode(self, key: str, payload: dict[str, Any]) -> Gridpoint:
+        """
+        Return the decoded gridpoint for a payload, decoding only if its
+        ``updateTime`` differs from the cached one.
+
+        Args:
+            key: Gridpoint identity (its canonical URL).
+            payload: Raw gridpoint response.
+
+        Raises:
+            ValueError: If the payload is malformed.
+        """
+        props = payload.get("properties") if isinstance(payload, dict) else None
+        update_time = props.get("updateTime") if isinstance(props, dict) else None
+        cached = self._entries.get(key)
+        if cached is not None and update_time and cached.update_time == update_time:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        gridpoint = Gridpoint.from_payload(payload)
+        if self.max_entries > 0:
+            self._entries[key] = gridpoint
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return gridpoint
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return entry count, hits and misses.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_shared_gridpoint_cache: GridpointCache | None = None
+
+
+def get_shared_gridpoint_cache() -> GridpointCache:
+    """
+    Return the process-wide ``GridpointCache``, creating it on first use.
+
+    Returns:
+        GridpointCache: The shared cache.
+    """
+    global _shared_gridpoint_cache
+    if _shared_gridpoint_cache is None:
+        _shared_gridpoint_cache = GridpointCache.from_env()
+    return _shared_gridpoint_cache
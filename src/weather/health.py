@@ -0,0 +1,231 @@
+"""
+Liveness and readiness reporting for load balancers and orchestrators.
+
+Liveness only says the process is serving requests. Readiness says whether a
+replica should receive traffic. It is computed from state the server already
+keeps, so a check never sends its own upstream probe:
+
+- upstream reachability comes from the circuit breakers' recent outcomes;
+- cache warm status comes from the response and points caches and the
+  nationwide alerts snapshot;
+- event-loop lag comes from a background sampler;
+- warm-up progress comes from the hot-set prefetch started with the server;
+- load comes from the number of tool calls in flight.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from src.weather.alerts_index import get_shared_alerts_snapshot
+from src.weather.circuit_breaker import OPEN, get_shared_breakers
+from src.weather.http_cache import get_shared_response_cache
+from src.weather.metrics import get_shared_metrics
+from src.weather.points_cache import get_shared_points_cache
+from src.weather.warmup import DISABLED, DONE, get_shared_warmup
+
+
+@dataclass
+class ReadinessConfig:
+    """
+    Thresholds past which a replica reports itself not ready.
+
+    Attributes:
+        max_loop_lag: Seconds of event-loop lag tolerated.
+        max_in_flight: Tool calls allowed to run at once before the replica
+            asks to be taken out of rotation.
+        require_warmup: Report not ready until the hot-set warm-up has
+            finished, so traffic only arrives once caches are warm.
+    """
+
+    max_loop_lag: float = 0.5
+    max_in_flight: int = 200
+    require_warmup: bool = False
+
+    @classmethod
+    def from_env(cls) -> "ReadinessConfig":
+        """
+        Build thresholds from ``WEATHER_READY_*`` environment variables.
+        """
+        defaults = cls()
+        lag = os.environ.get("WEATHER_READY_MAX_LOOP_LAG")
+        in_flight = os.environ.get("WEATHER_READY_MAX_IN_FLIGHT")
+        require_warmup = os.environ.get("WEATHER_READY_REQUIRE_WARMUP", "")
+        return cls(
+            max_loop_lag=float(lag) if lag else defaults.max_loop_lag,
+            max_in_flight=int(in_flight) if in_flight else defaults.max_in_flight,
+            require_warmup=require_warmup.lower() in ("1", "true", "yes"),
+        )
+
+
+class LoopLagMonitor:
+    """
+    Background sampler of how late the event loop runs scheduled callbacks.
+    """
+
+    def __init__(self, interval: float = 0.25) -> None:
+        """
+        Initialize the monitor without starting it.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: asyncio.Task | None = None
+        self._holders = 0
+
+    async def run(self) -> None:
+        """
+        Sample forever; each sample is how much longer a sleep took than asked.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float) -> None:
+        """
+        Record one lag sample in seconds.
+        """
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+
+    def start(self) -> None:
+        """
+        Start sampling for a server lifetime.
+        """
+        self._holders += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Stop sampling once the last holder releases the monitor.
+        """
+        self._holders = max(0, self._holders - 1)
+        if self._holders or self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+def upstream_status(now: float | None = None) -> dict[str, Any]:
+    """
+    Summarize each NWS endpoint's circuit state and recent outcomes.
+
+    Returns:
+        dict[str, Any]: ``ok`` (no circuit open) and per-endpoint details.
+    """
+    endpoints = {}
+    for name, breaker in get_shared_breakers().breakers().items():
+        calls, failures = breaker.outcome_counts(now)
+        endpoints[name] = {
+            "state": breaker.state,
+            "recent_calls": calls,
+            "recent_failures": failures,
+        }
+    ok = all(endpoint["state"] != OPEN for endpoint in endpoints.values())
+    return {"ok": ok, "endpoints": endpoints}
+
+
+def cache_status() -> dict[str, Any]:
+    """
+    Report cache sizes and whether the alerts snapshot (if enabled) is current.
+
+    Returns:
+        dict[str, Any]: ``ok`` is False only while an enabled alerts snapshot
+        has no current index; empty caches are reported as ``warm: False``.
+    """
+    snapshot = get_shared_alerts_snapshot()
+    response_entries = len(get_shared_response_cache())
+    points_entries = len(get_shared_points_cache())
+    if not snapshot.enabled:
+        alerts_snapshot = "disabled"
+    elif snapshot.current() is not None:
+        alerts_snapshot = "current"
+    else:
+        alerts_snapshot = "cold"
+    return {
+        "ok": alerts_snapshot != "cold",
+        "warm": response_entries > 0 or points_entries > 0,
+        "response_entries": response_entries,
+        "points_entries": points_entries,
+        "alerts_snapshot": alerts_snapshot,
+    }
+
+
+def warmup_status(require_warmup: bool = False) -> dict[str, Any]:
+    """
+    Report hot-set warm-up progress.
+
+    Args:
+        require_warmup: Whether an unfinished warm-up fails the check.
+
+    Returns:
+        dict[str, Any]: ``ok`` plus the warm-up's state and counts.
+    """
+    progress = get_shared_warmup().progress()
+    finished = progress["state"] in (DONE, DISABLED)
+    return {"ok": finished or not require_warmup, **progress}
+
+
+def readiness(
+    monitor: LoopLagMonitor, config: ReadinessConfig
+) -> tuple[bool, dict[str, Any]]:
+    """
+    Evaluate every readiness check.
+
+    Args:
+        monitor: Event-loop lag sampler.
+        config: Thresholds.
+
+    Returns:
+        tuple[bool, dict[str, Any]]: Whether the replica is ready, and a
+        report with one entry per check.
+    """
+    in_flight = sum(get_shared_metrics().tools_in_flight.values())
+    checks = {
+        "upstream": upstream_status(),
+        "caches": cache_status(),
+        "warmup": warmup_status(config.require_warmup),
+        "event_loop": {
+            "ok": monitor.lag <= config.max_loop_lag,
+            "lag_seconds": round(monitor.lag, 4),
+            "max_lag_seconds": round(monitor.max_lag, 4),
+        },
+        "load": {
+            "ok": in_flight <= config.max_in_flight,
+            "tool_calls_in_flight": in_flight,
+            "max_in_flight": config.max_in_flight,
+        },
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return ready, {
+        "status": "ready" if ready else "not_ready",
+        "checked_at": time.time(),
+        "checks": checks,
+    }
+
+
+_shared_loop_monitor: LoopLagMonitor | None = None
+
+
+def get_shared_loop_monitor() -> LoopLagMonitor:
+    """
+    Return the process-wide ``LoopLagMonitor``, creating it on first use.
+
+    Returns:
+        LoopLagMonitor: The shared monitor.
+    """
+    global _shared_loop_monitor
+    if _shared_loop_monitor is None:
+        _shared_loop_monitor = LoopLagMonitor()
+    return _shared_loop_monitor
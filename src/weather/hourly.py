@@ -0,0 +1,239 @@
+"""
+Vectorized summaries of hourly forecasts.
+
+The hourly forecast has about 156 one-hour periods. They are loaded once into
+NumPy arrays (temperature, wind speed, precipitation probability, with NaN
+for missing values). Daily minimum, maximum and mean, and the hours at which
+a value crosses a threshold, are then computed with array operations instead
+of per-period loops.
+"""
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.weather.models import ForecastPeriod
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+# Defaults when the caller gives no threshold, by unit
+FREEZING = {"F": 32.0, "C": 0.0}
+STRONG_WIND = {"mph": 25.0, "km/h": 40.0}
+LIKELY_PRECIPITATION = 50.0
+
+
+def wind_speed_value(text: str) -> float:
+    """
+    Return the highest speed in a wind string (``"10 to 15 mph"`` gives 15).
+
+    Returns:
+        float: The speed, or NaN if the string has no number.
+    """
+    numbers = _NUMBER.findall(text or "")
+    return max(map(float, numbers)) if numbers else float("nan")
+
+
+@dataclass(frozen=True)
+class HourlySeries:
+    """
+    Hourly forecast values as parallel arrays.
+
+    Attributes:
+        start_times: ISO 8601 start time of each hour (with its UTC offset).
+        days: Index into ``dates`` of each hour's local date.
+        dates: Distinct local dates (``YYYY-MM-DD``) in order.
+        temperature: Temperature per hour.
+        wind_speed: Highest sustained wind speed per hour.
+        precipitation: Probability of precipitation (%) per hour.
+        temperature_unit: ``"F"`` or ``"C"``.
+        wind_unit: ``"mph"`` or ``"km/h"``.
+    """
+
+    start_times: tuple[str, ...]
+    days: np.ndarray
+    dates: tuple[str, ...]
+    temperature: np.ndarray
+    wind_speed: np.ndarray
+    precipitation: np.ndarray
+    temperature_unit: str
+    wind_unit: str
+
+    def __len__(self) -> int:
+        return len(self.start_times)
+
+    @classmethod
+    def from_periods(cls, periods: Sequence[ForecastPeriod]) -> "HourlySeries":
+        """
+        Load hourly periods into arrays.
+
+        Args:
+            periods: Hourly forecast periods in time order.
+
+        Returns:
+            HourlySeries: The arrays; missing values are NaN.
+        """
+        start_times = tuple(period.start_time for period in periods)
+        dates, days = np.unique(
+            np.array([start[:10] for start in start_times], dtype=str),
+            return_inverse=True,
+        )
+        temperature = np.array(
+            [
+                np.nan if period.temperature is None else period.temperature
+                for period in periods
+            ],
+            dtype=np.float64,
+        )
+        wind_speed = np.array(
+            [wind_speed_value(period.wind_speed) for period in periods],
+            dtype=np.float64,
+        )
+        precipitation = np.array(
+            [
+                (
+                    np.nan
+                    if period.precipitation_probability is None
+                    else period.precipitation_probability
+                )
+                for period in periods
+            ],
+            dtype=np.float64,
+        )
+        first = periods[0] if periods else None
+        return cls(
+            start_times=start_times,
+            days=days.astype(np.intp),
+            dates=tuple(dates.tolist()),
+            temperature=temperature,
+            wind_speed=wind_speed,
+            precipitation=precipitation,
+            temperature_unit=first.temperature_unit if first else "F",
+            wind_unit="km/h" if first and "km/h" in first.wind_speed else "mph",
+        )
+
+
+def daily_stats(series: HourlySeries, values: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Reduce hourly values to per-day minimum, maximum and mean.
+
+    Args:
+        series: Series whose ``days`` group the hours.
+        values: One value per hour (NaN where missing).
+
+    Returns:
+        dict[str, np.ndarray]: ``min``, ``max`` and ``mean`` arrays with one
+        entry per date; NaN for days without values.
+    """
+    count = len(series.dates)
+    valid = ~np.isnan(values)
+    days = series.days[valid]
+    present = values[valid]
+    counts = np.bincount(days, minlength=count)
+    sums = np.bincount(days, weights=present, minlength=count)
+    low = np.full(count, np.inf)
+    high = np.full(count, -np.inf)
+    np.minimum.at(low, days, present)
+    np.maximum.at(high, days, present)
+    empty = counts == 0
+    low[empty] = high[empty] = np.nan
+    mean = np.divide(
+        sums, counts, out=np.full(count, np.nan), where=~empty, dtype=np.float64
+    )
+    return {"min": low, "max": high, "mean": mean}
+
+
+def crossings(values: np.ndarray, threshold: float) -> list[tuple[int, bool]]:
+    """
+    Find the hours at which values cross a threshold.
+
+    Args:
+        values: One value per hour (NaN where missing).
+        threshold: Level to compare against; reaching it counts as above.
+
+    Returns:
+        list[tuple[int, bool]]: ``(hour index, now at or above)`` for each
+        change, ignoring changes to or from a missing value.
+    """
+    valid = ~np.isnan(values)
+    above = values >= threshold
+    changed = np.flatnonzero(above[1:] != above[:-1]) + 1
+    changed = changed[valid[changed] & valid[changed - 1]]
+    return [(int(hour), bool(above[hour])) for hour in changed]
+
+
+def _number(value: Any) -> float | None:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 1)
+
+
+def summarize(
+    periods: Sequence[ForecastPeriod],
+    temperature_threshold: float | None = None,
+    wind_threshold: float | None = None,
+    precipitation_threshold: float | None = None,
+) -> dict[str, Any]:
+    """
+    Summarize an hourly forecast by day, with threshold crossings.
+
+    Args:
+        periods: Hourly forecast periods in time order.
+        temperature_threshold: Temperature to watch (default freezing, in the
+            forecast's unit).
+        wind_threshold: Wind speed to watch (default 25 mph or 40 km/h).
+        precipitation_threshold: Precipitation probability (%) to watch
+            (default 50).
+
+    Returns:
+        dict[str, Any]: JSON-ready summary with ``hours``, ``start``,
+        ``units``, one ``days`` entry per local date and the ``crossings``
+        in time order.
+    """
+    series = HourlySeries.from_periods(periods)
+    if temperature_threshold is None:
+        temperature_threshold = FREEZING.get(series.temperature_unit, 32.0)
+    if wind_threshold is None:
+        wind_threshold = STRONG_WIND[series.wind_unit]
+    if precipitation_threshold is None:
+        precipitation_threshold = LIKELY_PRECIPITATION
+    temperature = daily_stats(series, series.temperature)
+    wind = daily_stats(series, series.wind_speed)
+    precipitation = daily_stats(series, series.precipitation)
+    days = [
+        {
+            "date": date,
+            "temperature": {
+                name: _number(temperature[name][day]) for name in ("min", "max", "mean")
+            },
+            "wind": {name: _number(wind[name][day]) for name in ("max", "mean")},
+            "precipitation_max": _number(precipitation["max"][day]),
+        }
+        for day, date in enumerate(series.dates)
+    ]
+    watched = (
+        ("temperature", series.temperature, temperature_threshold),
+        ("wind", series.wind_speed, wind_threshold),
+        ("precipitation", series.precipitation, precipitation_threshold),
+    )
+    found = sorted(
+        (hour, measure, threshold, above)
+        for measure, values, threshold in watched
+        for hour, above in crossings(values, threshold)
+    )
+    return {
+        "hours": len(series),
+        "start": series.start_times[0] if len(series) else None,
+        "units": {"temperature": series.temperature_unit, "wind": series.wind_unit},
+        "days": days,
+        "crossings": [
+            {
+                "time": series.start_times[hour],
+                "measure": measure,
+                "threshold": threshold,
+                "direction": "above" if above else "below",
+            }
+            for hour, measure, threshold, above in found
+        ],
+    }
@@ -0,0 +1,526 @@
+"""
+HTTP-semantics cache for parsed NWS responses.
+
+Entries are kept fresh for as long as ``Cache-Control``/``Expires`` allow and
+revalidated with ``If-None-Match``/``If-Modified-Since`` afterwards, so a
+``304 Not Modified`` reuses the payload that was already parsed.
+
+Requests are counted per key with exponentially decaying scores
+(``AccessCounter``), so background refreshing can tell hot keys from cold ones.
+
+An optional ``DiskCache`` tier (``WEATHER_DISK_CACHE_PATH``) persists entries
+across restarts and between processes on the same host. Its SQLite and JSON
+work runs on a single worker thread: reads are awaited through ``lookup``,
+writes are queued and never wait.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping
+
+from src.weather.disk_cache import DiskCache
+from src.weather.models import normalize_payload
+from src.weather.tinylfu import WTinyLFUCache
+
+# Weight given to entries of unknown or tiny size, covering object overhead
+MIN_ENTRY_BYTES = 256
+# Share of ``max_bytes`` holding entries read from disk that the memory tier
+# refused, so that they are not read and decoded again on every access
+DISK_READ_SHARE = 0.125
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """
+    Parse a ``Cache-Control`` header into a directive map.
+
+    Args:
+        value: Raw header value, e.g. ``"public, max-age=300"``.
+
+    Returns:
+        dict[str, str | None]: Lower-cased directive names mapped to their
+        argument, or None for directives without one.
+    """
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: float) -> float | None:
+    """
+    Compute how long a response may be served without revalidation.
+
+    ``s-maxage`` wins over ``max-age`` (this is a cache shared between MCP
+    clients), which wins over ``Expires``. The ``Age`` header is subtracted.
+
+    Args:
+        headers: Response headers.
+        now: Current epoch seconds.
+
+    Returns:
+        float | None: Remaining freshness in seconds (0 when the response must
+        be revalidated before reuse), or None if it must not be stored.
+    """
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    age = 0.0
+    try:
+        age = float(headers.get("age") or 0)
+    except ValueError:
+        pass
+    for name in ("s-maxage", "max-age"):
+        # A directive without a valid number is ignored
+        value = directives.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) - age)
+        except ValueError:
+            continue
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or now
+        return max(0.0, expires - date - age)
+    return 0.0
+
+
+@dataclass
+class CachedResponse:
+    """
+    A parsed upstream payload together with its freshness and validators.
+
+    Attributes:
+        payload: Parsed JSON body; shared between callers, treat as read-only.
+        fresh_until: Epoch seconds after which the entry must be revalidated.
+        lifetime: Freshness lifetime granted when the entry was stored; reused
+            after a 304 that carries no caching headers of its own.
+        etag: ``ETag`` validator, if the upstream sent one.
+        last_modified: ``Last-Modified`` validator, if the upstream sent one.
+        size: Size of the decoded (decompressed) response body in bytes.
+        stored_at: Epoch seconds when the payload was downloaded.
+        key: Cache key (canonical URL) the entry is stored under.
+    """
+
+    payload: Any
+    fresh_until: float
+    lifetime: float = 0.0
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int = 0
+    stored_at: float = field(default_factory=time.time)
+    key: str | None = None
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """
+        Return True if the entry can be served without revalidation.
+        """
+        return (time.time() if now is None else now) < self.fresh_until
+
+    def validators(self) -> dict[str, str]:
+        """
+        Return conditional request headers for revalidating this entry.
+        """
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class AccessCounter:
+    """
+    Per-key request frequency with exponential decay.
+
+    Each request adds one to a key's score, and scores halve every
+    ``half_life`` seconds. A score therefore approximates the requests made
+    in the last ``half_life / ln 2`` seconds, and keys nobody asks for fade
+    out on their own.
+    """
+
+    def __init__(self, half_life: float = 600.0, max_keys: int = 4096) -> None:
+        """
+        Initialize an empty counter.
+
+        Args:
+            half_life: Seconds for a score to decay by half.
+            max_keys: Keys tracked before the coldest are forgotten.
+        """
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def score(self, key: str, now: float | None = None) -> float:
+        """
+        Return a key's decayed score (0 for unknown keys).
+        """
+        recorded = self._scores.get(key)
+        if recorded is None:
+            return 0.0
+        now = time.time() if now is None else now
+        score, updated = recorded
+        return score * 0.5 ** (max(0.0, now - updated) / self.half_life)
+
+    def record(self, key: str, now: float | None = None) -> None:
+        """
+        Count one request for a key.
+        """
+        now = time.time() if now is None else now
+        self._scores[key] = (self.score(key, now) + 1.0, now)
+        if len(self._scores) > self.max_keys:
+            self.prune(now)
+
+    def hottest(
+        self, min_score: float = 0.0, now: float | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Return ``(key, score)`` pairs scoring at least ``min_score``, hottest
+        first.
+        """
+        now = time.time() if now is None else now
+        scored = ((key, self.score(key, now)) for key in list(self._scores))
+        hot = [(key, score) for key, score in scored if score >= min_score]
+        hot.sort(key=lambda item: item[1], reverse=True)
+        return hot
+
+    def prune(self, now: float | None = None) -> None:
+        """
+        Forget keys whose score has decayed to almost nothing, then the coldest
+        keys until 90% of ``max_keys`` remain.
+        """
+        keep = self.hottest(0.05, now)[: int(self.max_keys * 0.9)]
+        self._scores = {key: self._scores[key] for key, _ in keep}
+
+
+class ResponseCache:
+    """
+    Byte-bounded map of URL to ``CachedResponse`` with hit/revalidation
+    counters.
+
+    Memory is bounded by the summed body size of the entries. Which entries
+    stay is decided by W-TinyLFU (see ``tinylfu``), so a single huge fetch
+    cannot flush responses that are requested again and again.
+    """
+
+    def __init__(
+        self, max_bytes: int = 64 * 1024 * 1024, disk: DiskCache | None = None
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound on the summed size of stored responses.
+            disk: Optional persistent tier. Memory misses are read through
+                from it by ``lookup`` and every store and revalidation is
+                written to it, all on a worker thread.
+        """
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries = WTinyLFUCache(max_bytes)
+        self._disk_worker: ThreadPoolExecutor | None = None
+        self._disk_reads: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._disk_read_bytes = 0
+        self._disk_read_max = int(max_bytes * DISK_READ_SHARE)
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self.disk_hits = 0
+        self.access = AccessCounter()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """
+        Build a cache sized by ``WEATHER_RESPONSE_CACHE_MB``, with a disk tier
+        when ``WEATHER_DISK_CACHE_PATH`` is set.
+        """
+        value = os.environ.get("WEATHER_RESPONSE_CACHE_MB")
+        return cls(
+            max_bytes=int(float(value) * 1024 * 1024) if value else 64 << 20,
+            disk=DiskCache.from_env(decode=normalize_payload),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def evictions(self) -> int:
+        """
+        Entries evicted, or refused admission, by the memory tier.
+        """
+        return self._entries.evictions
+
+    def record_access(self, url: str, now: float | None = None) -> None:
+        """
+        Count one request for a URL, for admission and refresh-ahead.
+
+        Called once per request, however many lookups serving it takes.
+        """
+        self.access.record(url, now)
+        self._entries.sketch.increment(url)
+
+    def get(self, url: str) -> CachedResponse | None:
+        """
+        Return the in-memory entry for a URL (fresh or stale), or None.
+
+        Never reads the disk tier; see ``lookup``.
+        """
+        entry = self._entries.get(url, record=False)
+        if entry is not None:
+            return entry
+        entry = self._disk_reads.get(url)
+        if entry is not None:
+            self._disk_reads.move_to_end(url)
+        return entry
+
+    async def lookup(self, url: str) -> CachedResponse | None:
+        """
+        Return the entry for a URL (fresh or stale), reading through to the
+        disk tier on a memory miss, or None if absent.
+
+        The disk read and decoding run on the disk worker thread.
+        """
+        entry = self.get(url)
+        if entry is not None or self.disk is None:
+            return entry
+        row = await asyncio.wrap_future(self._disk_io(self.disk.get, url))
+        # A store or another lookup may have finished in the meantime
+        entry = self.get(url)
+        if entry is not None or row is None:
+            return entry
+        self.disk_hits += 1
+        entry = CachedResponse(key=url, **row)
+        self._remember(url, entry)
+        if url not in self._entries:
+            self._hold_disk_read(url, entry)
+        return entry
+
+    def peek(self, url: str) -> CachedResponse | None:
+        """
+        Return the in-memory entry for a URL without touching LRU order or disk.
+        """
+        return self._entries.peek(url)
+
+    def _remember(self, url: str, entry: CachedResponse) -> None:
+        self._forget_disk_read(url)
+        self._entries.put(url, entry, max(entry.size, MIN_ENTRY_BYTES))
+
+    def _hold_disk_read(self, url: str, entry: CachedResponse) -> None:
+        """
+        Keep an entry read from disk that the memory tier refused, evicting
+        the least recently used such entries past ``DISK_READ_SHARE``.
+        """
+        weight = max(entry.size, MIN_ENTRY_BYTES)
+        if weight > self._disk_read_max:
+            return
+        self._disk_reads[url] = entry
+        self._disk_read_bytes += weight
+        while self._disk_read_bytes > self._disk_read_max:
+            _, dropped = self._disk_reads.popitem(last=False)
+            self._disk_read_bytes -= max(dropped.size, MIN_ENTRY_BYTES)
+
+    def _forget_disk_read(self, url: str) -> None:
+        entry = self._disk_reads.pop(url, None)
+        if entry is not None:
+            self._disk_read_bytes -= max(entry.size, MIN_ENTRY_BYTES)
+
+    def _disk_io(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a disk tier call on the worker thread.
+        """
+        if self._disk_worker is None:
+            self._disk_worker = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="weather-disk-cache"
+            )
+        return self._disk_worker.submit(fn, *args, **kwargs)
+
+    def flush(self) -> None:
+        """
+        Block until every queued disk write has finished.
+        """
+        if self._disk_worker is not None:
+            self._disk_worker.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """
+        Finish queued disk writes and close the disk tier's connection.
+
+        The memory tier is kept, and the disk tier reopens on next use.
+        """
+        if self.disk is None:
+            return
+        if self._disk_worker is not None:
+            self._disk_worker.submit(self.disk.close).result()
+            self._disk_worker.shutdown()
+            self._disk_worker = None
+        else:
+            self.disk.close()
+
+    async def aclose(self) -> None:
+        """
+        ``close`` without blocking the event loop.
+        """
+        await asyncio.to_thread(self.close)
+
+    def store(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        payload: Any,
+        size: int = 0,
+        now: float | None = None,
+    ) -> CachedResponse | None:
+        """
+        Store a freshly downloaded payload if its headers allow caching.
+
+        Responses that are neither fresh nor revalidatable are not kept.
+
+        Args:
+            url: Request URL.
+            headers: Response headers.
+            payload: Parsed JSON body.
+            size: Decoded (decompressed) body size in bytes.
+            now: Current epoch seconds (defaults to ``time.time()``).
+
+        Returns:
+            CachedResponse | None: The stored entry, or None if not cacheable.
+        """
+        now = time.time() if now is None else now
+        lifetime = freshness_lifetime(headers, now)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if lifetime is None or (lifetime <= 0 and not (etag or last_modified)):
+            self._entries.pop(url)
+            self._forget_disk_read(url)
+            if self.disk is not None:
+                self._disk_io(self.disk.delete, url)
+            return None
+        entry = CachedResponse(
+            payload=payload,
+            fresh_until=now + lifetime,
+            lifetime=lifetime,
+            etag=etag,
+            last_modified=last_modified,
+            size=size,
+            stored_at=now,
+            key=url,
+        )
+        self._remember(url, entry)
+        self.stores += 1
+        if self.disk is not None:
+            self._disk_io(
+                self.disk.put,
+                url,
+                payload,
+                entry.fresh_until,
+                entry.lifetime,
+                etag,
+                last_modified,
+                stored_at=now,
+                now=now,
+            )
+        return entry
+
+    def revalidated(
+        self,
+        entry: CachedResponse,
+        headers: Mapping[str, str],
+        now: float | None = None,
+    ) -> None:
+        """
+        Extend an entry's freshness after a ``304 Not Modified`` response.
+
+        Args:
+            entry: The entry that was revalidated.
+            headers: Headers of the 304 response.
+            now: Current epoch seconds (defaults to ``time.time()``).
+        """
+        now = time.time() if now is None else now
+        self.revalidations += 1
+        if "cache-control" in headers or "expires" in headers:
+            entry.lifetime = freshness_lifetime(headers, now) or 0.0
+        entry.fresh_until = now + entry.lifetime
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        if self.disk is not None and entry.key is not None:
+            self._disk_io(
+                self.disk.refresh,
+                entry.key,
+                entry.fresh_until,
+                entry.lifetime,
+                entry.etag,
+                entry.last_modified,
+            )
+
+    def clear(self) -> None:
+        """
+        Drop every in-memory entry.
+        """
+        self._entries.clear()
+        self._disk_reads.clear()
+        self._disk_read_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return cache counters.
+
+        Returns:
+            dict[str, int]: Entry count, bytes held and the limit, hits,
+            misses, 304 revalidations, stores, evictions (including entries
+            refused admission) and admission rejections.
+        """
+        memory = self._entries.stats()
+        return {
+            "entries": memory["entries"],
+            "bytes": memory["bytes"],
+            "max_bytes": memory["max_bytes"],
+            "disk_hits": self.disk_hits,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stores": self.stores,
+            "evictions": memory["evictions"],
+            "evicted_bytes": memory["evicted_bytes"],
+            "rejections": memory["rejections"],
+        }
+
+
+_shared_response_cache: ResponseCache | None = None
+
+
+def get_shared_response_cache() -> ResponseCache:
+    """
+    Return the process-wide ``ResponseCache``, creating it on first use.
+
+    Returns:
+        ResponseCache: The shared cache.
+    """
+    global _shared_response_cache
+    if _shared_response_cache is None:
+        _shared_response_cache = ResponseCache.from_env()
+    return _shared_response_cache
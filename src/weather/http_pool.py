@@ -0,0 +1,429 @@
+"""
+Process-wide pooled HTTP client for all National Weather Service traffic.
+
+Every code path that talks to api.weather.gov goes through a single
+``UpstreamPool`` so keep-alive connections (and their DNS/TCP/TLS setup) are
+reused across tool calls instead of being paid on every request.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.weather.metrics import Metrics, get_shared_metrics
+from src.weather.rate_limit import (
+    RETRY_STATUSES,
+    THROTTLE_STATUSES,
+    AdaptiveRateLimiter,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+NWS_API_BASE = "https://api.weather.gov"
+DEFAULT_USER_AGENT = "weather-app/1.0"
+DEFAULT_ACCEPT = "application/geo+json"
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Return the NWS endpoint a URL belongs to: the first segment of its path.
+
+    Args:
+        url: Absolute NWS URL, e.g. ``https://api.weather.gov/points/1,2``.
+
+    Returns:
+        str: Endpoint name such as ``"points"``, ``"gridpoints"`` or ``"alerts"``.
+    """
+    return urlsplit(url).path.lstrip("/").split("/", 1)[0]
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+@dataclass
+class PoolConfig:
+    """
+    Connection pool and timeout settings for the shared upstream client.
+
+    Attributes:
+        max_connections: Upper bound on concurrent connections to NWS.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection is kept before closing.
+        connect_timeout: Seconds allowed to establish a new connection.
+        default_timeout: Read timeout for endpoints without an override.
+        endpoint_timeouts: Read timeouts keyed by the first path segment of
+            the URL (e.g. ``"points"``, ``"gridpoints"``, ``"alerts"``).
+        prewarm_connections: Connections opened in the background at
+            startup so the first tool calls skip connection setup.
+        user_agent: User-Agent header sent with every request (NWS requires one).
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
+    default_timeout: float = 10.0
+    endpoint_timeouts: dict[str, float] = field(
+        default_factory=lambda: {"points": 5.0, "gridpoints": 10.0, "alerts": 10.0}
+    )
+    prewarm_connections: int = 2
+    user_agent: str = DEFAULT_USER_AGENT
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """
+        Build a configuration from ``WEATHER_HTTP_*`` environment variables.
+
+        Returns:
+            PoolConfig: Settings with environment overrides applied.
+        """
+        defaults = cls()
+        timeouts = dict(defaults.endpoint_timeouts)
+        for endpoint in timeouts:
+            timeouts[endpoint] = _env_float(
+                f"WEATHER_HTTP_TIMEOUT_{endpoint.upper()}", timeouts[endpoint]
+            )
+        return cls(
+            max_connections=_env_int(
+                "WEATHER_HTTP_MAX_CONNECTIONS", defaults.max_connections
+            ),
+            max_keepalive_connections=_env_int(
+                "WEATHER_HTTP_MAX_KEEPALIVE", defaults.max_keepalive_connections
+            ),
+            keepalive_expiry=_env_float(
+                "WEATHER_HTTP_KEEPALIVE_EXPIRY", defaults.keepalive_expiry
+            ),
+            connect_timeout=_env_float(
+                "WEATHER_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout
+            ),
+            default_timeout=_env_float(
+                "WEATHER_HTTP_TIMEOUT", defaults.default_timeout
+            ),
+            endpoint_timeouts=timeouts,
+            prewarm_connections=_env_int(
+                "WEATHER_HTTP_PREWARM", defaults.prewarm_connections
+            ),
+            user_agent=os.environ.get("WEATHER_USER_AGENT", defaults.user_agent),
+        )
+
+
+class UpstreamPool:
+    """
+    Lifecycle-managed wrapper around a single shared ``httpx.AsyncClient``.
+
+    The server acquires the pool when it starts and releases it on shutdown;
+    the underlying client is closed once the last holder releases it. Calls
+    made outside a managed lifetime (tests, library use) lazily create the
+    client on first use.
+    """
+
+    def __init__(
+        self,
+        config: PoolConfig | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """
+        Initialize the pool without opening any connections.
+
+        Args:
+            config: Pool settings; defaults to ``PoolConfig.from_env()``.
+            limiter: Rate limiter applied to every request; defaults to
+                ``AdaptiveRateLimiter.from_env()``.
+            retry: Retry policy for throttled or failed requests.
+            transport: Transport to send requests through instead of the
+                default connection pool (e.g. to reach a local stub server).
+                It is responsible for its own connection limits.
+            metrics: Registry for per-endpoint request metrics; defaults to
+                the process-wide one.
+        """
+        self.config = config if config is not None else PoolConfig.from_env()
+        self.limiter = (
+            limiter if limiter is not None else AdaptiveRateLimiter.from_env()
+        )
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.transport = transport
+        self.metrics = metrics
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._holders = 0
+        self._prewarm_task: asyncio.Task | None = None
+        self.in_flight = 0
+        self.requests_total = 0
+        self.retries_total = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        config = self.config
+        return httpx.AsyncClient(
+            headers={"User-Agent": config.user_agent, "Accept": DEFAULT_ACCEPT},
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                config.default_timeout, connect=config.connect_timeout
+            ),
+            transport=self.transport,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Return the shared client, creating it for the running event loop.
+        """
+        return self._ensure_client()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """
+        Create the client if it is missing, closed or bound to another loop.
+
+        Pooled connections belong to the loop that opened them, so a client
+        left over from a previous (closed) loop is replaced rather than reused.
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if (
+            self._client is None
+            or self._client.is_closed
+            or (loop is not None and self._client_loop is not loop)
+        ):
+            self._client = self._build_client()
+            self._client_loop = loop
+        return self._client
+
+    def timeout_for(self, url: str) -> httpx.Timeout:
+        """
+        Return the timeout to use for a request to the given URL.
+
+        Args:
+            url: Absolute NWS URL.
+
+        Returns:
+            httpx.Timeout: Endpoint-specific read timeout and shared connect timeout.
+        """
+        read = self.config.endpoint_timeouts.get(
+            endpoint_name(url), self.config.default_timeout
+        )
+        return httpx.Timeout(read, connect=self.config.connect_timeout)
+
+    async def get(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """
+        Send a rate-limited GET request through the shared client.
+
+        Throttled (429/503) and gateway-error responses and transport errors
+        are retried according to ``self.retry``, waiting for ``Retry-After``
+        when the upstream sends one. The last response is returned unchecked
+        once retries are exhausted.
+
+        Args:
+            url: Absolute URL to fetch.
+            headers: Extra headers merged over the client defaults.
+
+        Returns:
+            httpx.Response: The (unchecked) upstream response.
+
+        Raises:
+            httpx.TransportError: If the request could not be completed.
+        """
+        return await self._send(url, headers, stream=False)
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Like ``get``, but yield the response before its body has been read.
+
+        The body can then be consumed incrementally (``aiter_bytes``/
+        ``aiter_text``); the response is closed when the block exits.
+
+        Args:
+            url: Absolute URL to fetch.
+            headers: Extra headers merged over the client defaults.
+
+        Yields:
+            httpx.Response: The (unchecked) upstream response.
+
+        Raises:
+            httpx.TransportError: If the request could not be completed.
+        """
+        response = await self._send(url, headers, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _send(
+        self, url: str, headers: dict[str, str] | None, stream: bool
+    ) -> httpx.Response:
+        started = time.monotonic()
+        metrics = self.metrics if self.metrics is not None else get_shared_metrics()
+        endpoint = endpoint_name(url)
+        self.retry.record_request()
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            self.in_flight += 1
+            self.requests_total += 1
+            metrics.upstream_in_flight[endpoint] += 1
+            sent = time.perf_counter()
+            try:
+                if stream:
+                    client = self.client
+                    request = client.build_request(
+                        "GET", url, headers=headers, timeout=self.timeout_for(url)
+                    )
+                    response = await client.send(request, stream=True)
+                else:
+                    response = await self.client.get(
+                        url, headers=headers, timeout=self.timeout_for(url)
+                    )
+            except httpx.TransportError:
+                metrics.observe_upstream(endpoint, "error", time.perf_counter() - sent)
+                delay = self.retry.next_delay(attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+            else:
+                metrics.observe_upstream(
+                    endpoint, response.status_code, time.perf_counter() - sent
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    self.limiter.on_success()
+                    return response
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if response.status_code in THROTTLE_STATUSES:
+                    self.limiter.on_throttle(retry_after)
+                delay = self.retry.next_delay(
+                    attempt, time.monotonic() - started, retry_after
+                )
+                if delay is None:
+                    return response
+                # Release the connection of a response that will be retried
+                await response.aclose()
+            finally:
+                self.in_flight -= 1
+                metrics.upstream_in_flight[endpoint] -= 1
+            self.retries_total += 1
+            metrics.upstream_retries[endpoint] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def prewarm(self, base_url: str = NWS_API_BASE) -> None:
+        """
+        Open ``prewarm_connections`` keep-alive connections to the upstream.
+
+        Failures are logged and otherwise ignored; pre-warming is best effort.
+
+        Args:
+            base_url: Origin to connect to.
+        """
+        count = self.config.prewarm_connections
+        if count <= 0:
+            return
+        results = await asyncio.gather(
+            *(self.get(f"{base_url}/") for _ in range(count)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning("Upstream pre-warm failed: %r", result)
+
+    async def start(self) -> None:
+        """
+        Acquire the pool for a server lifetime and pre-warm it on first use.
+        """
+        self._holders += 1
+        if self._holders == 1:
+            self._ensure_client()
+            self._prewarm_task = asyncio.create_task(self.prewarm())
+
+    async def aclose(self) -> None:
+        """
+        Release the pool; the client is closed when the last holder releases it.
+        """
+        self._holders = max(0, self._holders - 1)
+        if self._holders:
+            return
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            await asyncio.gather(self._prewarm_task, return_exceptions=True)
+            self._prewarm_task = None
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def connection_counts(self) -> tuple[int, int]:
+        """
+        Return ``(open, idle)`` connection counts of the underlying pool.
+
+        Reads httpcore's connection pool, which httpx does not expose
+        publicly; custom transports report ``(0, 0)``.
+        """
+        client = self._client
+        transport = getattr(client, "_transport", None) if client else None
+        connections = getattr(getattr(transport, "_pool", None), "connections", ())
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return a snapshot of pool usage counters.
+
+        Returns:
+            dict[str, Any]: In-flight and total request counts, open and idle
+            connections, and pool limits.
+        """
+        open_connections, idle_connections = self.connection_counts()
+        return {
+            "in_flight": self.in_flight,
+            "connections_open": open_connections,
+            "connections_idle": idle_connections,
+            "requests_total": self.requests_total,
+            "retries_total": self.retries_total,
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections,
+        }
+
+
+_shared_pool: UpstreamPool | None = None
+
+
+def get_shared_pool() -> UpstreamPool:
+    """
+    Return the process-wide ``UpstreamPool``, creating it on first use.
+
+    Returns:
+        UpstreamPool: The shared pool.
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = UpstreamPool()
+    return _shared_pool
@@ -0,0 +1,311 @@
+"""
+Incremental parsing of large GeoJSON FeatureCollections.
+
+``FeatureStreamParser`` consumes a response body chunk by chunk and decodes one
+feature at a time, handing each to a transform that keeps only the fields the
+server needs. Only the current feature and the unconsumed tail of the input
+are held in memory, so peak memory follows the size of the output rather than
+the size of the raw payload.
+
+Objects, arrays and strings are only handed to ``json`` once complete: the
+parser tracks bracket depth and string/escape state across chunks, so a
+feature spanning many chunks is scanned once and decoded once, not re-parsed
+from its start on every chunk.
+"""
+
+import json
+import re
+from collections.abc import AsyncIterable, Callable
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+# Characters that can follow a complete number or literal
+_DELIMITERS = ",]}" + _WHITESPACE
+# Characters that matter when looking for the end of a value, outside and
+# inside strings
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+_OBJECT_START = "object_start"
+_FIRST_KEY = "first_key"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_SEPARATOR = "separator"
+_FIRST_ITEM = "first_item"
+_ITEM = "item"
+_ITEM_SEPARATOR = "item_separator"
+_DONE = "done"
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    """
+    Return the index of the first non-whitespace character from ``pos``.
+    """
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+class FeatureStreamParser:
+    """
+    Push parser for a top-level JSON object with one large array member.
+
+    Members other than the array are decoded normally and kept; elements of
+    the array are decoded one by one and passed through ``transform``.
+    """
+
+    def __init__(
+        self,
+        transform: Callable[[Any], Any],
+        array_key: str = "features",
+    ) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            transform: Called with each decoded array element; its return value
+                is kept (``None`` drops the element).
+            array_key: Name of the top-level member to stream.
+        """
+        self.transform = transform
+        self.array_key = array_key
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _OBJECT_START
+        self._key = ""
+        # Scan of an incomplete object, array or string starting at _pos:
+        # chunks received since, nesting depth and string/escape state
+        self._scanning = False
+        self._pending: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._value_end: int | None = None
+        self.members: dict[str, Any] = {}
+        self.items: list[Any] = []
+
+    def feed(self, chunk: str) -> None:
+        """
+        Consume the next piece of the document.
+
+        Args:
+            chunk: Decoded text continuing the document.
+
+        Raises:
+            ValueError: If the document is not a JSON object.
+        """
+        if self._scanning:
+            # Only the new chunk is scanned; the value stays incomplete until
+            # its closing bracket or quote arrives
+            end = self._scan(chunk, 0)
+            if end is None:
+                self._pending.append(chunk)
+                return
+            head = self._buffer[self._pos :] + "".join(self._pending)
+            self._pending.clear()
+            self._value_end = len(head) + end
+            self._buffer = head + chunk
+        else:
+            # Drop the consumed prefix so the buffer only holds unparsed input
+            self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        self._advance(final=False)
+
+    def close(self) -> dict[str, Any]:
+        """
+        Finish parsing and return the reduced document.
+
+        Returns:
+            dict[str, Any]: Top-level members with the array member replaced by
+            the transformed elements.
+
+        Raises:
+            ValueError: If the document is truncated or malformed.
+        """
+        self._advance(final=True)
+        if _skip_whitespace(self._buffer, self._pos) != len(self._buffer):
+            raise ValueError("Malformed JSON: extra data after document")
+        return self.members
+
+    def _scan(self, text: str, start: int) -> int | None:
+        """
+        Continue scanning for the end of the current value.
+
+        Returns:
+            int | None: Index in ``text`` just past the value's closing
+            bracket or quote, or None if it does not end within ``text``.
+        """
+        i = start
+        if self._escape:
+            if i >= len(text):
+                return None
+            i += 1
+            self._escape = False
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    return None
+                i = match.end()
+                if match.group() == "\\":
+                    if i >= len(text):
+                        self._escape = True
+                        return None
+                    i += 1
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return i
+            else:
+                match = _STRUCTURAL.search(text, i)
+                if match is None:
+                    return None
+                i = match.end()
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth <= 0:
+                        return i
+
+    def _decode(self, final: bool) -> tuple[Any, bool]:
+        """
+        Decode one complete value at the current position.
+
+        Objects, arrays and strings are scanned for their end first and
+        decoded once complete. Any other value is only accepted once a
+        delimiter follows it, or the input is final, since a number or
+        literal cut by a chunk boundary (``2.`` of ``2.5``) could continue.
+        """
+        if self._buffer[self._pos] in '{["':
+            end = self._value_end
+            if end is None and not self._scanning:
+                self._scanning = True
+                self._depth = 0
+                self._in_string = self._escape = False
+                end = self._scan(self._buffer, self._pos)
+            if end is None:
+                if final:
+                    raise ValueError("Malformed JSON: unexpected end of document")
+                return None, False
+            self._scanning = False
+            self._value_end = None
+            # The value is complete, so a decoding error is final
+            value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+            return value, True
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, False
+        if not final and (
+            end == len(self._buffer) or self._buffer[end] not in _DELIMITERS
+        ):
+            return None, False
+        self._pos = end
+        return value, True
+
+    def _next_char(self) -> str:
+        char = self._buffer[self._pos]
+        self._pos += 1
+        return char
+
+    def _advance(self, final: bool) -> None:  # noqa: C901 - flat state machine
+        buffer = self._buffer
+        while self._state != _DONE:
+            self._pos = _skip_whitespace(buffer, self._pos)
+            if self._pos == len(buffer):
+                if final:
+                    raise ValueError("Malformed JSON: unexpected end of document")
+                return
+            state = self._state
+            if state == _OBJECT_START:
+                if self._next_char() != "{":
+                    raise ValueError("Malformed JSON: expected an object")
+                self._state = _FIRST_KEY
+            elif state in (_FIRST_KEY, _KEY):
+                if state == _FIRST_KEY and buffer[self._pos] == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                key, ok = self._decode(final)
+                if not ok:
+                    return
+                if not isinstance(key, str):
+                    raise ValueError("Malformed JSON: object key is not a string")
+                self._key = key
+                self._state = _COLON
+            elif state == _COLON:
+                if self._next_char() != ":":
+                    raise ValueError("Malformed JSON: expected ':'")
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._key == self.array_key and buffer[self._pos] == "[":
+                    self._pos += 1
+                    self.members[self.array_key] = self.items
+                    self._state = _FIRST_ITEM
+                    continue
+                value, ok = self._decode(final)
+                if not ok:
+                    return
+                self.members[self._key] = value
+                self._state = _SEPARATOR
+            elif state == _SEPARATOR:
+                char = self._next_char()
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise ValueError("Malformed JSON: expected ',' or '}'")
+            elif state in (_FIRST_ITEM, _ITEM):
+                if state == _FIRST_ITEM and buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._state = _SEPARATOR
+                    continue
+                item, ok = self._decode(final)
+                if not ok:
+                    return
+                kept = self.transform(item)
+                if kept is not None:
+                    self.items.append(kept)
+                self._state = _ITEM_SEPARATOR
+            elif state == _ITEM_SEPARATOR:
+                char = self._next_char()
+                if char == ",":
+                    self._state = _ITEM
+                elif char == "]":
+                    self._state = _SEPARATOR
+                else:
+                    raise ValueError("Malformed JSON: expected ',' or ']'")
+
+
+async def parse_feature_stream(
+    chunks: AsyncIterable[str],
+    transform: Callable[[Any], Any],
+    array_key: str = "features",
+) -> dict[str, Any]:
+    """
+    Parse a streamed FeatureCollection, transforming features as they arrive.
+
+    Args:
+        chunks: Decoded text chunks of the response body.
+        transform: Applied to every element of ``array_key``.
+        array_key: Top-level member holding the features.
+
+    Returns:
+        dict[str, Any]: The document with transformed features.
+
+    Raises:
+        ValueError: If the body is not a valid JSON object.
+    """
+    parser = FeatureStreamParser(transform, array_key=array_key)
+    async for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
@@ -0,0 +1,336 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Tool calls and upstream requests update plain counters and fixed-bucket
+histograms. The server runs on a single event loop thread, so updates need no
+locks and cost a few dictionary operations per call. Gauges describing caches
+and the connection pool are read from their owners only when ``/metrics`` is
+scraped.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; covers cached answers (sub-millisecond) up to retried upstream calls
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+# (suffix, labels, value); the suffix is appended to the family name
+Sample = tuple[str, Labels, float]
+# (name, type, help, samples)
+Family = tuple[str, str, str, list[Sample]]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram of observed values.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted upper bounds; ``+Inf`` is implied.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        Return ``(le, count)`` pairs with cumulative counts, ending at ``+Inf``.
+        """
+        total = 0
+        pairs = []
+        for bound, count in zip(
+            (*map(format_value, self.buckets), "+Inf"), self.counts
+        ):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+def format_value(value: float) -> str:
+    """
+    Format a sample value the way Prometheus expects.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value: str) -> str:
+    """
+    Escape a label value for the text exposition format.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels) -> str:
+    """
+    Format labels as ``{name="value",...}``, or nothing if there are none.
+    """
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{escape_label(str(v))}"' for name, v in labels)
+    return "{" + inner + "}"
+
+
+class Metrics:
+    """
+    Registry of tool and upstream request metrics.
+
+    Attributes:
+        tool_calls: Completed tool calls by ``(tool, outcome)``.
+        tool_latency: Tool call duration histograms by tool.
+        tools_in_flight: Tool calls currently running by tool.
+        upstream_latency: Upstream request duration histograms by endpoint.
+        upstream_responses: Upstream responses by ``(endpoint, status)``;
+            transport failures are counted with status ``"error"``.
+        upstream_retries: Retried upstream attempts by endpoint.
+        upstream_in_flight: Upstream requests currently running by endpoint.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize with every metric empty.
+        """
+        self.tool_calls: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.tool_latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.tools_in_flight: defaultdict[str, int] = defaultdict(int)
+        self.upstream_latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.upstream_responses: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.upstream_retries: defaultdict[str, int] = defaultdict(int)
+        self.upstream_in_flight: defaultdict[str, int] = defaultdict(int)
+
+    def observe_upstream(
+        self, endpoint: str, status: int | str, seconds: float
+    ) -> None:
+        """
+        Record one upstream attempt.
+
+        Args:
+            endpoint: NWS endpoint name (see ``http_pool.endpoint_name``).
+            status: HTTP status code, or ``"error"`` for transport failures.
+            seconds: Time until the response headers arrived (or the failure).
+        """
+        self.upstream_latency[endpoint].observe(seconds)
+        self.upstream_responses[(endpoint, str(status))] += 1
+
+    def families(self) -> list[Family]:
+        """
+        Return the request metrics as metric families.
+        """
+        families: list[Family] = [
+            (
+                "weather_tool_calls_total",
+                "counter",
+                "Completed MCP tool calls.",
+                [
+                    ("", (("tool", tool), ("outcome", outcome)), count)
+                    for (tool, outcome), count in sorted(self.tool_calls.items())
+                ],
+            ),
+            (
+                "weather_tool_calls_in_flight",
+                "gauge",
+                "MCP tool calls currently running.",
+                [
+                    ("", (("tool", t),), n)
+                    for t, n in sorted(self.tools_in_flight.items())
+                ],
+            ),
+            (
+                "weather_upstream_responses_total",
+                "counter",
+                "NWS responses by endpoint and status (error: no response).",
+                [
+                    ("", (("endpoint", endpoint), ("status", status)), count)
+                    for (endpoint, status), count in sorted(
+                        self.upstream_responses.items()
+                    )
+                ],
+            ),
+            (
+                "weather_upstream_retries_total",
+                "counter",
+                "NWS requests retried after throttling or failure.",
+                [
+                    ("", (("endpoint", e),), n)
+                    for e, n in sorted(self.upstream_retries.items())
+                ],
+            ),
+            (
+                "weather_upstream_in_flight",
+                "gauge",
+                "NWS requests currently waiting for a response.",
+                [
+                    ("", (("endpoint", e),), n)
+                    for e, n in sorted(self.upstream_in_flight.items())
+                ],
+            ),
+        ]
+        families.append(
+            histogram_family(
+                "weather_tool_duration_seconds",
+                "MCP tool call duration.",
+                "tool",
+                self.tool_latency,
+            )
+        )
+        families.append(
+            histogram_family(
+                "weather_upstream_duration_seconds",
+                "NWS request duration until response headers, per attempt.",
+                "endpoint",
+                self.upstream_latency,
+            )
+        )
+        return families
+
+    def render(self, extra: Iterable[Family] = ()) -> str:
+        """
+        Render the request metrics and ``extra`` families as exposition text.
+
+        Args:
+            extra: Additional families, e.g. gauges collected at scrape time.
+
+        Returns:
+            str: Prometheus text format (version 0.0.4).
+        """
+        return render_families([*self.families(), *extra])
+
+
+def gauge_family(
+    name: str, help_text: str, label: str, values: dict[str, float]
+) -> Family:
+    """
+    Build a gauge family with one sample per ``label`` value.
+    """
+    samples: list[Sample] = [
+        ("", ((label, key),), value) for key, value in sorted(values.items())
+    ]
+    return name, "gauge", help_text, samples
+
+
+def histogram_family(
+    name: str, help_text: str, label: str, histograms: dict[str, Histogram]
+) -> Family:
+    """
+    Flatten labelled histograms into ``_bucket``/``_sum``/``_count`` samples.
+    """
+    samples: list[Sample] = []
+    for key, histogram in sorted(histograms.items()):
+        labels = ((label, key),)
+        for le, count in histogram.cumulative():
+            samples.append(("_bucket", (*labels, ("le", le)), count))
+        samples.append(("_sum", labels, histogram.sum))
+        samples.append(("_count", labels, histogram.count))
+    return name, "histogram", help_text, samples
+
+
+def render_families(families: Iterable[Family]) -> str:
+    """
+    Render metric families as Prometheus exposition text.
+    """
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def instrument_tool(
+    tool: str,
+    fn: Callable[..., Awaitable[T]],
+    metrics: Metrics | None = None,
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool function to count calls, time them and track in-flight.
+
+    The wrapper keeps the wrapped signature, so FastMCP derives the same tool
+    schema from it. Calls that raise are counted with outcome ``"exception"``.
+
+    Args:
+        tool: Tool name used as the ``tool`` label.
+        fn: The tool coroutine function.
+        metrics: Registry to record into; defaults to the shared one at call time.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        registry = metrics if metrics is not None else get_shared_metrics()
+        registry.tools_in_flight[tool] += 1
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await fn(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            registry.tools_in_flight[tool] -= 1
+            registry.tool_latency[tool].observe(time.perf_counter() - started)
+            registry.tool_calls[(tool, outcome)] += 1
+
+    return wrapper
+
+
+def instrumented(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorator form of ``instrument_tool`` using the function's name.
+    """
+    return instrument_tool(fn.__name__, fn)
+
+
+_shared_metrics: Metrics | None = None
+
+
+def get_shared_metrics() -> Metrics:
+    """
+    Return the process-wide ``Metrics``, creating it on first use.
+
+    Returns:
+        Metrics: The shared registry.
+    """
+    global _shared_metrics
+    if _shared_metrics is None:
+        _shared_metrics = Metrics()
+    return _shared_metrics
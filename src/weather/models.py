@@ -0,0 +1,335 @@
+"""
+Compact typed models for alerts and forecast periods.
+
+Alerts and forecast periods are converted from the NWS GeoJSON once, when a
+response is parsed, and the same immutable objects are then shared by the
+response cache, the alerts index and the formatters. Slotted frozen
+dataclasses carry no per-instance ``__dict__``, which keeps caches holding
+tens of thousands of alerts small.
+
+For compatibility with code written against the raw API dicts, both models
+also support read-only item access by their API property names
+(``alert["areaDesc"]``, ``period["temperatureUnit"]``).
+"""
+
+import functools
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, ClassVar
+from urllib.parse import urlsplit
+
+from src.weather.geo import Rings, parse_rings, rings_to_geojson
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """
+    The parts of an NWS alert the server reads.
+    """
+
+    id: str | None
+    headline: str | None
+    event: str | None
+    severity: str | None
+    area_desc: str | None
+    description: str | None
+    instruction: str | None
+    expires: str | None = None
+    zones: tuple[str, ...] = ()
+    # Polygon rings as NumPy arrays, for point lookups. Only kept for the
+    # nationwide feed the point index is built from; most zone-based alerts
+    # have none
+    geometry: Rings = field(default=(), compare=False, repr=False)
+
+    API_FIELDS: ClassVar[dict[str, str]] = {
+        "id": "id",
+        "headline": "headline",
+        "event": "event",
+        "severity": "severity",
+        "areaDesc": "area_desc",
+        "description": "description",
+        "instruction": "instruction",
+        "expires": "expires",
+    }
+
+    @classmethod
+    def from_feature(
+        cls, feature: dict[str, Any], with_geometry: bool = False
+    ) -> "Alert":
+        """
+        Build an alert from one feature of an alerts FeatureCollection.
+
+        Args:
+            feature: Alert GeoJSON feature.
+            with_geometry: Whether to keep the feature's polygon.
+
+        Returns:
+            Alert: The alert, with None for any missing property.
+        """
+        props = feature.get("properties") or {}
+        geocode = props.get("geocode") or {}
+        return cls(
+            id=feature.get("id") or props.get("id"),
+            headline=props.get("headline"),
+            event=props.get("event"),
+            severity=props.get("severity"),
+            area_desc=props.get("areaDesc"),
+            description=props.get("description"),
+            instruction=props.get("instruction"),
+            expires=props.get("expires"),
+            zones=tuple(geocode.get("UGC") or ()),
+            geometry=parse_rings(feature.get("geometry")) if with_geometry else (),
+        )
+
+    @classmethod
+    def coerce(
+        cls, item: "Alert | dict[str, Any]", with_geometry: bool = False
+    ) -> "Alert":
+        """
+        Return ``item`` if it is already an alert, else build one from a feature.
+        """
+        if isinstance(item, dict):
+            return cls.from_feature(item, with_geometry=with_geometry)
+        return item
+
+    @property
+    def states(self) -> frozenset[str]:
+        """
+        Two-letter state codes of the UGC zones the alert applies to.
+        """
+        return frozenset(zone[:2] for zone in self.zones)
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, self.API_FIELDS[name])
+        except KeyError:
+            raise KeyError(name) from None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the alert as a plain dict keyed by attribute name.
+        """
+        return asdict(self)
+
+    def to_api(self) -> dict[str, Any]:
+        """
+        Return the alert as a (reduced) GeoJSON feature ``from_feature`` reads.
+        """
+        props = {key: getattr(self, attr) for key, attr in self.API_FIELDS.items()}
+        props["geocode"] = {"UGC": list(self.zones)}
+        feature: dict[str, Any] = {"id": self.id, "properties": props}
+        if self.geometry:
+            feature["geometry"] = rings_to_geojson(self.geometry)
+        return feature
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastPeriod:
+    """
+    One period of a gridpoint forecast (12-hourly or hourly).
+    """
+
+    name: str
+    temperature: int | float | None
+    temperature_unit: str
+    wind_speed: str
+    wind_direction: str
+    detailed_forecast: str
+    short_forecast: str = ""
+    start_time: str = ""
+    end_time: str = ""
+    is_daytime: bool | None = None
+    precipitation_probability: int | float | None = None
+
+    API_FIELDS: ClassVar[dict[str, str]] = {
+        "name": "name",
+        "temperature": "temperature",
+        "temperatureUnit": "temperature_unit",
+        "windSpeed": "wind_speed",
+        "windDirection": "wind_direction",
+        "detailedForecast": "detailed_forecast",
+        "shortForecast": "short_forecast",
+        "startTime": "start_time",
+        "endTime": "end_time",
+        "isDaytime": "is_daytime",
+        "probabilityOfPrecipitation": "precipitation_probability",
+    }
+    REQUIRED: ClassVar[tuple[str, ...]] = (
+        "name",
+        "temperature",
+        "temperatureUnit",
+        "windSpeed",
+        "windDirection",
+        "detailedForecast",
+    )
+
+    @classmethod
+    def from_api(cls, period: dict[str, Any]) -> "ForecastPeriod":
+        """
+        Build a period from one entry of a forecast's ``periods`` list.
+
+        Args:
+            period: Forecast period as returned by the API.
+
+        Returns:
+            ForecastPeriod: The period.
+
+        Raises:
+            ValueError: If the period is not an object or lacks a field the
+                formatters need.
+        """
+        if not isinstance(period, dict):
+            raise ValueError("Malformed response: forecast period is not an object.")
+        missing = [key for key in cls.REQUIRED if key not in period]
+        if missing:
+            raise ValueError(
+                f"Malformed response: forecast period is missing {missing[0]!r}."
+            )
+        return cls(
+            name=period["name"],
+            temperature=period["temperature"],
+            temperature_unit=period["temperatureUnit"],
+            wind_speed=period["windSpeed"],
+            wind_direction=period["windDirection"],
+            detailed_forecast=period["detailedForecast"],
+            short_forecast=period.get("shortForecast") or "",
+            start_time=period.get("startTime") or "",
+            end_time=period.get("endTime") or "",
+            is_daytime=period.get("isDaytime"),
+            precipitation_probability=quantity_value(
+                period.get("probabilityOfPrecipitation")
+            ),
+        )
+
+    @classmethod
+    def coerce(cls, item: "ForecastPeriod | dict[str, Any]") -> "ForecastPeriod":
+        """
+        Return ``item`` if it is already a period, else build one from the API dict.
+        """
+        return cls.from_api(item) if isinstance(item, dict) else item
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, self.API_FIELDS[name])
+        except KeyError:
+            raise KeyError(name) from None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the period as a plain dict keyed by attribute name.
+        """
+        return asdict(self)
+
+    def to_api(self) -> dict[str, Any]:
+        """
+        Return the period keyed by API property names, as ``from_api`` reads.
+        """
+        api = {key: getattr(self, attr) for key, attr in self.API_FIELDS.items()}
+        api["probabilityOfPrecipitation"] = {
+            "unitCode": "wmoUnit:percent",
+            "value": self.precipitation_probability,
+        }
+        return api
+
+
+def quantity_value(quantity: Any) -> int | float | None:
+    """
+    Return the number in an API quantity (``{"unitCode": ..., "value": ...}``).
+
+    Plain numbers are returned as-is; anything else gives None.
+    """
+    if isinstance(quantity, dict):
+        quantity = quantity.get("value")
+    if isinstance(quantity, (int, float)) and not isinstance(quantity, bool):
+        return quantity
+    return None
+
+
+def is_forecast_url(url: str) -> bool:
+    """
+    Return True for gridpoint forecast and hourly forecast URLs.
+    """
+    path = urlsplit(url).path
+    return path.startswith("/gridpoints/") and (
+        path.endswith("/forecast") or path.endswith("/forecast/hourly")
+    )
+
+
+def parse_forecast_payload(payload: Any) -> Any:
+    """
+    Replace a forecast payload's ``periods`` with ``ForecastPeriod`` objects.
+
+    Payloads that do not have the expected shape are returned unchanged so the
+    caller's own validation reports them.
+
+    Args:
+        payload: Parsed forecast (or hourly forecast) response.
+
+    Returns:
+        Any: A new payload dict with typed periods, or ``payload`` itself.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    props = payload.get("properties")
+    if not isinstance(props, dict) or not isinstance(props.get("periods"), list):
+        return payload
+    try:
+        periods = [ForecastPeriod.from_api(period) for period in props["periods"]]
+    except ValueError:
+        return payload
+    return {**payload, "properties": {**props, "periods": periods}}
+
+
+def alert_parser(url: str) -> Callable[[dict[str, Any]], Alert]:
+    """
+    Return the feature parser for an alerts URL.
+
+    Polygons are only kept for the nationwide ``/alerts/active`` feed, which
+    the point index is built from; per-state and per-zone responses drop
+    them.
+    """
+    parts = urlsplit(url)
+    if parts.path == "/alerts/active" and not parts.query:
+        return functools.partial(Alert.from_feature, with_geometry=True)
+    return Alert.from_feature
+
+
+def normalize_payload(url: str, payload: Any) -> Any:
+    """
+    Convert a plain JSON payload for ``url`` to the typed form responses are
+    cached in: ``Alert`` features for alerts, ``ForecastPeriod`` periods for
+    forecasts, anything else unchanged.
+
+    Used for payloads that did not come through the response parser, e.g.
+    ones read back from the on-disk cache.
+
+    Args:
+        url: URL the payload was fetched from.
+        payload: Parsed JSON, possibly already typed.
+
+    Returns:
+        Any: The typed payload.
+    """
+    if is_forecast_url(url):
+        return parse_forecast_payload(payload)
+    if urlsplit(url).path.startswith("/alerts") and isinstance(payload, dict):
+        features = payload.get("features")
+        if isinstance(features, list):
+            parse = alert_parser(url)
+            return {
+                **payload,
+                "features": [f if isinstance(f, Alert) else parse(f) for f in features],
+            }
+    return payload
+
+
+def encode_model(obj: Any) -> Any:
+    """
+    ``json.dumps`` default hook writing models in their API shape.
+
+    Raises:
+        TypeError: For objects that are not models.
+    """
+    if isinstance(obj, (Alert, ForecastPeriod)):
+        return obj.to_api()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
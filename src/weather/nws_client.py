@@ -1,67 +1,230 @@
+import codecs
 import httpx
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 
+from src.weather.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    get_shared_breakers,
+    record_stale,
+)
+from src.weather.http_cache import (
+    CachedResponse,
+    ResponseCache,
+    get_shared_response_cache,
+)
+from src.weather.grid_index import GridCellIndex, get_shared_grid_index
+from src.weather.gridpoints import (
+    Gridpoint,
+    GridpointCache,
+    get_shared_gridpoint_cache,
+)
+from src.weather.http_pool import (
+    NWS_API_BASE,
+    UpstreamPool,
+    endpoint_name,
+    get_shared_pool,
+)
+from src.weather.json_stream import parse_feature_stream
+from src.weather.models import (
+    Alert,
+    alert_parser,
+    is_forecast_url,
+    parse_forecast_payload,
+)
+from src.weather.points_cache import (
+    PointResolution,
+    PointsCache,
+    get_shared_points_cache,
+    normalize_coordinates,
+)
+from src.weather.profiling import phase
+from src.weather.singleflight import (
+    SingleFlight,
+    canonical_url,
+    get_shared_singleflight,
+)
+
+# Endpoints whose (potentially very large) bodies are parsed incrementally,
+# building one model object per feature and discarding everything else. Each
+# maps a URL to its feature parser.
+STREAMED_FEATURES = {"alerts": alert_parser}
+
+
+class _CountedText:
+    """
+    Text chunks of a streamed response, counting its decoded body bytes.
+
+    Entries are weighed by decoded (decompressed) body size whether they were
+    streamed or buffered, so ``size`` matches ``len(response.content)``.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.response = response
+        self.size = 0
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder(self.response.encoding or "utf-8")(
+            errors="replace"
+        )
+        async for chunk in self.response.aiter_bytes():
+            self.size += len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """
+    Return True for errors that a stale cached payload may paper over.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        return response is not None and response.status_code >= 500
+    return isinstance(error, httpx.RequestError)
+
 
 class NWSClient:
-    RETRY_DELAY_SECONDS = 1
     """
     Client for interacting with the National Weather Service (NWS) API.
 
     Provides methods to fetch weather alerts and other data from the NWS API asynchronously.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pool: UpstreamPool | None = None,
+        points_cache: PointsCache | None = None,
+        response_cache: ResponseCache | None = None,
+        singleflight: SingleFlight | None = None,
+        breakers: CircuitBreakers | None = None,
+        grid_index: GridCellIndex | None = None,
+        gridpoint_cache: GridpointCache | None = None,
+    ) -> None:
         """
         Initialize a new NWSClient instance.
+
+        Args:
+            pool: Upstream connection pool; defaults to the process-wide pool so
+                every client reuses the same keep-alive connections.
+            points_cache: Cache of point resolutions; defaults to the
+                process-wide cache.
+            response_cache: HTTP-semantics cache of parsed responses; defaults
+                to the process-wide cache.
+            singleflight: Coalescer for concurrent identical requests; defaults
+                to the process-wide one.
+            breakers: Per-endpoint circuit breakers; defaults to the
+                process-wide registry.
+            grid_index: Spatial index of known forecast grid cells; defaults
+                to the process-wide index.
+            gridpoint_cache: Cache of decoded raw gridpoint data; defaults to
+                the process-wide cache.
         """
-        pass
+        self._pool = pool if pool is not None else get_shared_pool()
+        self.points_cache = (
+            points_cache if points_cache is not None else get_shared_points_cache()
+        )
+        self.response_cache = (
+            response_cache
+            if response_cache is not None
+            else get_shared_response_cache()
+        )
+        self.singleflight = (
+            singleflight if singleflight is not None else get_shared_singleflight()
+        )
+        self.breakers = breakers if breakers is not None else get_shared_breakers()
+        self.grid_index = (
+            grid_index if grid_index is not None else get_shared_grid_index()
+        )
+        self.gridpoint_cache = (
+            gridpoint_cache
+            if gridpoint_cache is not None
+            else get_shared_gridpoint_cache()
+        )
 
-    async def get_alerts(self, state: str):
+    async def get_alerts(self, state: str) -> list[Alert]:
         """
         Fetch active weather alerts for a given US state.
-        Returns a list of dicts with keys: headline, event, severity.
-        """
-        import asyncio
-
-        url = f"https://api.weather.gov/alerts/active?area={state}"
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                data = await self._make_request(url)
-                break
-            except httpx.HTTPStatusError as e:
-                if (
-                    hasattr(e, "response")
-                    and e.response is not None
-                    and getattr(e.response, "status_code", None) == 429
-                ):
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(self.RETRY_DELAY_SECONDS)
-                        continue
-                raise
-        else:
-            raise httpx.HTTPStatusError(
-                "Too Many Requests after retries", request=None, response=None
-            )
+        Returns a list of Alert objects (headline, event, severity, ...).
+        """
+        url = f"{NWS_API_BASE}/alerts/active?area={state}"
+        # Throttling is retried with backoff by the shared upstream pool
+        data = await self._make_request(url)
         features = data.get("features")
         if not isinstance(features, list):
             raise ValueError("Malformed response: missing or invalid 'features' key")
-        alerts = []
-        for feature in features:
-            prop = feature.get("properties", {})
-            alerts.append(
-                {
-                    "headline": prop.get("headline"),
-                    "event": prop.get("event"),
-                    "severity": prop.get("severity"),
-                }
-            )
-        return alerts
+        return [Alert.coerce(feature) for feature in features]
+
+    async def resolve_point(self, latitude: float, longitude: float) -> PointResolution:
+        """
+        Resolve coordinates to their forecast office grid URLs.
+
+        Cached resolutions are returned without an upstream call, as are points
+        well inside a grid cell already known to the grid index; otherwise the
+        ``/points`` endpoint is queried and the result cached.
+
+        Args:
+            latitude: Latitude of the location.
+            longitude: Longitude of the location.
+
+        Returns:
+            PointResolution: Forecast, hourly, gridpoint and zone URLs.
+
+        Raises:
+            ValueError: If the points response is missing the forecast URL.
+        """
+        cached = self.points_cache.get(latitude, longitude)
+        if cached is not None:
+            return cached
+        local = self.grid_index.lookup(latitude, longitude)
+        if local is not None:
+            return local
+        lat, lon = normalize_coordinates(latitude, longitude)
+        data = await self._make_request(f"{NWS_API_BASE}/points/{lat},{lon}")
+        resolution = PointResolution.from_points_response(data)
+        self.points_cache.put(lat, lon, resolution)
+        return resolution
+
+    async def get_gridpoint(self, url: str) -> tuple[dict[str, Any], Gridpoint]:
+        """
+        Fetch raw gridpoint data and decode its time-series layers.
+
+        The payload goes through the response cache as usual. Decoding is
+        skipped when the gridpoint's ``updateTime`` has not changed since it
+        was last decoded.
+
+        Args:
+            url: A ``/gridpoints/{office}/{x},{y}`` URL.
+
+        Returns:
+            tuple[dict[str, Any], Gridpoint]: The raw payload and its decoded
+            layers.
+
+        Raises:
+            ValueError: If the response is malformed.
+        """
+        payload = await self._make_request(url)
+        return payload, self.gridpoint_cache.decode(canonical_url(url), payload)
 
     async def _make_request(self, url: str) -> dict[str, Any]:
         """
         Make an asynchronous GET request to the given URL and return the parsed JSON response.
 
+        Fresh cached responses are returned without an upstream call; stale
+        ones are revalidated with their ``ETag``/``Last-Modified`` validators
+        and reused as-is on ``304 Not Modified``. The returned payload may be
+        shared with other callers and must not be mutated.
+
+        If the upstream fails (or its circuit is open) and a previously cached
+        payload exists, that payload is served instead and its age reported
+        through ``circuit_breaker.track_staleness``.
+
         Args:
             url (str): The URL to send the GET request to.
 
@@ -70,13 +233,135 @@ class NWSClient:
 
         Raises:
             httpx.HTTPStatusError: If the response status is not 200.
+            httpx.RequestError: If the upstream is unreachable, including
+                ``CircuitOpenError`` when its circuit is open.
             ValueError: If the response body is not valid JSON.
         """
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()  # Will raise HTTPStatusError for non-200
-            try:
-                return response.json()
-            except ValueError as e:
-                # Let JSON errors propagate for test coverage
+        key = canonical_url(url)
+        self.response_cache.record_access(key)
+        # The only disk tier read for this request; _fetch and the stale
+        # fallback reuse the entry
+        entry = await self.response_cache.lookup(key)
+        if entry is not None and entry.is_fresh():
+            self.response_cache.hits += 1
+            return entry.payload
+        try:
+            # Concurrent callers for the same URL share one fetch and one parse
+            return await self.singleflight.do(
+                key, lambda: self._fetch(url, key, entry=entry)
+            )
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            stale = self.response_cache.get(key) or entry
+            if stale is None or not _is_upstream_failure(e):
                 raise
+            record_stale(time.time() - stale.stored_at)
+            return stale.payload
+
+    async def refresh(self, url: str) -> dict[str, Any]:
+        """
+        Revalidate or re-download a URL even if its cached entry is still fresh.
+
+        Used to refresh popular entries ahead of their expiry. The request is
+        not counted as an access, and it joins any fetch already in flight.
+
+        Args:
+            url: The URL to refresh.
+
+        Returns:
+            dict[str, Any]: The parsed (or revalidated cached) JSON payload.
+        """
+        key = canonical_url(url)
+        entry = await self.response_cache.lookup(key)
+        return await self.singleflight.do(
+            key, lambda: self._fetch(url, key, refresh=True, entry=entry)
+        )
+
+    async def _fetch(
+        self,
+        url: str,
+        key: str,
+        refresh: bool = False,
+        entry: CachedResponse | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch a URL upstream, revalidating and updating its cache entry.
+
+        Args:
+            url: The URL to request.
+            key: Canonical cache key for the URL.
+            refresh: Go upstream even if the cached entry is still fresh.
+            entry: The entry the caller looked up, if any.
+
+        Returns:
+            dict[str, Any]: The parsed (or revalidated cached) JSON payload.
+        """
+        cache = self.response_cache
+        # A fetch that finished since the caller's lookup may have stored a
+        # newer entry; only memory is checked again
+        entry = cache.get(key) or entry
+        if not refresh:
+            if entry is not None and entry.is_fresh():
+                cache.hits += 1
+                return entry.payload
+            cache.misses += 1
+        breaker = self.breakers.for_url(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for NWS endpoint '{breaker.name}'")
+        validators = entry.validators() if entry is not None else None
+        parser_for = STREAMED_FEATURES.get(endpoint_name(url))
+        try:
+            if parser_for is not None:
+                async with self._pool.stream(
+                    url, headers=validators or None
+                ) as response:
+                    revalidated = self._check_response(response, breaker, entry)
+                    if revalidated is not None:
+                        return revalidated.payload
+                    # Parsing is interleaved with reading the body
+                    body = _CountedText(response)
+                    with phase("decode"):
+                        payload = await parse_feature_stream(body, parser_for(url))
+                    size = body.size
+            else:
+                response = await self._pool.get(url, headers=validators or None)
+                revalidated = self._check_response(response, breaker, entry)
+                if revalidated is not None:
+                    return revalidated.payload
+                # Let JSON errors (ValueError) propagate to the caller
+                with phase("decode"):
+                    payload = response.json()
+                    if is_forecast_url(url):
+                        payload = parse_forecast_payload(payload)
+                size = len(response.content)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        cache.store(key, response.headers, payload, size=size)
+        return payload
+
+    def _check_response(
+        self,
+        response: httpx.Response,
+        breaker: CircuitBreaker,
+        entry: CachedResponse | None,
+    ) -> CachedResponse | None:
+        """
+        Record a response with the breaker and cache, raising on error statuses.
+
+        Returns:
+            CachedResponse | None: ``entry`` if the response was a ``304`` that
+            revalidated it (its payload should be reused), None if the response
+            carries a new body.
+
+        Raises:
+            httpx.HTTPStatusError: If the response status is an error.
+        """
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if entry is not None and response.status_code == 304:
+            self.response_cache.revalidated(entry, response.headers)
+            return entry
+        response.raise_for_status()  # Will raise HTTPStatusError for non-200
+        return None
@@ -0,0 +1,331 @@
+"""
+Cache of ``/points/{lat},{lon}`` resolutions.
+
+A point's forecast office and grid cell almost never change, so the URLs
+returned by the points endpoint are kept for a long time (optionally on disk)
+and repeat forecasts for the same location skip straight to the forecast call.
+
+Writes to the persistence file (appended lines and compactions) run on a
+single worker thread, in order, so a cache miss never waits for the disk.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+COORDINATE_PRECISION = 4
+# Superseded lines tolerated in the persistence file before it is rewritten;
+# it is also rewritten once it holds more superseded lines than live ones
+COMPACT_MIN_LINES = 1000
+
+
+def normalize_coordinates(latitude: float, longitude: float) -> tuple[float, float]:
+    """
+    Round coordinates to the precision accepted by the NWS points endpoint.
+
+    Args:
+        latitude: Latitude in decimal degrees.
+        longitude: Longitude in decimal degrees.
+
+    Returns:
+        tuple[float, float]: Rounded ``(latitude, longitude)``.
+    """
+    return (
+        round(float(latitude), COORDINATE_PRECISION) + 0.0,
+        round(float(longitude), COORDINATE_PRECISION) + 0.0,
+    )
+
+
+@dataclass(frozen=True)
+class PointResolution:
+    """
+    URLs and grid identifiers resolved for a point.
+
+    Attributes:
+        forecast: 12-hour period forecast URL.
+        forecast_hourly: Hourly forecast URL.
+        forecast_grid_data: Raw gridpoint data URL.
+        forecast_zone: Public forecast zone URL.
+        grid_id: Forecast office identifier (e.g. ``"LOX"``).
+        grid_x: Grid column within the office grid.
+        grid_y: Grid row within the office grid.
+        resolved_at: Epoch seconds when the resolution was fetched.
+    """
+
+    forecast: str
+    forecast_hourly: str | None = None
+    forecast_grid_data: str | None = None
+    forecast_zone: str | None = None
+    grid_id: str | None = None
+    grid_x: int | None = None
+    grid_y: int | None = None
+    resolved_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_points_response(cls, data: dict[str, Any] | None) -> "PointResolution":
+        """
+        Build a resolution from a ``/points`` response body.
+
+        Args:
+            data: Parsed JSON from the points endpoint.
+
+        Returns:
+            PointResolution: The extracted URLs and grid identifiers.
+
+        Raises:
+            ValueError: If the response has no ``properties.forecast`` URL.
+        """
+        if not data or "properties" not in data or "forecast" not in data["properties"]:
+            raise ValueError("Malformed response: missing 'properties' or 'forecast'.")
+        props = data["properties"]
+        return cls(
+            forecast=props["forecast"],
+            forecast_hourly=props.get("forecastHourly"),
+            forecast_grid_data=props.get("forecastGridData"),
+            forecast_zone=props.get("forecastZone"),
+            grid_id=props.get("gridId"),
+            grid_x=props.get("gridX"),
+            grid_y=props.get("gridY"),
+        )
+
+
+class PointsCache:
+    """
+    In-memory map of normalized coordinates to ``PointResolution`` with a TTL.
+
+    When ``path`` is set, new resolutions are appended to a JSON-lines file and
+    replayed on startup so the cache survives restarts. The file is compacted
+    on load and whenever superseded lines pile up.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        path: str | Path | None = None,
+        max_entries: int = 50_000,
+    ) -> None:
+        """
+        Initialize the cache, loading any persisted entries.
+
+        Args:
+            ttl: Seconds a resolution stays valid.
+            path: Optional JSON-lines file used for persistence.
+            max_entries: Upper bound on in-memory entries; the oldest are
+                dropped first when it is exceeded.
+        """
+        self.ttl = ttl
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self._entries: dict[str, PointResolution] = {}
+        self.hits = 0
+        self.misses = 0
+        # Lines in the persistence file, live or superseded
+        self._lines = 0
+        self._writer: ThreadPoolExecutor | None = None
+        if self.path is not None:
+            self._load(self.path)
+
+    @classmethod
+    def from_env(cls) -> "PointsCache":
+        """
+        Build a cache from ``WEATHER_POINTS_CACHE_*`` environment variables.
+
+        Returns:
+            PointsCache: Cache with the configured TTL and persistence path.
+        """
+        ttl = os.environ.get("WEATHER_POINTS_CACHE_TTL")
+        return cls(
+            ttl=float(ttl) if ttl else DEFAULT_TTL_SECONDS,
+            path=os.environ.get("WEATHER_POINTS_CACHE_PATH") or None,
+        )
+
+    @staticmethod
+    def key(latitude: float, longitude: float) -> str:
+        """
+        Return the cache key for a coordinate pair.
+        """
+        lat, lon = normalize_coordinates(latitude, longitude)
+        return f"{lat},{lon}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, latitude: float, longitude: float) -> PointResolution | None:
+        """
+        Return the cached resolution for a point, or None if missing or expired.
+        """
+        key = self.key(latitude, longitude)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.time() - entry.resolved_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def peek(self, latitude: float, longitude: float) -> PointResolution | None:
+        """
+        Return the cached resolution for a point without counting a hit or miss.
+        """
+        entry = self._entries.get(self.key(latitude, longitude))
+        if entry is None or time.time() - entry.resolved_at > self.ttl:
+            return None
+        return entry
+
+    def put(
+        self, latitude: float, longitude: float, resolution: PointResolution
+    ) -> None:
+        """
+        Store a resolution for a point and persist it if enabled.
+        """
+        key = self.key(latitude, longitude)
+        self._store(key, resolution)
+        if self.path is not None:
+            self._append(key, resolution)
+
+    def invalidate(self, latitude: float, longitude: float) -> None:
+        """
+        Drop the cached resolution for a point (e.g. after the grid moved).
+
+        With persistence enabled, a tombstone is appended so the resolution
+        does not come back when the file is replayed after a restart.
+        """
+        key = self.key(latitude, longitude)
+        if self._entries.pop(key, None) is not None and self.path is not None:
+            self._write_line({"key": key, "deleted": True})
+
+    def _store(self, key: str, resolution: PointResolution) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = resolution
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def _append(self, key: str, resolution: PointResolution) -> None:
+        self._write_line({"key": key, **asdict(resolution)})
+
+    def _write_line(self, record: dict[str, Any]) -> None:
+        """
+        Queue a line for the persistence file, compacting it if due.
+        """
+        if self.path is None:
+            return
+        self._lines += 1
+        superseded = self._lines - len(self._entries)
+        if superseded > max(COMPACT_MIN_LINES, len(self._entries)):
+            self._lines = len(self._entries)
+            self._submit(_rewrite, self.path, list(self._entries.items()))
+        else:
+            self._submit(_append_line, self.path, json.dumps(record) + "\n")
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="weather-points-cache"
+            )
+        self._writer.submit(fn, *args)
+
+    def flush(self) -> None:
+        """
+        Block until every queued write to the persistence file has finished.
+        """
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """
+        Finish queued writes and stop the writer thread.
+
+        The cache stays usable; the next write starts a new thread.
+        """
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+
+    async def aclose(self) -> None:
+        """
+        ``close`` without blocking the event loop.
+        """
+        await asyncio.to_thread(self.close)
+
+    def _load(self, path: Path) -> None:
+        """
+        Replay the persistence file, keeping the newest unexpired entry per key.
+
+        A tombstone line drops the key's earlier entries. The file is rewritten
+        without stale, superseded or deleted lines afterwards.
+        """
+        if not path.exists():
+            return
+        now = time.time()
+        try:
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        key = record.pop("key")
+                        if record.get("deleted"):
+                            self._entries.pop(key, None)
+                            continue
+                        resolution = PointResolution(**record)
+                    except (ValueError, TypeError, KeyError):
+                        continue
+                    if now - resolution.resolved_at <= self.ttl:
+                        self._store(key, resolution)
+        except OSError as e:
+            logger.warning("Could not load points cache: %s", e)
+            return
+        _rewrite(path, self._entries.items())
+        self._lines = len(self._entries)
+
+
+def _append_line(path: Path, line: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning("Could not persist points resolution: %s", e)
+
+
+def _rewrite(path: Path, entries: Iterable[tuple[str, PointResolution]]) -> None:
+    """
+    Replace the persistence file with one line per live entry.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as f:
+            for key, resolution in entries:
+                f.write(json.dumps({"key": key, **asdict(resolution)}) + "\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not compact points cache: %s", e)
+
+
+_shared_points_cache: PointsCache | None = None
+
+
+def get_shared_points_cache() -> PointsCache:
+    """
+    Return the process-wide ``PointsCache``, creating it on first use.
+
+    Returns:
+        PointsCache: The shared cache.
+    """
+    global _shared_points_cache
+    if _shared_points_cache is None:
+        _shared_points_cache = PointsCache.from_env()
+    return _shared_points_cache
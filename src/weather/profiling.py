@@ -0,0 +1,256 @@
+"""
+Opt-in per-call profiling: phase timings, a slow-call log and sampled cProfile.
+
+Tool functions wrapped with ``profiled`` record how long each named phase
+(validation, points fetch, forecast fetch, JSON decode, formatting, ...) took.
+Code marks a phase with ``with phase("points"):``. Outside a profiled call,
+or with profiling off, that is a context-variable lookup and nothing more.
+
+Calls slower than ``WEATHER_SLOW_CALL_MS`` are logged as one JSON object on
+the ``weather.slow_calls`` logger. A ``WEATHER_PROFILE_SAMPLE_RATE`` fraction
+of calls also run under cProfile, and the stats are written to
+``WEATHER_PROFILE_DIR`` for ``pstats``/snakeviz. cProfile sees everything the
+event loop runs, so a sample is only taken while no other profiled call is in
+flight, and is discarded if another one starts before it finishes. Background
+tasks (refresh, warm-up) can still appear in a sample.
+"""
+
+import cProfile
+import functools
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+slow_call_logger = logging.getLogger("weather.slow_calls")
+
+
+@dataclass
+class CallProfile:
+    """
+    Timing breakdown of one tool call.
+
+    Attributes:
+        tool: Tool name.
+        phases: Seconds spent per phase. Phases may nest (``decode`` runs
+            inside ``forecast``) and repeat (accumulated).
+        duration: Total seconds, set when the call ends.
+    """
+
+    tool: str
+    phases: dict[str, float] = field(default_factory=dict)
+    duration: float = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Add ``seconds`` to a phase.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the profile in milliseconds, as logged.
+        """
+        return {
+            "tool": self.tool,
+            "duration_ms": round(self.duration * 1000, 3),
+            "phases_ms": {k: round(v * 1000, 3) for k, v in self.phases.items()},
+        }
+
+
+_current: ContextVar[CallProfile | None] = ContextVar("call_profile", default=None)
+
+
+@contextmanager
+def _timed(profile: CallProfile, name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Time the enclosed block as phase ``name`` of the current profiled call.
+
+    Args:
+        name: Phase name, e.g. ``"points"`` or ``"format"``.
+
+    Returns:
+        ContextManager[None]: A timer, or a no-op outside a profiled call.
+    """
+    profile = _current.get()
+    if profile is None:
+        return nullcontext()
+    return _timed(profile, name)
+
+
+class Profiler:
+    """
+    Decides which calls are profiled and reports them.
+    """
+
+    def __init__(
+        self,
+        slow_call_seconds: float | None = None,
+        sample_rate: float = 0.0,
+        profile_dir: str | Path | None = None,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            slow_call_seconds: Calls at least this slow are logged with their
+                phase breakdown; None disables the slow-call log.
+            sample_rate: Fraction of calls (0-1) run under cProfile.
+            profile_dir: Directory cProfile stats are written to; sampling is
+                off without one.
+        """
+        self.slow_call_seconds = slow_call_seconds
+        self.sample_rate = sample_rate if profile_dir is not None else 0.0
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.enabled = slow_call_seconds is not None or self.sample_rate > 0
+        self.slow_calls = 0
+        self.sampled = 0
+        self.discarded = 0
+        # Profiled calls currently running on the event loop
+        self._in_flight = 0
+        # The active sample, if any, and whether another call overlapped it
+        self._sampling = False
+        self._overlapped = False
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        """
+        Build a profiler from ``WEATHER_SLOW_CALL_MS`` and
+        ``WEATHER_PROFILE_*`` environment variables.
+        """
+        slow_ms = os.environ.get("WEATHER_SLOW_CALL_MS")
+        rate = os.environ.get("WEATHER_PROFILE_SAMPLE_RATE")
+        return cls(
+            slow_call_seconds=float(slow_ms) / 1000 if slow_ms else None,
+            sample_rate=float(rate) if rate else 0.0,
+            profile_dir=os.environ.get("WEATHER_PROFILE_DIR") or None,
+        )
+
+    def _start_sample(self) -> cProfile.Profile | None:
+        # The caller is already counted in _in_flight
+        if self._in_flight > 1 or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (a debugger, coverage) owns the hook
+            return None
+        self._sampling = True
+        self._overlapped = False
+        return profiler
+
+    def _finish_sample(self, profiler: cProfile.Profile, tool: str) -> None:
+        profiler.disable()
+        self._sampling = False
+        if self._overlapped:
+            # Other calls' work is mixed into the stats; drop them
+            self.discarded += 1
+            logger.debug("Discarded profile of %s: overlapped another call", tool)
+            return
+        if self.profile_dir is None:
+            logger.warning("Could not write profile for %s: no profile_dir", tool)
+            return
+        self.sampled += 1
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S")
+            path = (
+                self.profile_dir / f"{tool}-{stamp}-{os.getpid()}-{self.sampled}.prof"
+            )
+            profiler.dump_stats(path)
+        except OSError as e:
+            logger.warning("Could not write profile for %s: %r", tool, e)
+
+    def report(self, profile: CallProfile) -> None:
+        """
+        Log a finished call if it was slow.
+        """
+        if (
+            self.slow_call_seconds is not None
+            and profile.duration >= self.slow_call_seconds
+        ):
+            self.slow_calls += 1
+            slow_call_logger.warning(
+                json.dumps({"event": "slow_call", **profile.to_dict()})
+            )
+
+    async def call(
+        self, tool: str, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Await ``fn(*args, **kwargs)`` as a profiled call of ``tool``.
+
+        The call is sampled under cProfile only if no other profiled call is
+        in flight when it starts, and the sample is discarded (counted in
+        ``discarded``) if one starts before it ends.
+        """
+        if not self.enabled:
+            return await fn(*args, **kwargs)
+        profile = CallProfile(tool)
+        token = _current.set(profile)
+        self._in_flight += 1
+        if self._sampling:
+            self._overlapped = True
+        sample = self._start_sample()
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            profile.duration = time.perf_counter() - started
+            self._in_flight -= 1
+            if sample is not None:
+                self._finish_sample(sample, tool)
+            _current.reset(token)
+            self.report(profile)
+
+
+def profiled(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorator profiling a tool function with the shared profiler.
+
+    The wrapper keeps the wrapped signature, so FastMCP derives the same tool
+    schema from it. The profiler is looked up per call, so it can be replaced
+    without re-decorating.
+    """
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await get_shared_profiler().call(tool, fn, *args, **kwargs)
+
+    return wrapper
+
+
+_shared_profiler: Profiler | None = None
+
+
+def get_shared_profiler() -> Profiler:
+    """
+    Return the process-wide ``Profiler``, creating it on first use.
+
+    Returns:
+        Profiler: The shared profiler.
+    """
+    global _shared_profiler
+    if _shared_profiler is None:
+        _shared_profiler = Profiler.from_env()
+    return _shared_profiler
@@ -0,0 +1,222 @@
+"""
+Adaptive rate limiting and retry policy for upstream NWS traffic.
+
+A token bucket paces every request. Throttling responses (429/503) halve the
+request rate and pause the bucket for any ``Retry-After`` the upstream asked
+for; successful responses recover the rate gradually. Retries use jittered
+exponential backoff under a per-call time limit and a process-wide retry
+budget, so a struggling upstream sees fewer requests rather than more.
+"""
+
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = frozenset({429, 503})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """
+    Parse a ``Retry-After`` header given as seconds or an HTTP date.
+
+    Args:
+        value: Raw header value.
+        now: Current epoch seconds (defaults to ``time.time()``).
+
+    Returns:
+        float | None: Seconds to wait (never negative), or None if absent or
+        unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to upstream throttling (AIMD).
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: int = 20,
+        min_rate: float = 0.5,
+        increase: float = 0.2,
+        decrease: float = 0.5,
+        max_pause: float = 30.0,
+    ) -> None:
+        """
+        Initialize a full bucket at the maximum rate.
+
+        Args:
+            rate: Maximum (and initial) requests per second.
+            burst: Bucket capacity.
+            min_rate: Floor the rate never drops below.
+            increase: Requests/second added back after each success.
+            decrease: Factor the rate is multiplied by on throttling.
+            max_pause: Upper bound on a ``Retry-After`` pause, in seconds.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.max_pause = max_pause
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.throttled = 0
+        self.waits = 0
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveRateLimiter":
+        """
+        Build a limiter from ``WEATHER_NWS_RATE`` and ``WEATHER_NWS_BURST``.
+        """
+        rate = float(os.environ.get("WEATHER_NWS_RATE") or 20.0)
+        burst = int(os.environ.get("WEATHER_NWS_BURST") or max(1, int(rate)))
+        return cls(rate=rate, burst=burst)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent, then consume one token.
+        """
+        waited = False
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                waited = True
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                if waited:
+                    self.waits += 1
+                return
+            waited = True
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """
+        Slow down after a 429/503, pausing for ``retry_after`` seconds if given.
+        """
+        self.throttled += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after:
+            pause_until = time.monotonic() + min(retry_after, self.max_pause)
+            self._paused_until = max(self._paused_until, pause_until)
+
+    def on_success(self) -> None:
+        """
+        Recover the rate additively after a successful response.
+        """
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return the current rate and throttling counters.
+        """
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "throttled": self.throttled,
+            "waits": self.waits,
+        }
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff with a per-call deadline and a retry budget.
+
+    The budget is a token bucket: every request deposits ``budget_ratio``
+    tokens (up to ``budget_cap``) and every retry spends one, so retries stay a
+    bounded fraction of traffic when the upstream is failing.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 8.0,
+        max_elapsed: float = 15.0,
+        budget_ratio: float = 0.2,
+        budget_cap: float = 20.0,
+    ) -> None:
+        """
+        Initialize the policy with a full retry budget.
+
+        Args:
+            max_attempts: Total attempts per call, including the first.
+            base_delay: Backoff ceiling for the first retry, in seconds.
+            max_delay: Upper bound on a single backoff delay.
+            max_elapsed: Seconds after the first attempt past which no retry
+                is started.
+            budget_ratio: Retry tokens earned per request.
+            budget_cap: Maximum retry tokens that can be banked.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.budget_ratio = budget_ratio
+        self.budget_cap = budget_cap
+        self._budget = budget_cap
+        self.budget_exhausted = 0
+
+    def record_request(self) -> None:
+        """
+        Earn retry budget for a new upstream call.
+        """
+        self._budget = min(self.budget_cap, self._budget + self.budget_ratio)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return a full-jitter exponential backoff delay for a zero-based attempt.
+        """
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def next_delay(
+        self, attempt: int, elapsed: float, retry_after: float | None = None
+    ) -> float | None:
+        """
+        Decide whether to retry and how long to wait first.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            elapsed: Seconds since the first attempt started.
+            retry_after: Server-requested delay, which overrides the backoff.
+
+        Returns:
+            float | None: Seconds to sleep before retrying, or None to give up.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        if delay > self.max_delay or elapsed + delay > self.max_elapsed:
+            return None
+        if self._budget < 1.0:
+            self.budget_exhausted += 1
+            return None
+        self._budget -= 1.0
+        return delay
@@ -0,0 +1,226 @@
+"""
+Refresh-ahead scheduling for popular cached responses.
+
+Every request counts towards its cache key's decaying access score (see
+``http_cache.AccessCounter``). In the background, the scheduler revalidates
+keys that are both hot and about to expire, so popular forecasts and alert
+areas are refreshed before anyone has to wait for them. Keys nobody asks for
+are left alone and age out.
+
+Refreshes go through the shared upstream pool and its rate limiter. Each tick
+uses at most a fixed share of the limiter's current rate, so refreshing backs
+off when NWS throttles. Refresh times are spread out: each key gets its own
+lead time, and ticks are jittered, so entries stored together do not expire
+and refresh in one burst.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+import zlib
+
+from src.weather.http_pool import get_shared_pool
+from src.weather.nws_client import NWSClient
+
+logger = logging.getLogger(__name__)
+
+
+def _spread(key: str) -> float:
+    """
+    Map a key to a stable position in ``[0, 1)``.
+    """
+    return zlib.crc32(key.encode()) / 2**32
+
+
+class RefreshScheduler:
+    """
+    Background task that refreshes hot cache entries shortly before expiry.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        lead: float = 15.0,
+        interval: float = 5.0,
+        min_score: float = 2.0,
+        share: float = 0.25,
+        jitter: float = 0.5,
+    ) -> None:
+        """
+        Initialize the scheduler without starting it.
+
+        Args:
+            enabled: Whether refresh-ahead is on.
+            lead: Seconds before expiry a hot entry is refreshed. Short-lived
+                entries use at most a quarter of their lifetime.
+            interval: Seconds between scheduling passes.
+            min_score: Decayed access score a key needs to be refreshed.
+            share: Fraction of the upstream rate limit refreshes may use.
+            jitter: Fraction of the lead time spread across keys.
+        """
+        self.enabled = enabled
+        self.lead = lead
+        self.interval = interval
+        self.min_score = min_score
+        self.share = share
+        self.jitter = jitter
+        self.refreshes = 0
+        self.failures = 0
+        self.deferred = 0
+        self._task: asyncio.Task | None = None
+        self._holders = 0
+
+    @classmethod
+    def from_env(cls) -> "RefreshScheduler":
+        """
+        Build a scheduler from ``WEATHER_REFRESH_*`` environment variables.
+        """
+        defaults = cls()
+        lead = os.environ.get("WEATHER_REFRESH_LEAD")
+        min_hits = os.environ.get("WEATHER_REFRESH_MIN_HITS")
+        share = os.environ.get("WEATHER_REFRESH_SHARE")
+        return cls(
+            enabled=os.environ.get("WEATHER_REFRESH_AHEAD", "").lower()
+            in ("1", "true", "yes"),
+            lead=float(lead) if lead else defaults.lead,
+            min_score=float(min_hits) if min_hits else defaults.min_score,
+            share=float(share) if share else defaults.share,
+        )
+
+    def lead_for(self, key: str, lifetime: float) -> float:
+        """
+        Return how many seconds before expiry ``key`` is refreshed.
+        """
+        lead = min(self.lead, lifetime / 4)
+        return lead * (1.0 - self.jitter * _spread(key))
+
+    def due(self, client: NWSClient, budget: int, now: float) -> list[str]:
+        """
+        Pick the hottest keys whose entries are within their lead of expiry.
+
+        Args:
+            client: Client whose response cache is inspected.
+            budget: Maximum keys to return.
+            now: Current epoch seconds.
+
+        Returns:
+            list[str]: Cache keys (canonical URLs), hottest first.
+        """
+        cache = client.response_cache
+        keys: list[str] = []
+        for key, _ in cache.access.hottest(self.min_score, now):
+            entry = cache.peek(key)
+            # Entries without a freshness lifetime are revalidated on every
+            # use anyway; refreshing them ahead would gain nothing
+            if entry is None or entry.lifetime <= 0:
+                continue
+            if entry.fresh_until - now > self.lead_for(key, entry.lifetime):
+                continue
+            if len(keys) == budget:
+                self.deferred += 1
+                continue
+            keys.append(key)
+        return keys
+
+    async def _refresh(self, client: NWSClient, key: str) -> None:
+        try:
+            await client.refresh(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            logger.warning("Refresh-ahead of %s failed: %r", key, e)
+        else:
+            self.refreshes += 1
+
+    async def tick(
+        self,
+        client: NWSClient | None = None,
+        rate: float | None = None,
+        now: float | None = None,
+    ) -> int:
+        """
+        Run one scheduling pass.
+
+        Args:
+            client: NWSClient to refresh with (defaults to a new one).
+            rate: Upstream requests per second currently allowed (defaults to
+                the shared rate limiter's adaptive rate).
+            now: Current epoch seconds.
+
+        Returns:
+            int: Keys refreshed (or attempted) in this pass.
+        """
+        if client is None:
+            client = NWSClient()
+        if rate is None:
+            rate = get_shared_pool().limiter.rate
+        now = time.time() if now is None else now
+        budget = max(1, int(rate * self.interval * self.share))
+        keys = self.due(client, budget, now)
+        await asyncio.gather(*(self._refresh(client, key) for key in keys))
+        return len(keys)
+
+    async def run(self) -> None:
+        """
+        Schedule forever, sleeping ``interval`` (with jitter) between passes.
+        """
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Refresh-ahead pass failed: %r", e)
+            await asyncio.sleep(self.interval * random.uniform(0.8, 1.2))
+
+    def start(self) -> None:
+        """
+        Start the background task if refresh-ahead is enabled.
+        """
+        if not self.enabled:
+            return
+        self._holders += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task once the last holder releases it.
+        """
+        if not self.enabled:
+            return
+        self._holders = max(0, self._holders - 1)
+        if self._holders or self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return refresh counters.
+        """
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "deferred": self.deferred,
+        }
+
+
+_shared_refresh_scheduler: RefreshScheduler | None = None
+
+
+def get_shared_refresh_scheduler() -> RefreshScheduler:
+    """
+    Return the process-wide ``RefreshScheduler``, creating it on first use.
+
+    Returns:
+        RefreshScheduler: The shared scheduler.
+    """
+    global _shared_refresh_scheduler
+    if _shared_refresh_scheduler is None:
+        _shared_refresh_scheduler = RefreshScheduler.from_env()
+    return _shared_refresh_scheduler
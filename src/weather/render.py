@@ -0,0 +1,333 @@
+"""
+Rendering of tool results as compact text or JSON.
+
+Templates are built once at import time and carry no indentation. Rendered
+strings are memoized by the identity of the model objects they were built
+from: those objects are created once per upstream payload version and shared
+by every cache, so an unchanged payload renders once and later identical
+requests reuse the same string.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from src.weather.models import Alert, ForecastPeriod
+
+TEXT = "text"
+JSON = "json"
+RESPONSE_FORMATS = (TEXT, JSON)
+
+SEPARATOR = "\n---\n"
+FORECAST_PERIODS = 5
+
+_ALERT_TEXT = (
+    "Headline: {}\nEvent: {}\nArea: {}\nSeverity: {}\nDescription: {}\n"
+    "Instructions: {}"
+).format
+_PERIOD_TEXT = "{}:\nTemperature: {}°{}\nWind: {} {}\nForecast: {}".format
+_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def alert_text(alert: Alert) -> str:
+    """
+    Render one alert as text, substituting placeholders for missing fields.
+    """
+    return _ALERT_TEXT(
+        alert.headline or "No headline available",
+        alert.event or "Unknown",
+        alert.area_desc or "Unknown",
+        alert.severity or "Unknown",
+        alert.description or "No description available",
+        alert.instruction or "No specific instructions provided",
+    )
+
+
+def period_text(period: ForecastPeriod) -> str:
+    """
+    Render one forecast period as text.
+    """
+    return _PERIOD_TEXT(
+        period.name,
+        period.temperature,
+        period.temperature_unit,
+        period.wind_speed,
+        period.wind_direction,
+        period.detailed_forecast,
+    )
+
+
+def alert_fields(alert: Alert) -> dict[str, Any]:
+    """
+    Return the JSON fields of an alert, omitting missing ones.
+    """
+    fields = {
+        "headline": alert.headline,
+        "event": alert.event,
+        "severity": alert.severity,
+        "area": alert.area_desc,
+        "description": alert.description,
+        "instruction": alert.instruction,
+    }
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def period_fields(period: ForecastPeriod) -> dict[str, Any]:
+    """
+    Return the JSON fields of a forecast period.
+    """
+    return {
+        "name": period.name,
+        "temperature": period.temperature,
+        "unit": period.temperature_unit,
+        "wind": f"{period.wind_speed} {period.wind_direction}",
+        "forecast": period.detailed_forecast,
+    }
+
+
+def _alerts_text(alerts: Sequence[Alert]) -> str:
+    return SEPARATOR.join(map(alert_text, alerts))
+
+
+def _alerts_json(alerts: Sequence[Alert]) -> str:
+    return _json({"alerts": [alert_fields(alert) for alert in alerts]})
+
+
+def _forecast_text(periods: Sequence[ForecastPeriod]) -> str:
+    return SEPARATOR.join(map(period_text, periods))
+
+
+def _forecast_json(periods: Sequence[ForecastPeriod]) -> str:
+    return _json({"periods": [period_fields(period) for period in periods]})
+
+
+_RENDERERS: dict[tuple[str, str], Callable[[Sequence[Any]], str]] = {
+    ("alerts", TEXT): _alerts_text,
+    ("alerts", JSON): _alerts_json,
+    ("forecast", TEXT): _forecast_text,
+    ("forecast", JSON): _forecast_json,
+}
+
+
+class RenderCache:
+    """
+    LRU of rendered strings keyed by the identity of their source objects.
+
+    Each entry keeps references to its source objects, so their ids cannot be
+    reused by other objects while the entry exists.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum rendered strings kept before the least
+                recently used is evicted.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[Any, ...], tuple[tuple[Any, ...], str]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "RenderCache":
+        """
+        Build a cache sized by ``WEATHER_RENDER_CACHE_ENTRIES``.
+        """
+        value = os.environ.get("WEATHER_RENDER_CACHE_ENTRIES")
+        return cls(max_entries=int(value) if value else 256)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, kind: str, response_format: str, items: Sequence[Any]) -> str:
+        """
+        Return the rendering of ``items``, reusing a memoized string if possible.
+
+        Args:
+            kind: ``"alerts"`` or ``"forecast"``.
+            response_format: ``TEXT`` or ``JSON``.
+            items: Model objects to render.
+
+        Returns:
+            str: The rendered result.
+        """
+        key = (kind, response_format, *map(id, items))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        text = _RENDERERS[kind, response_format](items)
+        if self.max_entries > 0:
+            self._entries[key] = (tuple(items), text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return entry count, hits and misses.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_shared_render_cache: RenderCache | None = None
+
+
+def get_shared_render_cache() -> RenderCache:
+    """
+    Return the process-wide ``RenderCache``, creating it on first use.
+
+    Returns:
+        RenderCache: The shared cache.
+    """
+    global _shared_render_cache
+    if _shared_render_cache is None:
+        _shared_render_cache = RenderCache.from_env()
+    return _shared_render_cache
+
+
+def render_alerts(alerts: Sequence[Alert], response_format: str = TEXT) -> str:
+    """
+    Render alerts as text blocks separated by ``---`` or as compact JSON.
+    """
+    return get_shared_render_cache().render("alerts", response_format, alerts)
+
+
+def render_alerts_by_state(
+    alerts_by_state: Mapping[str, Sequence[Alert]], response_format: str = TEXT
+) -> str:
+    """
+    Render alerts grouped by state.
+
+    Text output has one ``Alerts for XX:`` section per state, separated by
+    ``===``. JSON output is ``{"states":{"XX":{"alerts":[...]},...}}``. Each
+    state's alerts are rendered (and memoized) as by ``render_alerts``.
+    """
+    if response_format == JSON:
+        parts = [
+            f"{_json(state)}:{render_alerts(alerts, JSON)}"
+            for state, alerts in alerts_by_state.items()
+        ]
+        return '{"states":{' + ",".join(parts) + "}}"
+    return "\n===\n".join(
+        f"Alerts for {state}:\n"
+        + (render_alerts(alerts) if alerts else f"No active alerts for state: {state}")
+        for state, alerts in alerts_by_state.items()
+    )
+
+
+def render_forecast(
+    periods: Sequence[ForecastPeriod], response_format: str = TEXT
+) -> str:
+    """
+    Render the next ``FORECAST_PERIODS`` periods as text or compact JSON.
+    """
+    return get_shared_render_cache().render(
+        "forecast", response_format, periods[:FORECAST_PERIODS]
+    )
+
+
+def _stat(value: float | None, unit: str = "") -> str:
+    return "n/a" if value is None else f"{value:g}{unit}"
+
+
+def render_hourly(summary: Mapping[str, Any], response_format: str = TEXT) -> str:
+    """
+    Render an hourly forecast summary (see ``hourly.summarize``).
+
+    Text output has one line per day and one per threshold crossing. JSON
+    output is the summary itself.
+    """
+    if response_format == JSON:
+        return _json(summary)
+    degrees = "°" + summary["units"]["temperature"]
+    speed = " " + summary["units"]["wind"]
+    lines = [f"Hourly forecast: {summary['hours']} hours from {summary['start']}"]
+    for day in summary["days"]:
+        temperature, wind = day["temperature"], day["wind"]
+        lines.append(
+            f"{day['date']}: {_stat(temperature['min'])} to "
+            f"{_stat(temperature['max'], degrees)} (mean "
+            f"{_stat(temperature['mean'], degrees)}), wind up to "
+            f"{_stat(wind['max'], speed)}, precipitation up to "
+            f"{_stat(day['precipitation_max'], '%')}"
+        )
+    units = {"temperature": degrees, "wind": speed, "precipitation": "%"}
+    if summary["crossings"]:
+        lines.append("Threshold crossings:")
+        lines += [
+            f"{crossing['time']}: {crossing['measure']} "
+            f"{'rises to' if crossing['direction'] == 'above' else 'drops below'} "
+            f"{crossing['threshold']:g}{units[crossing['measure']]}"
+            for crossing in summary["crossings"]
+        ]
+    else:
+        lines.append("No threshold crossings.")
+    return "\n".join(lines)
+
+
+def render_layer_extremes(
+    extremes: Mapping[str, Any], response_format: str = TEXT
+) -> str:
+    """
+    Render a gridpoint layer summary (see ``gridpoints.layer_extremes``).
+    """
+    if response_format == JSON:
+        return _json(extremes)
+    layer, hours = extremes["layer"], extremes["hours"]
+    if extremes["max"] is None:
+        return f"No {layer} data for the next {hours} hours."
+    unit = extremes["unit"]
+    space = "" if unit in ("%", "°C", "°F", "°") else " "
+    text = (
+        f"{layer} over the next {hours} hours: max "
+        f"{extremes['max']:g}{space}{unit} at {extremes['max_time']}, min "
+        f"{extremes['min']:g}{space}{unit}, mean {extremes['mean']:g}{space}{unit}"
+    )
+    if "total" in extremes:
+        text += f", total {extremes['total']:g}{space}{unit}"
+    return text
+
+
+def render_message(message: str, response_format: str = TEXT, **fields: Any) -> str:
+    """
+    Render a status or error message in the requested format.
+
+    Args:
+        message: Human-readable message.
+        response_format: ``TEXT`` returns the message as-is; ``JSON`` wraps it.
+        **fields: Extra JSON fields (e.g. ``error=True``).
+
+    Returns:
+        str: The rendered message.
+    """
+    if response_format == JSON:
+        return _json({"message": message, **fields})
+    return message
+
+
+def add_json_fields(rendered: str, **fields: Any) -> str:
+    """
+    Prepend fields to a rendered JSON object without re-encoding it.
+
+    Args:
+        rendered: A compact JSON object as produced by this module.
+        **fields: Fields to add; they must not already be present.
+
+    Returns:
+        str: The JSON object with the extra fields first.
+    """
+    if not fields:
+        return rendered
+    extra = _json(fields)[1:-1]
+    if rendered == "{}":
+        return "{" + extra + "}"
+    return "{" + extra + "," + rendered[1:]
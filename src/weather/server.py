@@ -1,8 +1,168 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 import httpx
 from mcp.server.fastmcp import FastMCP
-from starlette.responses import JSONResponse
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from src.weather.alerts_index import get_shared_alerts_snapshot
+from src.weather.circuit_breaker import (
+    OPEN,
+    CircuitOpenError,
+    Staleness,
+    get_shared_breakers,
+    track_staleness,
+)
+from src.weather.grid_index import get_shared_grid_index
+from src.weather.health import (
+    ReadinessConfig,
+    get_shared_loop_monitor,
+    readiness,
+)
+from src.weather.gridpoints import (
+    HOUR,
+    Gridpoint,
+    get_shared_gridpoint_cache,
+    layer_extremes,
+)
+from src.weather.hourly import summarize
+from src.weather.http_cache import get_shared_response_cache
+from src.weather.http_pool import NWS_API_BASE, get_shared_pool
+from src.weather.metrics import (
+    CONTENT_TYPE,
+    Family,
+    gauge_family,
+    get_shared_metrics,
+    instrumented,
+)
+from src.weather.models import Alert, ForecastPeriod
 from src.weather.nws_client import NWSClient
+from src.weather.points_cache import get_shared_points_cache, normalize_coordinates
+from src.weather.profiling import phase, profiled
+from src.weather.refresh import get_shared_refresh_scheduler
+from src.weather.render import (
+    JSON,
+    RESPONSE_FORMATS,
+    TEXT,
+    add_json_fields,
+    alert_text,
+    get_shared_render_cache,
+    render_alerts,
+    render_alerts_by_state,
+    render_forecast,
+    render_hourly,
+    render_layer_extremes,
+    render_message,
+)
+from src.weather.singleflight import get_shared_singleflight
+from src.weather.states import US_STATES, is_valid_state  # noqa: F401 - re-export
+from src.weather.warmup import get_shared_warmup
+
+
+# Open process_lifespan blocks; resources run while there is at least one
+_resource_holders = 0
+
+
+async def _start_resources() -> None:
+    await get_shared_pool().start()
+    get_shared_alerts_snapshot().start()
+    get_shared_loop_monitor().start()
+    get_shared_warmup().start()
+    get_shared_refresh_scheduler().start()
+
+
+async def _stop_resources() -> None:
+    await get_shared_refresh_scheduler().stop()
+    await get_shared_warmup().stop()
+    await get_shared_loop_monitor().stop()
+    await get_shared_alerts_snapshot().stop()
+    await get_shared_pool().aclose()
+    await get_shared_response_cache().aclose()
+    await get_shared_points_cache().aclose()
+
+
+@asynccontextmanager
+async def process_lifespan() -> AsyncIterator[None]:
+    """
+    Hold the process-wide resources while the block runs.
+
+    The shared upstream pool is opened (and pre-warmed), the nationwide
+    alerts snapshot, when enabled, is refreshed in the background, and the
+    event-loop lag reported by readiness checks is sampled. The configured
+    hot set is prefetched in the background, and refresh-ahead, when
+    enabled, keeps popular cache entries from expiring. On the way out,
+    queued disk cache writes are finished and its connection is closed.
+
+    Blocks may overlap: resources are started when the first one opens and
+    stopped when the last one closes. HTTP apps hold one for the whole ASGI
+    lifespan (see ``WeatherMCP``), so sessions, which with stateless HTTP
+    means every request, do not reopen the pool.
+    """
+    global _resource_holders
+    _resource_holders += 1
+    if _resource_holders == 1:
+        try:
+            await _start_resources()
+        except BaseException:
+            _resource_holders -= 1
+            raise
+    try:
+        yield
+    finally:
+        _resource_holders -= 1
+        if _resource_holders == 0:
+            await _stop_resources()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Per-session lifespan: hold the process-wide resources for the session.
+
+    With stdio the only session lasts as long as the process, so this is
+    where the resources are opened and closed. Under an HTTP app the app's
+    own lifespan already holds them, and a session only joins it.
+    """
+    async with process_lifespan():
+        yield
+
+
+def _hold_resources(app: Starlette) -> Starlette:
+    """
+    Wrap an ASGI app's lifespan so it holds ``process_lifespan`` too.
+    """
+    inner = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with process_lifespan(), inner(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+class WeatherMCP(FastMCP):
+    """
+    FastMCP whose HTTP apps hold the process-wide resources for the app's
+    whole lifespan rather than per session.
+    """
+
+    def streamable_http_app(self) -> Starlette:
+        """
+        Return the streamable-HTTP app, holding ``process_lifespan``.
+        """
+        return _hold_resources(super().streamable_http_app())
+
+    def sse_app(self, mount_path: str | None = None) -> Starlette:
+        """
+        Return the SSE app, holding ``process_lifespan``.
+        """
+        return _hold_resources(super().sse_app(mount_path))
 
 
 class WeatherServer:
@@ -14,61 +174,94 @@ class WeatherServer:
         """
         Initialize the WeatherServer with a FastMCP instance named 'weather'.
         """
-        self.mcp: FastMCP = FastMCP("weather")
+        self.mcp: FastMCP = WeatherMCP("weather", lifespan=server_lifespan)
 
 
 # Initialize FastMCP server
-mcp = FastMCP("weather")
+mcp = WeatherMCP("weather", lifespan=server_lifespan)
 
-# Constants
-NWS_API_BASE = "https://api.weather.gov"
-USER_AGENT = "weather-app/1.0"
+logger = logging.getLogger(__name__)
 
 
 async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
-    headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
-    async with httpx.AsyncClient() as client:
+    """Make a request to the NWS API through the shared pool with error handling."""
+    try:
+        response = await get_shared_pool().get(url)
+        response.raise_for_status()
         try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            try:
-                return response.json()
-            except ValueError:
-                # JSON decoding error
-                # Optionally log error here
-                return None
-        except httpx.HTTPStatusError:
-            # Non-200 HTTP response
-            # Optionally log error here
-            return None
-        except httpx.RequestError:
-            # Network error
-            # Optionally log error here
-            return None
-        except Exception:
-            # Catch-all for unexpected errors
-            # Optionally log error here
+            return response.json()
+        except ValueError:
+            # JSON decoding error
+            logger.warning("Invalid JSON from NWS for %s", url)
             return None
+    except httpx.HTTPStatusError as e:
+        # Non-200 HTTP response
+        logger.warning("NWS returned an error status for %s: %s", url, e)
+        return None
+    except httpx.RequestError as e:
+        # Network error
+        logger.warning("NWS request failed for %s: %r", url, e)
+        return None
+    except Exception:
+        # Catch-all for unexpected errors
+        logger.exception("Unexpected error requesting %s", url)
+        return None
 
 
 async def get_alerts_data(
-    state: str, client: NWSClient | None = None
-) -> list[dict[str, Any]] | None:
+    state: str | list[str], client: NWSClient | None = None
+) -> list[Alert] | dict[str, list[Alert]] | None:
     """
-    Fetch weather alerts for a given US state from the NWS API using NWSClient.
+    Fetch weather alerts for one or more US states from the NWS API using NWSClient.
 
     Args:
-        state: Two-letter US state code (e.g. 'CA', 'NY').
+        state: Two-letter US state code (e.g. 'CA', 'NY'), or a list of them.
         client: Optional NWSClient instance (for mocking/testing).
 
     Returns:
-        A list of alert dictionaries with keys: 'headline', 'event', 'severity'.
-        Returns None if the response is missing or malformed.
+        For one state, a list of Alert objects (headline, event, severity,
+        area, ...). For a list of states, a dict mapping each (distinct)
+        requested state, in request order, to its alerts. Returns None if the
+        response is missing or malformed.
+
+    When the nationwide alerts snapshot is enabled and current, alerts are
+    answered from its in-memory index without an upstream call. Otherwise a
+    list of states is fetched with a single combined ``area=`` request and
+    each alert is assigned to the states of its UGC zones.
+    """
+    if isinstance(state, list):
+        states = list(dict.fromkeys(state))
+        index = get_shared_alerts_snapshot().current()
+        if index is not None:
+            return {code: index.for_state(code) for code in states}
+        alerts = await fetch_area_alerts(",".join(sorted(states)), client)
+        if alerts is None:
+            return None
+        by_state: dict[str, list[Alert]] = {code: [] for code in states}
+        for alert in alerts:
+            for code in alert.states:
+                if code in by_state:
+                    by_state[code].append(alert)
+        return by_state
+    index = get_shared_alerts_snapshot().current()
+    if index is not None:
+        return index.for_state(state)
+    return await fetch_area_alerts(state, client)
+
+
+async def fetch_area_alerts(
+    area: str, client: NWSClient | None = None
+) -> list[Alert] | None:
+    """
+    Fetch active alerts for an ``area=`` value (one or comma-separated codes).
+
+    Returns:
+        list[Alert] | None: The alerts, or None if the response is missing or
+        malformed.
     """
     if client is None:
         client = NWSClient()
-    url = f"{NWS_API_BASE}/alerts/active?area={state}"
+    url = f"{NWS_API_BASE}/alerts/active?area={area}"
     try:
         data = await client._make_request(url)
         if not data:
@@ -77,130 +270,176 @@ async def get_alerts_data(
             return None
         if not isinstance(data["features"], list):
             return None
-        alerts: list[dict[str, Any]] = []
-        for feature in data["features"]:
-            props = feature.get("properties", {})
-            alerts.append(
-                {
-                    "headline": props.get("headline"),
-                    "event": props.get("event"),
-                    "severity": props.get("severity"),
-                    "areaDesc": props.get("areaDesc"),
-                    "description": props.get("description"),
-                    "instruction": props.get("instruction"),
-                }
-            )
-        return alerts
-    except (httpx.HTTPStatusError, ValueError):
+        return [Alert.coerce(feature) for feature in data["features"]]
+    except (httpx.HTTPStatusError, httpx.RequestError, ValueError):
         return None
 
 
-def format_alert(feature: dict) -> str:
-    """Format an alert feature into a readable string, including the headline."""
-    props = feature["properties"]
-    return f"""
-        Headline: {props.get('headline', 'No headline available')}
-        Event: {props.get('event', 'Unknown')}
-        Area: {props.get('areaDesc', 'Unknown')}
-        Severity: {props.get('severity', 'Unknown')}
-        Description: {props.get('description', 'No description available')}
-        Instructions: {props.get('instruction', 'No specific instructions provided')}
-    """
-
-
-US_STATES = {
-    "AL",
-    "AK",
-    "AZ",
-    "AR",
-    "CA",
-    "CO",
-    "CT",
-    "DE",
-    "FL",
-    "GA",
-    "HI",
-    "ID",
-    "IL",
-    "IN",
-    "IA",
-    "KS",
-    "KY",
-    "LA",
-    "ME",
-    "MD",
-    "MA",
-    "MI",
-    "MN",
-    "MS",
-    "MO",
-    "MT",
-    "NE",
-    "NV",
-    "NH",
-    "NJ",
-    "NM",
-    "NY",
-    "NC",
-    "ND",
-    "OH",
-    "OK",
-    "OR",
-    "PA",
-    "RI",
-    "SC",
-    "SD",
-    "TN",
-    "TX",
-    "UT",
-    "VT",
-    "VA",
-    "WA",
-    "WV",
-    "WI",
-    "WY",
-}
+def with_stale_notice(
+    text: str, staleness: Staleness, response_format: str = TEXT
+) -> str:
+    """
+    Append a note to tool output built from stale fallback data, if any was used.
+
+    JSON output gets a ``stale_age_seconds`` field instead of a note.
+    """
+    if staleness.age is None:
+        return text
+    if response_format == JSON:
+        return add_json_fields(text, stale_age_seconds=int(staleness.age))
+    if staleness.age < 120:
+        age = f"{int(staleness.age)} seconds"
+    else:
+        age = f"{int(staleness.age // 60)} minutes"
+    return (
+        f"{text}\n\nNote: the weather service is currently unavailable; "
+        f"showing cached data from {age} ago."
+    )
+
+
+def format_alert(alert: Alert | dict) -> str:
+    """Format an alert (or raw alert feature) as readable text with its headline."""
+    return alert_text(Alert.coerce(alert))
+
+
+def invalid_format_message() -> str:
+    """Return the error message for an unsupported ``response_format``."""
+    return "Invalid response_format. Use 'text' or 'json'."
 
 
 @mcp.tool()
-async def get_alerts(state: str) -> str:
+@instrumented
+@profiled
+async def get_alerts(state: str | list[str], response_format: str = TEXT) -> str:
     """
-    FastMCP tool: Return formatted weather alerts for a US state using NWSClient.
+    FastMCP tool: Return formatted weather alerts for one or more US states
+    using NWSClient.
 
     Args:
-        state: Two-letter US state code (e.g. 'CA', 'NY').
+        state: Two-letter US state code (e.g. 'CA', 'NY'), or a list of codes
+            (e.g. ['TX', 'LA', 'MS', 'AL', 'FL']) fetched with one upstream
+            request.
+        response_format: 'text' (default) for readable text, or 'json' for a
+            compact JSON object with an 'alerts' list (per state under
+            'states' when a list was given).
 
     Returns:
         A formatted string of alerts or an error message.
     """
     # Input validation
-    if (
-        not isinstance(state, str)
-        or len(state) != 2
-        or not state.isalpha()
-        or not state.isupper()
-        or state not in US_STATES
-    ):
-        return (
+    with phase("validation"):
+        valid_format = response_format in RESPONSE_FORMATS
+        if isinstance(state, list):
+            valid_state = bool(state) and all(map(is_valid_state, state))
+        else:
+            valid_state = is_valid_state(state)
+    if not valid_format:
+        return invalid_format_message()
+    if not valid_state:
+        return render_message(
             "Invalid state code. Please provide a two-letter uppercase "
-            "state abbreviation."
+            "state abbreviation (or a non-empty list of them).",
+            response_format,
+            error=True,
         )
     client = NWSClient()
-    alerts_data = await get_alerts_data(state, client=client)
+    with track_staleness() as staleness, phase("alerts"):
+        alerts_data = await get_alerts_data(state, client=client)
     if alerts_data is None:
         # Distinguish between malformed and empty
         # If the API response is missing or malformed
-        return "Malformed response from weather service."
-    if not alerts_data:
-        return f"No active alerts for state: {state}"
-    # Format each alert using the format_alert function
-    formatted = [format_alert({"properties": alert}) for alert in alerts_data]
-    return "\n---\n".join(formatted)
+        return render_message(
+            "Malformed response from weather service.", response_format, error=True
+        )
+    if isinstance(alerts_data, dict):
+        with phase("format"):
+            rendered = render_alerts_by_state(alerts_data, response_format)
+            return with_stale_notice(rendered, staleness, response_format)
+    if not alerts_data and response_format == TEXT:
+        return with_stale_notice(f"No active alerts for state: {state}", staleness)
+    with phase("format"):
+        rendered = render_alerts(alerts_data, response_format)
+        return with_stale_notice(rendered, staleness, response_format)
+
+
+async def get_point_alerts_data(
+    latitude: float, longitude: float, client: NWSClient | None = None
+) -> list[Alert] | None:
+    """
+    Return the active alerts covering a point from the local alerts index.
+
+    Alert polygons are matched in-process against the snapshot index. The
+    first query made without snapshot mode fetches the nationwide alerts and
+    starts the background refresher (see ``AlertsSnapshot.lookup_index``).
+    Alerts without a polygon match by the point's forecast zone when its
+    ``/points`` resolution is already cached; no ``/points`` request is made
+    for them.
+
+    Args:
+        latitude: Latitude of the point (-90 to 90).
+        longitude: Longitude of the point (-180 to 180).
+        client: Optional NWSClient instance (for mocking/testing).
+
+    Returns:
+        The covering alerts, or None if the nationwide alerts could not be
+        fetched or were malformed.
+    """
+    if client is None:
+        client = NWSClient()
+    try:
+        index = await get_shared_alerts_snapshot().lookup_index(client)
+    except (httpx.HTTPStatusError, httpx.RequestError, ValueError):
+        return None
+    zones: tuple[str, ...] = ()
+    resolution = client.points_cache.peek(latitude, longitude)
+    if resolution is not None and resolution.forecast_zone:
+        zones = (resolution.forecast_zone.rstrip("/").rsplit("/", 1)[-1],)
+    return index.for_point(latitude, longitude, zones)
+
+
+@mcp.tool()
+@instrumented
+@profiled
+async def get_alerts_for_point(
+    latitude: float, longitude: float, response_format: str = TEXT
+) -> str:
+    """
+    FastMCP tool: Return the active weather alerts whose areas cover a location.
+
+    Args:
+        latitude: Latitude of the location (-90 to 90).
+        longitude: Longitude of the location (-180 to 180).
+        response_format: 'text' (default) for readable text, or 'json' for a
+            compact JSON object with an 'alerts' list.
+
+    Returns:
+        A formatted string of alerts or an error message.
+    """
+    with phase("validation"):
+        valid_format = response_format in RESPONSE_FORMATS
+        coordinates = validate_coordinates(latitude, longitude)
+    if not valid_format:
+        return invalid_format_message()
+    if isinstance(coordinates, str):
+        return render_message(coordinates, response_format, error=True)
+    lat, lon = coordinates
+    client = NWSClient()
+    with track_staleness() as staleness, phase("alerts"):
+        alerts = await get_point_alerts_data(lat, lon, client=client)
+    if alerts is None:
+        return render_message(
+            "Malformed response from weather service.", response_format, error=True
+        )
+    if not alerts and response_format == TEXT:
+        return with_stale_notice("No active alerts at this location.", staleness)
+    with phase("format"):
+        rendered = render_alerts(alerts, response_format)
+        return with_stale_notice(rendered, staleness, response_format)
 
 
 async def get_forecast_data(
     latitude: float, longitude: float, client: NWSClient | None = None
-) -> list[dict[str, Any]]:
+) -> list[ForecastPeriod]:
     """
     Fetch forecast periods for given coordinates from the NWS API using NWSClient.
 
@@ -210,47 +449,128 @@ async def get_forecast_data(
         client: Optional NWSClient instance (for mocking/testing).
 
     Returns:
-        A list of forecast period dictionaries.
+        A list of ForecastPeriod objects.
+    Raises:
+        ValueError: If the response is malformed or missing required keys.
+    """
+    return await fetch_forecast_periods(latitude, longitude, client)
+
+
+async def get_hourly_forecast_data(
+    latitude: float, longitude: float, client: NWSClient | None = None
+) -> list[ForecastPeriod]:
+    """
+    Fetch hourly forecast periods for given coordinates using NWSClient.
+
+    Args:
+        latitude: Latitude of the location (-90 to 90).
+        longitude: Longitude of the location (-180 to 180).
+        client: Optional NWSClient instance (for mocking/testing).
+
+    Returns:
+        A list of one-hour ForecastPeriod objects.
+    Raises:
+        ValueError: If the point has no hourly forecast or the response is
+            malformed.
+    """
+    return await fetch_forecast_periods(latitude, longitude, client, hourly=True)
+
+
+async def fetch_forecast_periods(
+    latitude: float,
+    longitude: float,
+    client: NWSClient | None = None,
+    hourly: bool = False,
+) -> list[ForecastPeriod]:
+    """
+    Resolve a point and fetch its 12-hour (or hourly) forecast periods.
+
     Raises:
         ValueError: If the response is malformed or missing required keys.
     """
     if client is None:
         client = NWSClient()
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await client._make_request(points_url)
-    if (
-        not points_data
-        or "properties" not in points_data
-        or "forecast" not in points_data["properties"]
-    ):
-        raise ValueError("Malformed response: missing 'properties' or 'forecast'.")
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await client._make_request(forecast_url)
+    with phase("points"):
+        resolution = await client.resolve_point(latitude, longitude)
+    url = resolution.forecast_hourly if hourly else resolution.forecast
+    if not url:
+        key = "forecastHourly" if hourly else "forecast"
+        raise ValueError(f"Malformed response: missing '{key}'.")
+    try:
+        with phase("forecast"):
+            forecast_data = await client._make_request(url)
+    except httpx.HTTPStatusError:
+        # The office grid may have moved; re-resolve on the next call
+        client.points_cache.invalidate(latitude, longitude)
+        client.grid_index.discard(resolution.forecast)
+        raise
     if (
         not forecast_data
         or "properties" not in forecast_data
         or "periods" not in forecast_data["properties"]
     ):
         raise ValueError("Malformed response: missing 'properties' or 'periods'.")
+    # The forecast's geometry is its grid cell; nearby points can now resolve
+    # to it without a /points call
+    client.grid_index.add(resolution, forecast_data.get("geometry"))
     periods = forecast_data["properties"]["periods"]
     if not isinstance(periods, list):
         raise ValueError("Malformed response: 'periods' is not a list.")
-    return periods
+    # Periods are normally typed when the response is parsed; this only
+    # converts payloads that bypassed that step.
+    return [ForecastPeriod.coerce(period) for period in periods]
 
 
-@mcp.tool()
-async def get_forecast(latitude: float, longitude: float) -> str:
+async def get_gridpoint_data(
+    latitude: float, longitude: float, client: NWSClient | None = None
+) -> Gridpoint:
     """
-    FastMCP tool: Return formatted weather forecast for a location using NWSClient.
+    Fetch and decode the raw gridpoint forecast data for given coordinates.
 
     Args:
         latitude: Latitude of the location (-90 to 90).
         longitude: Longitude of the location (-180 to 180).
+        client: Optional NWSClient instance (for mocking/testing).
 
     Returns:
-        A formatted string of the weather forecast or an error message.
+        Gridpoint: The decoded time-series layers.
+    Raises:
+        ValueError: If the point has no gridpoint or the response is malformed.
+    """
+    if client is None:
+        client = NWSClient()
+    with phase("points"):
+        resolution = await client.resolve_point(latitude, longitude)
+    url = resolution.forecast_grid_data
+    if not url and resolution.grid_id is not None:
+        url = (
+            f"{NWS_API_BASE}/gridpoints/{resolution.grid_id}/"
+            f"{resolution.grid_x},{resolution.grid_y}"
+        )
+    if not url:
+        raise ValueError("Malformed response: missing 'forecastGridData'.")
+    try:
+        with phase("gridpoint"):
+            payload, gridpoint = await client.get_gridpoint(url)
+    except httpx.HTTPStatusError:
+        client.points_cache.invalidate(latitude, longitude)
+        client.grid_index.discard(resolution.forecast)
+        raise
+    client.grid_index.add(resolution, payload.get("geometry"))
+    return gridpoint
+
+
+def validate_coordinates(latitude: Any, longitude: Any) -> tuple[float, float] | str:
+    """
+    Validate and convert tool coordinate arguments.
+
+    Args:
+        latitude: Latitude argument as received by the tool.
+        longitude: Longitude argument as received by the tool.
+
+    Returns:
+        ``(latitude, longitude)`` as floats, or an error message string.
     """
-    # Input validation
     try:
         lat = float(latitude)
         lon = float(longitude)
@@ -261,33 +581,458 @@ async def get_forecast(latitude: float, longitude: float) -> str:
             "Invalid coordinates. Latitude must be between -90 and 90, "
             "longitude between -180 and 180."
         )
-    client = NWSClient()
+    return lat, lon
+
+
+def format_forecast(periods: list[ForecastPeriod]) -> str:
+    """Format the next five forecast periods into a readable string."""
+    return render_forecast(periods)
+
+
+async def forecast_for(
+    lat: float, lon: float, client: NWSClient, response_format: str = TEXT
+) -> str:
+    """
+    Return the formatted forecast for validated coordinates or an error message.
+    """
     try:
         periods = await get_forecast_data(lat, lon, client=client)
+    except CircuitOpenError:
+        message = (
+            "Weather service is temporarily unavailable. Please try again shortly."
+        )
+        return render_message(message, response_format, error=True)
     except (httpx.HTTPStatusError, ValueError):
-        return "Malformed response from weather service."
+        message = "Malformed response from weather service."
+        return render_message(message, response_format, error=True)
     except Exception:
-        return "Malformed response from weather service."
+        message = "Malformed response from weather service."
+        return render_message(message, response_format, error=True)
     if not periods:
-        return "Unable to fetch forecast data for this location."
-    forecasts: list[str] = []
-    for period in periods[:5]:  # Only show next 5 periods
-        forecast = f"""
-            {period['name']}:
-            Temperature: {period['temperature']}°{period['temperatureUnit']}
-            Wind: {period['windSpeed']} {period['windDirection']}
-            Forecast: {period['detailedForecast']}
-        """
-        forecasts.append(forecast)
-    return "\n---\n".join(forecasts)
+        message = "Unable to fetch forecast data for this location."
+        return render_message(message, response_format, error=True)
+    with phase("format"):
+        return render_forecast(periods, response_format)
+
+
+@mcp.tool()
+@instrumented
+@profiled
+async def get_forecast(
+    latitude: float, longitude: float, response_format: str = TEXT
+) -> str:
+    """
+    FastMCP tool: Return formatted weather forecast for a location using NWSClient.
+
+    Args:
+        latitude: Latitude of the location (-90 to 90).
+        longitude: Longitude of the location (-180 to 180).
+        response_format: 'text' (default) for readable text, or 'json' for a
+            compact JSON object with a 'periods' list.
+
+    Returns:
+        A formatted string of the weather forecast or an error message.
+    """
+    # Input validation
+    with phase("validation"):
+        valid_format = response_format in RESPONSE_FORMATS
+        coordinates = validate_coordinates(latitude, longitude)
+    if not valid_format:
+        return invalid_format_message()
+    if isinstance(coordinates, str):
+        return render_message(coordinates, response_format, error=True)
+    lat, lon = coordinates
+    client = NWSClient()
+    with track_staleness() as staleness:
+        forecast = await forecast_for(lat, lon, client, response_format)
+    return with_stale_notice(forecast, staleness, response_format)
+
+
+@mcp.tool()
+@instrumented
+@profiled
+async def get_hourly_forecast(
+    latitude: float,
+    longitude: float,
+    response_format: str = TEXT,
+    temperature_threshold: float | None = None,
+    wind_threshold: float | None = None,
+    precipitation_threshold: float | None = None,
+) -> str:
+    """
+    FastMCP tool: Return a daily summary of the hourly forecast for a location.
+
+    Args:
+        latitude: Latitude of the location (-90 to 90).
+        longitude: Longitude of the location (-180 to 180).
+        response_format: 'text' (default) for readable text, or 'json' for a
+            compact JSON object with 'days' and 'crossings' lists.
+        temperature_threshold: Temperature whose crossings are reported
+            (default freezing, in the forecast's unit).
+        wind_threshold: Wind speed whose crossings are reported (default
+            25 mph).
+        precipitation_threshold: Precipitation probability (%) whose
+            crossings are reported (default 50).
+
+    Returns:
+        Daily temperature, wind and precipitation ranges plus threshold
+        crossings, or an error message.
+    """
+    with phase("validation"):
+        valid_format = response_format in RESPONSE_FORMATS
+        coordinates = validate_coordinates(latitude, longitude)
+        try:
+            thresholds = [
+                None if value is None else float(value)
+                for value in (
+                    temperature_threshold,
+                    wind_threshold,
+                    precipitation_threshold,
+                )
+            ]
+        except (TypeError, ValueError):
+            thresholds = None
+    if not valid_format:
+        return invalid_format_message()
+    if isinstance(coordinates, str):
+        return render_message(coordinates, response_format, error=True)
+    if thresholds is None:
+        return render_message(
+            "Invalid threshold. Thresholds must be numbers.",
+            response_format,
+            error=True,
+        )
+    lat, lon = coordinates
+    client = NWSClient()
+    with track_staleness() as staleness:
+        try:
+            periods = await get_hourly_forecast_data(lat, lon, client=client)
+        except CircuitOpenError:
+            message = (
+                "Weather service is temporarily unavailable. Please try again shortly."
+            )
+            return render_message(message, response_format, error=True)
+        except Exception:
+            message = "Malformed response from weather service."
+            return render_message(message, response_format, error=True)
+    if not periods:
+        message = "Unable to fetch hourly forecast data for this location."
+        return render_message(message, response_format, error=True)
+    with phase("format"):
+        summary = summarize(periods, *thresholds)
+        rendered = render_hourly(summary, response_format)
+    return with_stale_notice(rendered, staleness, response_format)
+
+
+MAX_GRIDPOINT_HOURS = 168
+
+
+@mcp.tool()
+@instrumented
+@profiled
+async def get_gridpoint_extremes(
+    latitude: float,
+    longitude: float,
+    layer: str = "windGust",
+    hours: int = 48,
+    response_format: str = TEXT,
+) -> str:
+    """
+    FastMCP tool: Return the extremes of a raw forecast layer over the next hours.
+
+    Answers questions like "what is the strongest wind gust in the next 48
+    hours?" from the gridpoint data behind the forecast.
+
+    Args:
+        latitude: Latitude of the location (-90 to 90).
+        longitude: Longitude of the location (-180 to 180).
+        layer: Gridpoint layer name, e.g. 'windGust' (default), 'temperature',
+            'windSpeed', 'probabilityOfPrecipitation' or
+            'quantitativePrecipitation'.
+        hours: Hours ahead to consider, from the current hour (1 to 168).
+        response_format: 'text' (default) for readable text, or 'json' for a
+            compact JSON object.
+
+    Returns:
+        The maximum with its time, minimum and mean (and total for
+        accumulated layers), or an error message.
+    """
+    with phase("validation"):
+        valid_format = response_format in RESPONSE_FORMATS
+        coordinates = validate_coordinates(latitude, longitude)
+        valid_hours = (
+            isinstance(hours, int)
+            and not isinstance(hours, bool)
+            and 1 <= hours <= MAX_GRIDPOINT_HOURS
+        )
+    if not valid_format:
+        return invalid_format_message()
+    if isinstance(coordinates, str):
+        return render_message(coordinates, response_format, error=True)
+    if not valid_hours:
+        return render_message(
+            f"Invalid hours. Use a whole number from 1 to {MAX_GRIDPOINT_HOURS}.",
+            response_format,
+            error=True,
+        )
+    lat, lon = coordinates
+    client = NWSClient()
+    with track_staleness() as staleness:
+        try:
+            gridpoint = await get_gridpoint_data(lat, lon, client=client)
+        except CircuitOpenError:
+            message = (
+                "Weather service is temporarily unavailable. Please try again shortly."
+            )
+            return render_message(message, response_format, error=True)
+        except Exception:
+            message = "Malformed response from weather service."
+            return render_message(message, response_format, error=True)
+    series = gridpoint.layers.get(layer) if isinstance(layer, str) else None
+    if series is None:
+        available = ", ".join(sorted(gridpoint.layers)) or "none"
+        return render_message(
+            f"Unknown layer: {layer}. Available layers: {available}.",
+            response_format,
+            error=True,
+        )
+    with phase("format"):
+        start = int(time.time()) // HOUR * HOUR
+        extremes = layer_extremes(series, start, hours)
+        rendered = render_layer_extremes(
+            {"layer": layer, "hours": hours, "unit": series.unit, **extremes},
+            response_format,
+        )
+    return with_stale_notice(rendered, staleness, response_format)
+
+
+MAX_BATCH_LOCATIONS = 100
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+def batch_concurrency_from_env() -> int:
+    """
+    Read ``WEATHER_BATCH_CONCURRENCY``, falling back to 8 if it is unset or
+    not a positive integer.
+    """
+    value = os.environ.get("WEATHER_BATCH_CONCURRENCY", "")
+    try:
+        limit = int(value) if value else DEFAULT_BATCH_CONCURRENCY
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        logger.warning(
+            "Ignoring invalid WEATHER_BATCH_CONCURRENCY=%r; using %d",
+            value,
+            DEFAULT_BATCH_CONCURRENCY,
+        )
+        return DEFAULT_BATCH_CONCURRENCY
+    return limit
+
+
+BATCH_CONCURRENCY = batch_concurrency_from_env()
+
+
+@mcp.tool()
+@instrumented
+@profiled
+async def get_forecasts(
+    locations: list[dict[str, Any]], max_concurrency: int | None = None
+) -> str:
+    """
+    FastMCP tool: Return formatted forecasts for many locations in one call.
+
+    Identical locations (after rounding to the precision NWS resolves) are
+    fetched once. Fetches run concurrently up to ``max_concurrency`` and a
+    failure for one location does not fail the rest of the batch.
+
+    Args:
+        locations: Objects with ``latitude`` and ``longitude`` keys.
+        max_concurrency: Upper bound on locations fetched at once (defaults
+            to ``WEATHER_BATCH_CONCURRENCY``, 8).
+
+    Returns:
+        One forecast (or error message) per location, in request order.
+    """
+    if not isinstance(locations, list) or not locations:
+        return "Invalid locations. Provide a non-empty list of coordinates."
+    if len(locations) > MAX_BATCH_LOCATIONS:
+        return f"Too many locations. At most {MAX_BATCH_LOCATIONS} are allowed."
+    limit = max(1, min(max_concurrency or BATCH_CONCURRENCY, MAX_BATCH_LOCATIONS))
+    semaphore = asyncio.Semaphore(limit)
+    client = NWSClient()
+
+    async def fetch(lat: float, lon: float) -> str:
+        async with semaphore:
+            with track_staleness() as staleness:
+                forecast = await forecast_for(lat, lon, client)
+        return with_stale_notice(forecast, staleness)
+
+    labels: list[str] = []
+    keys: list[tuple[float, float] | str] = []
+    pending: dict[tuple[float, float], asyncio.Task] = {}
+    for location in locations:
+        if isinstance(location, dict):
+            latitude = location.get("latitude")
+            longitude = location.get("longitude")
+        else:
+            latitude = longitude = None
+        labels.append(f"{latitude}, {longitude}")
+        coordinates = validate_coordinates(latitude, longitude)
+        if isinstance(coordinates, str):
+            keys.append(coordinates)
+            continue
+        key = normalize_coordinates(*coordinates)
+        keys.append(key)
+        if key not in pending:
+            pending[key] = asyncio.create_task(fetch(*key))
+    results = dict(zip(pending, await asyncio.gather(*pending.values())))
+    sections = [
+        f"Forecast for {label}:\n{key if isinstance(key, str) else results[key]}"
+        for label, key in zip(labels, keys)
+    ]
+    return "\n===\n".join(sections)
 
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request):
-    """Health check endpoint."""
+    """Health check endpoint (liveness)."""
+    return JSONResponse({"status": "ok"})
+
+
+@mcp.custom_route("/health/live", methods=["GET"])
+async def liveness_check(request):
+    """Liveness endpoint: the process is up and serving requests."""
     return JSONResponse({"status": "ok"})
 
 
+READINESS = ReadinessConfig.from_env()
+
+
+@mcp.custom_route("/health/ready", methods=["GET"])
+async def readiness_check(request):
+    """Readiness endpoint: 200 if the replica should receive traffic, else 503."""
+    ready, report = readiness(get_shared_loop_monitor(), READINESS)
+    return JSONResponse(report, status_code=200 if ready else 503)
+
+
+def runtime_metric_families() -> list[Family]:
+    """
+    Read gauges and counters owned by the pool, caches and breakers.
+    """
+    pool = get_shared_pool().stats()
+    limiter = get_shared_pool().limiter
+    points = get_shared_points_cache()
+    caches = {
+        "response": get_shared_response_cache().stats(),
+        "points": {
+            "entries": len(points),
+            "hits": points.hits,
+            "misses": points.misses,
+        },
+        "render": get_shared_render_cache().stats(),
+        "grid": get_shared_grid_index().stats(),
+        "gridpoint": get_shared_gridpoint_cache().stats(),
+    }
+    singleflight = get_shared_singleflight().stats()
+    refresh = get_shared_refresh_scheduler().stats()
+    ratios = {
+        name: stats["hits"] / (stats["hits"] + stats["misses"])
+        for name, stats in caches.items()
+        if stats["hits"] + stats["misses"]
+    }
+    return [
+        gauge_family(
+            "weather_upstream_connections",
+            "Connections in the shared upstream pool.",
+            "state",
+            {"open": pool["connections_open"], "idle": pool["connections_idle"]},
+        ),
+        (
+            "weather_upstream_max_connections",
+            "gauge",
+            "Connection limit of the shared upstream pool.",
+            [("", (), pool["max_connections"])],
+        ),
+        (
+            "weather_upstream_rate_limit",
+            "gauge",
+            "Current upstream requests/second allowed by the rate limiter.",
+            [("", (), limiter.rate)],
+        ),
+        (
+            "weather_cache_hits_total",
+            "counter",
+            "Cache lookups answered from the cache.",
+            [("", (("cache", n),), s["hits"]) for n, s in caches.items()],
+        ),
+        (
+            "weather_cache_misses_total",
+            "counter",
+            "Cache lookups that missed.",
+            [("", (("cache", n),), s["misses"]) for n, s in caches.items()],
+        ),
+        gauge_family(
+            "weather_cache_hit_ratio",
+            "Hits over lookups since start.",
+            "cache",
+            ratios,
+        ),
+        gauge_family(
+            "weather_cache_entries",
+            "Entries currently held.",
+            "cache",
+            {name: stats["entries"] for name, stats in caches.items()},
+        ),
+        gauge_family(
+            "weather_cache_bytes",
+            "Bytes held by the response cache, and its limit.",
+            "kind",
+            {
+                "used": caches["response"]["bytes"],
+                "max": caches["response"]["max_bytes"],
+            },
+        ),
+        (
+            "weather_cache_evictions_total",
+            "counter",
+            "Response cache entries evicted or refused admission.",
+            [("", (), caches["response"]["evictions"])],
+        ),
+        (
+            "weather_singleflight_coalesced_total",
+            "counter",
+            "Upstream fetches avoided by joining an identical in-flight fetch.",
+            [("", (), singleflight["coalesced"])],
+        ),
+        (
+            "weather_refresh_ahead_total",
+            "counter",
+            "Background refreshes of hot cache entries before expiry.",
+            [
+                ("", (("outcome", "ok"),), refresh["refreshes"]),
+                ("", (("outcome", "error"),), refresh["failures"]),
+            ],
+        ),
+        gauge_family(
+            "weather_circuit_open",
+            "1 while the endpoint's circuit breaker is open.",
+            "endpoint",
+            {
+                name: int(state == OPEN)
+                for name, state in get_shared_breakers().states().items()
+            },
+        ),
+    ]
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request):
+    """Prometheus metrics endpoint."""
+    body = get_shared_metrics().render(runtime_metric_families())
+    return Response(body, media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport="stdio")
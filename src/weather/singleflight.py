@@ -0,0 +1,105 @@
+"""
+Request coalescing for identical in-flight upstream fetches.
+
+When many tool calls ask for the same URL at once, only the first starts an
+upstream request; the others wait on its result. Waiters are shielded from
+each other, so cancelling one does not cancel the shared fetch.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+T = TypeVar("T")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return a canonical form of a URL for use as a coalescing/cache key.
+
+    The scheme and host are lower-cased and query parameters sorted, so
+    ``?b=2&a=1`` and ``?a=1&b=2`` map to the same key.
+
+    Args:
+        url: Absolute URL.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize with no calls in flight.
+        """
+        self._calls: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` for ``key`` unless a call for the same key is already running.
+
+        Args:
+            key: Identity of the call (e.g. a canonical URL).
+            fn: Zero-argument coroutine factory performing the work.
+
+        Returns:
+            T: The result of the single shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised, re-raised to every waiter.
+        """
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return counters of started and coalesced calls.
+        """
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+_shared_singleflight: SingleFlight | None = None
+
+
+def get_shared_singleflight() -> SingleFlight:
+    """
+    Return the process-wide ``SingleFlight``, creating it on first use.
+
+    Returns:
+        SingleFlight: The shared coalescer.
+    """
+    global _shared_singleflight
+    if _shared_singleflight is None:
+        _shared_singleflight = SingleFlight()
+    return _shared_singleflight
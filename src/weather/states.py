@@ -0,0 +1,69 @@
+"""
+US state codes accepted by the alert tools.
+"""
+
+from typing import Any
+
+
+US_STATES = {
+    "AL",
+    "AK",
+    "AZ",
+    "AR",
+    "CA",
+    "CO",
+    "CT",
+    "DE",
+    "FL",
+    "GA",
+    "HI",
+    "ID",
+    "IL",
+    "IN",
+    "IA",
+    "KS",
+    "KY",
+    "LA",
+    "ME",
+    "MD",
+    "MA",
+    "MI",
+    "MN",
+    "MS",
+    "MO",
+    "MT",
+    "NE",
+    "NV",
+    "NH",
+    "NJ",
+    "NM",
+    "NY",
+    "NC",
+    "ND",
+    "OH",
+    "OK",
+    "OR",
+    "PA",
+    "RI",
+    "SC",
+    "SD",
+    "TN",
+    "TX",
+    "UT",
+    "VT",
+    "VA",
+    "WA",
+    "WV",
+    "WI",
+    "WY",
+}
+
+
+def is_valid_state(state: Any) -> bool:
+    """
+    Return True if ``state`` is a two-letter uppercase US state code.
+
+    ``US_STATES`` holds only such codes, so a set lookup covers the length,
+    alphabet and case checks.
+    """
+    return isinstance(state, str) and state in US_STATES
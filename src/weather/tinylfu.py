@@ -0,0 +1,322 @@
+"""
+Size-aware W-TinyLFU cache.
+
+Entries are weighed in bytes and the cache never holds more than
+``max_weight``. New entries go through a small LRU *window*. Entries leaving
+the window must win an *admission* contest to enter the main area, a segmented
+LRU with *probation* and *protected* segments. They win only if a frequency
+sketch has seen them requested more often than every main-area entry they
+would displace.
+
+A one-off fetch, however large, therefore passes through the window and is
+dropped instead of flushing the entries that are requested again and again.
+Recency-heavy bursts still get a chance to prove themselves in the window.
+
+The frequency sketch is a 4-bit count-min sketch whose counters are halved
+periodically, so popularity that has faded is forgotten.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from typing import Any
+
+# Odd 64-bit multipliers giving each sketch row an independent-ish hash
+_SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+_MASK64 = (1 << 64) - 1
+
+
+class FrequencySketch:
+    """
+    Approximate access counts (0-15) in a count-min sketch with aging.
+    """
+
+    def __init__(self, width: int = 4096) -> None:
+        """
+        Initialize zeroed counters.
+
+        Args:
+            width: Counters per row, rounded up to a power of two. Roughly the
+                number of distinct keys whose popularity can be told apart.
+        """
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self.width - 1
+        self._table = bytearray(len(_SEEDS) * self.width)
+        # After this many increments every counter is halved
+        self.sample_size = 10 * self.width
+        self._additions = 0
+        self.resets = 0
+
+    def _slots(self, key: Hashable) -> Iterator[int]:
+        h = hash(key)
+        for row, seed in enumerate(_SEEDS):
+            mixed = ((h ^ (h >> 29)) * seed) & _MASK64
+            yield row * self.width + ((mixed >> 32) & self._mask)
+
+    def frequency(self, key: Hashable) -> int:
+        """
+        Return the estimated access count of a key (never an underestimate
+        until counters are halved).
+        """
+        table = self._table
+        return min(table[slot] for slot in self._slots(key))
+
+    def increment(self, key: Hashable) -> None:
+        """
+        Count one access to a key.
+        """
+        table = self._table
+        slots = list(self._slots(key))
+        current = min(table[slot] for slot in slots)
+        if current >= 15:
+            return
+        # Conservative update: only raise the counters holding the minimum
+        for slot in slots:
+            if table[slot] == current:
+                table[slot] = current + 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self.reset()
+
+    def reset(self) -> None:
+        """
+        Halve every counter so that old popularity decays.
+        """
+        self._table = bytearray(count >> 1 for count in self._table)
+        self._additions //= 2
+        self.resets += 1
+
+
+class WTinyLFUCache:
+    """
+    Byte-bounded map with W-TinyLFU admission and eviction.
+    """
+
+    def __init__(
+        self,
+        max_weight: int,
+        window_share: float = 0.01,
+        protected_share: float = 0.8,
+        sketch_width: int = 4096,
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_weight: Upper bound on the summed weight (bytes) of entries.
+            window_share: Fraction of ``max_weight`` given to the admission
+                window.
+            protected_share: Fraction of the main area reserved for entries
+                requested again after admission.
+            sketch_width: Width of the frequency sketch.
+        """
+        self.max_weight = max_weight
+        self.window_max = max(1, int(max_weight * window_share))
+        self.main_max = max(0, max_weight - self.window_max)
+        self.protected_max = int(self.main_max * protected_share)
+        self.sketch = FrequencySketch(sketch_width)
+        self._window: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._probation: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._protected: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.window_weight = 0
+        self.probation_weight = 0
+        self.protected_weight = 0
+        self.evictions = 0
+        self.evicted_weight = 0
+        self.rejections = 0
+
+    @property
+    def weight(self) -> int:
+        """
+        Summed weight of every entry held.
+        """
+        return self.window_weight + self.probation_weight + self.protected_weight
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._window or key in self._probation or key in self._protected
+
+    def peek(self, key: Hashable) -> Any | None:
+        """
+        Return a key's value without recording an access.
+        """
+        for segment in (self._window, self._probation, self._protected):
+            item = segment.get(key)
+            if item is not None:
+                return item[0]
+        return None
+
+    def get(self, key: Hashable, record: bool = True) -> Any | None:
+        """
+        Return a key's value (or None).
+
+        Args:
+            key: Entry key.
+            record: Count the lookup in the frequency sketch. Callers that
+                count requests themselves (via ``sketch.increment``) pass
+                False so that internal lookups do not inflate frequencies.
+        """
+        if record:
+            self.sketch.increment(key)
+        item = self._window.get(key)
+        if item is not None:
+            self._window.move_to_end(key)
+            return item[0]
+        item = self._protected.get(key)
+        if item is not None:
+            self._protected.move_to_end(key)
+            return item[0]
+        item = self._probation.pop(key, None)
+        if item is None:
+            return None
+        # Requested again after admission: promote, demoting the protected LRU
+        self.probation_weight -= item[1]
+        self._protected[key] = item
+        self.protected_weight += item[1]
+        while self.protected_weight > self.protected_max and len(self._protected) > 1:
+            demoted, demoted_item = self._protected.popitem(last=False)
+            self.protected_weight -= demoted_item[1]
+            self._probation[demoted] = demoted_item
+            self.probation_weight += demoted_item[1]
+        return item[0]
+
+    def put(self, key: Hashable, value: Any, weight: int) -> bool:
+        """
+        Insert or replace an entry.
+
+        The insert is not counted as an access; the lookup that missed was.
+
+        Args:
+            key: Entry key.
+            value: Entry value.
+            weight: Entry size in bytes.
+
+        Returns:
+            bool: False if the entry is larger than the whole cache and was
+            not stored.
+        """
+        if weight > self.max_weight:
+            self.pop(key)
+            self.rejections += 1
+            return False
+        if self._replace_in_main(key, value, weight):
+            return True
+        self.pop(key)
+        self._window[key] = (value, weight)
+        self.window_weight += weight
+        while self.window_weight > self.window_max:
+            candidate, item = self._window.popitem(last=False)
+            self.window_weight -= item[1]
+            self._admit(candidate, item)
+        return True
+
+    def _replace_in_main(self, key: Hashable, value: Any, weight: int) -> bool:
+        """
+        Replace an entry already admitted to the main area where it stands,
+        evicting least recently used main entries if it grew.
+        """
+        for segment in (self._probation, self._protected):
+            item = segment.get(key)
+            if item is None:
+                continue
+            if weight > self.main_max:
+                return False
+            segment[key] = (value, weight)
+            segment.move_to_end(key)
+            if segment is self._probation:
+                self.probation_weight += weight - item[1]
+            else:
+                self.protected_weight += weight - item[1]
+            while self.probation_weight + self.protected_weight > self.main_max:
+                victims = self._probation or self._protected
+                _, (_, victim_weight) = victims.popitem(last=False)
+                if victims is self._probation:
+                    self.probation_weight -= victim_weight
+                else:
+                    self.protected_weight -= victim_weight
+                self._dropped(victim_weight)
+            return True
+        return False
+
+    def _admit(self, candidate: Hashable, item: tuple[Any, int]) -> None:
+        """
+        Move an entry leaving the window into the main area if it is requested
+        more often than every entry it would displace; otherwise drop it.
+        """
+        weight = item[1]
+        if weight > self.main_max:
+            self._dropped(weight, rejected=True)
+            return
+        excess = self.probation_weight + self.protected_weight + weight - self.main_max
+        victims: list[tuple[OrderedDict, Hashable]] = []
+        if excess > 0:
+            frequency = self.sketch.frequency(candidate)
+            for segment in (self._probation, self._protected):
+                for key, (_, victim_weight) in segment.items():
+                    if excess <= 0:
+                        break
+                    if self.sketch.frequency(key) >= frequency:
+                        self._dropped(weight, rejected=True)
+                        return
+                    victims.append((segment, key))
+                    excess -= victim_weight
+        for segment, key in victims:
+            _, victim_weight = segment.pop(key)
+            if segment is self._probation:
+                self.probation_weight -= victim_weight
+            else:
+                self.protected_weight -= victim_weight
+            self._dropped(victim_weight)
+        self._probation[candidate] = item
+        self.probation_weight += weight
+
+    def _dropped(self, weight: int, rejected: bool = False) -> None:
+        self.evictions += 1
+        self.evicted_weight += weight
+        if rejected:
+            self.rejections += 1
+
+    def pop(self, key: Hashable) -> Any | None:
+        """
+        Remove an entry, returning its value (or None if absent).
+        """
+        item = self._window.pop(key, None)
+        if item is not None:
+            self.window_weight -= item[1]
+            return item[0]
+        item = self._probation.pop(key, None)
+        if item is not None:
+            self.probation_weight -= item[1]
+            return item[0]
+        item = self._protected.pop(key, None)
+        if item is not None:
+            self.protected_weight -= item[1]
+            return item[0]
+        return None
+
+    def clear(self) -> None:
+        """
+        Drop every entry (access frequencies are kept).
+        """
+        for segment in (self._window, self._probation, self._protected):
+            segment.clear()
+        self.window_weight = self.probation_weight = self.protected_weight = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return size and eviction counters.
+        """
+        return {
+            "entries": len(self),
+            "bytes": self.weight,
+            "max_bytes": self.max_weight,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_weight,
+            "rejections": self.rejections,
+        }
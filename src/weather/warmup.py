@@ -0,0 +1,249 @@
+"""
+Background cache pre-warming from a configured hot set.
+
+A hot-set file lists the coordinates and state codes users ask about most::
+
+    {
+        "coordinates": [[38.89, -77.03], {"latitude": 40.71, "longitude": -74.0}],
+        "states": ["CA", "TX"]
+    }
+
+When the server starts, their points resolutions, forecasts and alerts are
+fetched in the background, with bounded concurrency, through the normal
+client. The caches are then warm for the first requests after a deploy.
+Progress is reported by ``/health/ready``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.weather.nws_client import NWSClient
+from src.weather.states import is_valid_state
+
+logger = logging.getLogger(__name__)
+
+DISABLED = "disabled"
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+
+
+@dataclass
+class HotSet:
+    """
+    Locations to pre-warm.
+
+    Attributes:
+        coordinates: ``(latitude, longitude)`` pairs.
+        states: Two-letter state codes.
+    """
+
+    coordinates: list[tuple[float, float]] = field(default_factory=list)
+    states: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.coordinates) + len(self.states)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "HotSet":
+        """
+        Build a hot set from its JSON form, skipping invalid entries.
+
+        Args:
+            data: Object with optional ``coordinates`` (``[lat, lon]`` pairs or
+                objects with ``latitude``/``longitude``) and ``states`` lists.
+
+        Returns:
+            HotSet: Valid, de-duplicated entries in file order.
+        """
+        coordinates: list[tuple[float, float]] = []
+        for item in data.get("coordinates") or []:
+            try:
+                if isinstance(item, dict):
+                    lat, lon = float(item["latitude"]), float(item["longitude"])
+                else:
+                    lat, lon = (float(v) for v in item)
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Ignoring invalid hot-set coordinate %r", item)
+                continue
+            if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+                logger.warning("Ignoring out-of-range hot-set coordinate %r", item)
+                continue
+            if (lat, lon) not in coordinates:
+                coordinates.append((lat, lon))
+        states: list[str] = []
+        for state in data.get("states") or []:
+            if not is_valid_state(state):
+                logger.warning("Ignoring invalid hot-set state %r", state)
+                continue
+            if state not in states:
+                states.append(state)
+        return cls(coordinates, states)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "HotSet":
+        """
+        Load a hot set from a JSON file.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If it is not a JSON object.
+        """
+        data = json.loads(Path(path).read_text())
+        if not isinstance(data, dict):
+            raise ValueError("Hot-set file must contain a JSON object.")
+        return cls.from_dict(data)
+
+
+class Warmup:
+    """
+    Prefetches a hot set once per process, reporting progress.
+    """
+
+    def __init__(self, hot_set: HotSet | None = None, concurrency: int = 4) -> None:
+        """
+        Initialize warm-up without fetching anything.
+
+        Args:
+            hot_set: Locations to prefetch; None or empty disables warm-up.
+            concurrency: Prefetches in flight at once.
+        """
+        self.hot_set = hot_set if hot_set is not None else HotSet()
+        self.concurrency = max(1, concurrency)
+        self.state = PENDING if self.hot_set else DISABLED
+        self.completed = 0
+        self.failed = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._holders = 0
+
+    @classmethod
+    def from_env(cls) -> "Warmup":
+        """
+        Build warm-up from ``WEATHER_WARMUP_*`` environment variables.
+
+        An unreadable hot-set file is logged and disables warm-up rather than
+        preventing the server from starting.
+        """
+        path = os.environ.get("WEATHER_WARMUP_FILE")
+        concurrency = os.environ.get("WEATHER_WARMUP_CONCURRENCY")
+        hot_set = None
+        if path:
+            try:
+                hot_set = HotSet.from_file(path)
+            except (OSError, ValueError) as e:
+                logger.warning("Hot-set file %s not loaded: %r", path, e)
+        return cls(hot_set, concurrency=int(concurrency) if concurrency else 4)
+
+    async def _prefetch_point(self, client: NWSClient, lat: float, lon: float) -> None:
+        resolution = await client.resolve_point(lat, lon)
+        forecast = await client._make_request(resolution.forecast)
+        client.grid_index.add(resolution, forecast.get("geometry"))
+
+    async def run(self, client: NWSClient | None = None) -> None:
+        """
+        Prefetch every hot-set entry; failures are counted, not raised.
+
+        Args:
+            client: NWSClient to fetch with (defaults to a new one).
+        """
+        if client is None:
+            client = NWSClient()
+        self.state = RUNNING
+        self.started_at = time.time()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(label: str, call: Any) -> None:
+            async with semaphore:
+                try:
+                    await call
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning("Warm-up of %s failed: %r", label, e)
+                else:
+                    self.completed += 1
+
+        calls = [
+            fetch(f"{lat},{lon}", self._prefetch_point(client, lat, lon))
+            for lat, lon in self.hot_set.coordinates
+        ]
+        calls += [
+            fetch(state, client.get_alerts(state)) for state in self.hot_set.states
+        ]
+        await asyncio.gather(*calls)
+        self.state = DONE
+        self.finished_at = time.time()
+        logger.info(
+            "Warm-up finished: %d prefetched, %d failed in %.1fs",
+            self.completed,
+            self.failed,
+            self.finished_at - self.started_at,
+        )
+
+    def start(self) -> None:
+        """
+        Start warm-up in the background for a server lifetime.
+
+        Warm-up runs once per process; later lifetimes only hold it.
+        """
+        self._holders += 1
+        if self.state == PENDING and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Cancel an unfinished warm-up once the last holder releases it.
+        """
+        self._holders = max(0, self._holders - 1)
+        task = self._task
+        if self._holders or task is None:
+            return
+        self._task = None
+        if task.done():
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # Interrupted: a later server lifetime in this process starts over
+        self.state = PENDING
+        self.completed = self.failed = 0
+        self.started_at = None
+
+    def progress(self) -> dict[str, Any]:
+        """
+        Return warm-up state and counts, as reported by readiness checks.
+        """
+        progress: dict[str, Any] = {
+            "state": self.state,
+            "total": len(self.hot_set),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+        if self.started_at is not None:
+            end = self.finished_at if self.finished_at is not None else time.time()
+            progress["elapsed_seconds"] = round(end - self.started_at, 3)
+        return progress
+
+
+_shared_warmup: Warmup | None = None
+
+
+def get_shared_warmup() -> Warmup:
+    """
+    Return the process-wide ``Warmup``, creating it on first use.
+
+    Returns:
+        Warmup: The shared warm-up.
+    """
+    global _shared_warmup
+    if _shared_warmup is None:
+        _shared_warmup = Warmup.from_env()
+    return _shared_warmup
@@ -24,6 +24,40 @@ def server_module():
     return module
 
 
+@pytest.fixture(autouse=True)
+def isolate_shared_state(monkeypatch):
+    """Give every test fresh process-wide caches."""
+    from src.weather import (
+        alerts_index,
+        circuit_breaker,
+        grid_index,
+        gridpoints,
+        health,
+        http_cache,
+        metrics,
+        points_cache,
+        profiling,
+        refresh,
+        render,
+        singleflight,
+        warmup,
+    )
+
+    monkeypatch.setattr(points_cache, "_shared_points_cache", None)
+    monkeypatch.setattr(http_cache, "_shared_response_cache", None)
+    monkeypatch.setattr(singleflight, "_shared_singleflight", None)
+    monkeypatch.setattr(alerts_index, "_shared_alerts_snapshot", None)
+    monkeypatch.setattr(circuit_breaker, "_shared_breakers", None)
+    monkeypatch.setattr(render, "_shared_render_cache", None)
+    monkeypatch.setattr(metrics, "_shared_metrics", None)
+    monkeypatch.setattr(health, "_shared_loop_monitor", None)
+    monkeypatch.setattr(profiling, "_shared_profiler", None)
+    monkeypatch.setattr(warmup, "_shared_warmup", None)
+    monkeypatch.setattr(refresh, "_shared_refresh_scheduler", None)
+    monkeypatch.setattr(grid_index, "_shared_grid_index", None)
+    monkeypatch.setattr(gridpoints, "_shared_gridpoint_cache", None)
+
+
 @pytest.fixture
 def mock_httpx_client():
     """Fixture to mock httpx.AsyncClient."""
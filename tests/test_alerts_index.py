@@ -0,0 +1,112 @@
+"""
+Tests for the nationwide alerts snapshot and its in-memory index.
+"""
+
+import asyncio
+
+import pytest
+
+from src.weather import alerts_index
+from src.weather.alerts_index import AlertsIndex, AlertsSnapshot
+from src.weather.nws_client import NWSClient
+from src.weather.server import get_alerts, get_alerts_data
+
+
+def make_feature(event, severity, ugc):
+    return {
+        "properties": {
+            "headline": f"{event} headline",
+            "event": event,
+            "severity": severity,
+            "areaDesc": "Somewhere",
+            "geocode": {"UGC": ugc},
+        }
+    }
+
+
+NATIONWIDE = {
+    "features": [
+        make_feature("Flood Warning", "Severe", ["TXC201", "TXZ213"]),
+        make_feature("Heat Advisory", "Moderate", ["TXZ214", "LAZ040"]),
+        make_feature("Winter Storm Warning", "Severe", ["NYZ001"]),
+    ]
+}
+
+
+def test_build_indexes_by_state_zone_event_and_severity():
+    index = AlertsIndex.build(NATIONWIDE)
+    assert [a["event"] for a in index.for_state("TX")] == [
+        "Flood Warning",
+        "Heat Advisory",
+    ]
+    assert [a["event"] for a in index.for_state("LA")] == ["Heat Advisory"]
+    assert index.for_state("CA") == []
+    assert index.for_zone("NYZ001")[0]["event"] == "Winter Storm Warning"
+    assert len(index.for_severity("Severe")) == 2
+    assert len(index.for_event("Heat Advisory")) == 1
+    # Alerts are summarized once and shared between tables
+    assert index.for_state("TX")[1] is index.for_state("LA")[0]
+
+
+def test_build_rejects_malformed_payload():
+    with pytest.raises(ValueError):
+        AlertsIndex.build({"features": "nope"})
+
+
+def test_current_respects_enabled_flag_and_max_age():
+    snapshot = AlertsSnapshot(enabled=True, interval=10)
+    snapshot.index = AlertsIndex.build(NATIONWIDE, now=100.0)
+    assert snapshot.current(now=120.0) is snapshot.index
+    assert snapshot.current(now=200.0) is None
+    snapshot.enabled = False
+    assert snapshot.current(now=120.0) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_index_and_reuses_unchanged_payload(monkeypatch):
+    async def fake_make_request(self, url):
+        assert url == alerts_index.NATIONWIDE_ALERTS_URL
+        return NATIONWIDE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    snapshot = AlertsSnapshot(enabled=True)
+    first = await snapshot.refresh()
+    second = await snapshot.refresh()
+    assert second is not first
+    assert second.by_state is first.by_state
+    assert snapshot.index is second
+    assert snapshot.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_answers_from_snapshot(monkeypatch):
+    async def fail_make_request(self, url):
+        raise AssertionError("no upstream call expected")
+
+    snapshot = AlertsSnapshot(enabled=True)
+    snapshot.index = AlertsIndex.build(NATIONWIDE)
+    monkeypatch.setattr(alerts_index, "_shared_alerts_snapshot", snapshot)
+    monkeypatch.setattr(NWSClient, "_make_request", fail_make_request)
+
+    alerts = await get_alerts_data("TX")
+    assert len(alerts) == 2
+    result = await get_alerts("NY")
+    assert "Winter Storm Warning" in result
+    assert "No active alerts" in await get_alerts("CA")
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_task_lifecycle(monkeypatch):
+    calls = []
+
+    async def fake_make_request(self, url):
+        calls.append(url)
+        return NATIONWIDE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    snapshot = AlertsSnapshot(enabled=True, interval=60)
+    snapshot.start()
+    await asyncio.sleep(0.01)
+    await snapshot.stop()
+    assert calls == [alerts_index.NATIONWIDE_ALERTS_URL]
+    assert snapshot.current() is not None
@@ -0,0 +1,120 @@
+"""
+Tests for the get_forecasts batch tool.
+"""
+
+import asyncio
+
+import pytest
+
+from src.weather.nws_client import NWSClient
+from src.weather.server import (
+    MAX_BATCH_LOCATIONS,
+    batch_concurrency_from_env,
+    get_forecasts,
+)
+
+
+def forecast_payload(name):
+    return {
+        "properties": {
+            "periods": [
+                {
+                    "name": name,
+                    "temperature": 60,
+                    "temperatureUnit": "F",
+                    "windSpeed": "5 mph",
+                    "windDirection": "N",
+                    "detailedForecast": f"{name} forecast.",
+                }
+            ]
+        }
+    }
+
+
+def fake_upstream(urls, fail_for=None, active=None):
+    async def fake_make_request(self, url):
+        urls.append(url)
+        if active is not None:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+        if "/points/" in url:
+            coords = url.rsplit("/", 1)[1]
+            if coords == fail_for:
+                raise ValueError("bad payload")
+            return {"properties": {"forecast": f"https://f/{coords}"}}
+        return forecast_payload(url.rsplit("/", 1)[1])
+
+    return fake_make_request
+
+
+@pytest.mark.asyncio
+async def test_duplicate_locations_are_fetched_once(monkeypatch):
+    urls = []
+    monkeypatch.setattr(NWSClient, "_make_request", fake_upstream(urls))
+    result = await get_forecasts(
+        [
+            {"latitude": 34.05, "longitude": -118.25},
+            {"latitude": 34.050001, "longitude": -118.25},
+            {"latitude": 40.7, "longitude": -74.0},
+        ]
+    )
+    assert len(urls) == 4
+    sections = result.split("\n===\n")
+    assert len(sections) == 3
+    assert "34.05,-118.25 forecast." in sections[0]
+    assert "34.05,-118.25 forecast." in sections[1]
+    assert "40.7,-74.0 forecast." in sections[2]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_per_location(monkeypatch):
+    urls = []
+    monkeypatch.setattr(
+        NWSClient, "_make_request", fake_upstream(urls, fail_for="1.0,2.0")
+    )
+    result = await get_forecasts(
+        [
+            {"latitude": 1.0, "longitude": 2.0},
+            {"latitude": 200, "longitude": 0},
+            {"latitude": "x"},
+            "not-a-location",
+            {"latitude": 3.0, "longitude": 4.0},
+        ]
+    )
+    sections = result.split("\n===\n")
+    assert "Malformed response from weather service." in sections[0]
+    assert "Latitude must be between -90 and 90" in sections[1]
+    assert "must be numbers" in sections[2]
+    assert "must be numbers" in sections[3]
+    assert "3.0,4.0 forecast." in sections[4]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(monkeypatch):
+    urls = []
+    active = {"now": 0, "max": 0}
+    monkeypatch.setattr(NWSClient, "_make_request", fake_upstream(urls, active=active))
+    locations = [{"latitude": float(i), "longitude": 0.0} for i in range(10)]
+    await get_forecasts(locations, max_concurrency=3)
+    assert len(urls) == 20
+    assert active["max"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_rejects_empty_and_oversized_batches():
+    assert "Invalid locations" in await get_forecasts([])
+    too_many = [{"latitude": 0, "longitude": 0}] * (MAX_BATCH_LOCATIONS + 1)
+    assert "Too many locations" in await get_forecasts(too_many)
+
+
+@pytest.mark.parametrize("value", ["", "abc", "0", "-3", "2.5"])
+def test_batch_concurrency_falls_back_on_bad_values(monkeypatch, value):
+    monkeypatch.setenv("WEATHER_BATCH_CONCURRENCY", value)
+    assert batch_concurrency_from_env() == 8
+
+
+def test_batch_concurrency_from_env(monkeypatch):
+    monkeypatch.setenv("WEATHER_BATCH_CONCURRENCY", "3")
+    assert batch_concurrency_from_env() == 3
@@ -0,0 +1,144 @@
+"""
+Tests for per-endpoint circuit breakers and stale fallback.
+"""
+
+import httpx
+import pytest
+
+from src.weather.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    Staleness,
+    track_staleness,
+)
+from src.weather.http_cache import ResponseCache
+from src.weather.nws_client import NWSClient
+from src.weather.server import get_forecast, with_stale_notice
+
+URL = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+
+
+def test_opens_after_failure_threshold():
+    breaker = CircuitBreaker("alerts", failure_threshold=0.5, min_calls=4)
+    breaker.record_success(now=0.0)
+    breaker.record_failure(now=1.0)
+    breaker.record_failure(now=2.0)
+    assert breaker.state == CLOSED
+    breaker.record_failure(now=3.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow(now=4.0)
+    assert breaker.rejected == 1
+
+
+def test_old_outcomes_leave_the_window():
+    breaker = CircuitBreaker("alerts", min_calls=3, window=10.0)
+    breaker.record_failure(now=0.0)
+    breaker.record_failure(now=1.0)
+    breaker.record_failure(now=20.0)
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate(now=20.0) == 1.0
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker("points", min_calls=1, open_duration=30.0)
+    breaker.record_failure(now=0.0)
+    assert breaker.state == OPEN
+    assert breaker.allow(now=31.0)
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow(now=32.0)
+    breaker.record_failure(now=33.0)
+    assert breaker.state == OPEN
+    assert breaker.allow(now=64.0)
+    breaker.record_success(now=65.0)
+    assert breaker.state == CLOSED
+    assert breaker.allow(now=66.0)
+
+
+def test_registry_has_one_breaker_per_endpoint():
+    breakers = CircuitBreakers(min_calls=1)
+    points = breakers.for_url("https://api.weather.gov/points/1,2")
+    assert points is breakers.for_url("https://api.weather.gov/points/3,4")
+    assert points is not breakers.for_url(URL)
+    points.record_failure()
+    assert breakers.states() == {"points": OPEN, "gridpoints": CLOSED}
+
+
+class FlakyPool:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def get(self, url, headers=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status, body = outcome
+        return httpx.Response(
+            status,
+            headers={"etag": '"v1"'},
+            json=body,
+            request=httpx.Request("GET", url),
+        )
+
+
+@pytest.mark.asyncio
+async def test_failure_serves_stale_payload_with_age():
+    pool = FlakyPool((200, {"features": ["cached"]}), httpx.ConnectTimeout("slow"))
+    client = NWSClient(
+        pool=pool,
+        response_cache=ResponseCache(),
+        breakers=CircuitBreakers(),
+    )
+    first = await client._make_request(URL)
+    client.response_cache.get(URL).stored_at -= 600
+    with track_staleness() as staleness:
+        second = await client._make_request(URL)
+    assert second is first
+    assert 600 <= staleness.age < 610
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_upstream():
+    pool = FlakyPool(httpx.ConnectError("down"))
+    breakers = CircuitBreakers(min_calls=1)
+    client = NWSClient(pool=pool, response_cache=ResponseCache(), breakers=breakers)
+    with pytest.raises(httpx.ConnectError):
+        await client._make_request(URL)
+    with pytest.raises(httpx.RequestError, match="Circuit open"):
+        await client._make_request(URL)
+    assert pool.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_count_as_failures_but_client_errors_do_not():
+    breakers = CircuitBreakers(min_calls=1)
+    pool = FlakyPool((404, {}), (500, {}))
+    client = NWSClient(pool=pool, response_cache=ResponseCache(), breakers=breakers)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._make_request(URL)
+    assert breakers.for_url(URL).state == CLOSED
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._make_request(URL)
+    assert breakers.for_url(URL).state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_reports_open_circuit(monkeypatch):
+    async def open_circuit(self, url):
+        raise CircuitOpenError("Circuit open for NWS endpoint 'points'")
+
+    monkeypatch.setattr(NWSClient, "_make_request", open_circuit)
+    result = await get_forecast(34.05, -118.25)
+    assert "temporarily unavailable" in result
+
+
+def test_with_stale_notice():
+    assert with_stale_notice("text", Staleness()) == "text"
+    assert "30 seconds ago" in with_stale_notice("text", Staleness(age=30.4))
+    assert "10 minutes ago" in with_stale_notice("text", Staleness(age=600))
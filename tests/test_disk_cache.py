@@ -0,0 +1,205 @@
+"""
+Tests for the SQLite-backed persistent response cache.
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.weather.disk_cache import DiskCache
+from src.weather.http_cache import ResponseCache
+from src.weather.models import Alert, ForecastPeriod, normalize_payload
+from src.weather.nws_client import NWSClient
+from tests.test_http_cache import FakePool
+
+FORECAST_URL = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+ALERTS_URL = "https://api.weather.gov/alerts/active?area=CA"
+PERIOD = {
+    "name": "Tonight",
+    "temperature": 50,
+    "temperatureUnit": "F",
+    "windSpeed": "5 mph",
+    "windDirection": "W",
+    "detailedForecast": "Clear.",
+}
+FORECAST = {"properties": {"periods": [PERIOD]}}
+
+
+@pytest.fixture
+def disk_cache():
+    """Open disk caches that are closed when the test ends."""
+    opened = []
+
+    def open_cache(path, **kwargs):
+        cache = DiskCache(path, decode=normalize_payload, **kwargs)
+        opened.append(cache)
+        return cache
+
+    yield open_cache
+    for cache in opened:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_a_restart_with_typed_payloads(tmp_path, disk_cache):
+    db = tmp_path / "cache.db"
+    first = ResponseCache(disk=disk_cache(db))
+    alert = Alert.from_feature(
+        {"id": "a1", "properties": {"event": "Flood", "geocode": {"UGC": ["CAZ001"]}}}
+    )
+    first.store(ALERTS_URL, {"cache-control": "max-age=60"}, {"features": [alert]})
+    first.store(
+        FORECAST_URL,
+        {"etag": '"v1"'},
+        normalize_payload(FORECAST_URL, FORECAST),
+    )
+    first.flush()
+
+    second = ResponseCache(disk=disk_cache(db))
+    # get() never touches the disk; lookup() reads through
+    assert second.get(ALERTS_URL) is None
+    entry = await second.lookup(ALERTS_URL)
+    assert entry.is_fresh() and entry.key == ALERTS_URL
+    assert entry.payload["features"] == [alert]
+    stale = await second.lookup(FORECAST_URL)
+    assert not stale.is_fresh() and stale.etag == '"v1"'
+    period = stale.payload["properties"]["periods"][0]
+    assert period == ForecastPeriod.from_api(PERIOD)
+    assert second.stats()["disk_hits"] == 2
+    # Later reads come from memory
+    assert second.get(ALERTS_URL) is entry
+    assert await second.lookup(ALERTS_URL) is entry
+    assert second.stats()["disk_hits"] == 2
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_refused_by_memory_are_not_reread(tmp_path, disk_cache):
+    db = tmp_path / "cache.db"
+    first = ResponseCache(disk=disk_cache(db))
+    big = {"x": "y" * 5000}
+    first.store(ALERTS_URL, {"cache-control": "max-age=60"}, big, size=5000)
+    first.flush()
+
+    # The window is too small for the entry, and nothing frees main space
+    second = ResponseCache(max_bytes=50_000, disk=disk_cache(db))
+    second._entries.main_max = 0
+    entry = await second.lookup(ALERTS_URL)
+    assert entry.payload == big and len(second) == 0
+    assert await second.lookup(ALERTS_URL) is entry
+    assert second.stats()["disk_hits"] == 1
+    second.store(ALERTS_URL, {"cache-control": "no-store"}, big)
+    assert second.get(ALERTS_URL) is None
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_new_process_answers_from_disk_and_revalidates(tmp_path, disk_cache):
+    db = tmp_path / "cache.db"
+    pool = FakePool((200, {"cache-control": "max-age=60"}, FORECAST))
+    client = NWSClient(pool=pool, response_cache=ResponseCache(disk=disk_cache(db)))
+    await client._make_request(FORECAST_URL)
+    client.response_cache.flush()
+
+    # A fresh process (new memory tier) gets an immediate hit
+    pool = FakePool()
+    client = NWSClient(pool=pool, response_cache=ResponseCache(disk=disk_cache(db)))
+    data = await client._make_request(FORECAST_URL)
+    assert data["properties"]["periods"][0].name == "Tonight"
+    assert pool.sent_headers == []
+
+    # A 304 on a stale entry extends its freshness on disk too
+    cache = disk_cache(db)
+    cache.refresh(FORECAST_URL, 0.0, 0.0, '"v2"', None)
+    pool = FakePool((304, {"cache-control": "max-age=120"}, None))
+    client = NWSClient(pool=pool, response_cache=ResponseCache(disk=disk_cache(db)))
+    await client._make_request(FORECAST_URL)
+    client.response_cache.close()
+    assert pool.sent_headers == [{"If-None-Match": '"v2"'}]
+    row = cache.get(FORECAST_URL)
+    assert row["fresh_until"] > time.time() + 100 and row["lifetime"] == 120
+
+
+def test_uncacheable_response_removes_persisted_entry(tmp_path, disk_cache):
+    cache = ResponseCache(disk=disk_cache(tmp_path / "cache.db"))
+    cache.store(FORECAST_URL, {"cache-control": "max-age=60"}, FORECAST)
+    cache.store(FORECAST_URL, {"cache-control": "no-store"}, FORECAST)
+    cache.flush()
+    assert len(cache.disk) == 0
+    cache.close()
+    # The connection reopens on next use
+    assert len(cache.disk) == 0
+
+
+def test_eviction_drops_long_stale_then_least_recently_read(tmp_path, disk_cache):
+    cache = disk_cache(tmp_path / "cache.db", max_bytes=250, max_stale=100)
+    now = 1_000_000.0
+    body = {"x": "y" * 80}
+    cache.put("old", body, now - 500, 0, None, None, now - 600, now=now - 600)
+    for n, key in enumerate(("a", "b", "c")):
+        cache.put(key, body, now + 60, 60, None, None, now, now=now - 300 + n)
+    cache.get("a", now=now)
+    assert cache.evict(now=now) == 2
+    assert cache.get("old", now=now) is None
+    assert cache.get("b", now=now) is None
+    assert cache.get("a", now=now) is not None
+    assert cache.get("c", now=now) is not None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_vacuum_reclaims_space_after_mass_eviction(tmp_path, disk_cache):
+    cache = disk_cache(tmp_path / "cache.db", max_bytes=10**9, max_stale=0)
+    for n in range(200):
+        cache.put(f"k{n}", {"x": "y" * 2000}, 0.0, 0.0, None, None, 0.0)
+    cache.evict(now=10.0)
+    assert len(cache) == 0
+    assert cache.stats()["vacuums"] >= 1
+    pages = cache._db.execute("PRAGMA freelist_count").fetchone()[0]
+    assert pages == 0
+
+
+def test_concurrent_processes_share_the_database(tmp_path, disk_cache):
+    db = tmp_path / "cache.db"
+    cache = disk_cache(db)
+    assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    script = (
+        "from src.weather.disk_cache import DiskCache\n"
+        f"cache = DiskCache({str(db)!r})\n"
+        "for n in range(50):\n"
+        "    cache.put(f'other{n}', {'n': n}, 9e12, 60, None, None, 0.0)\n"
+    )
+    child = subprocess.Popen(
+        [sys.executable, "-c", script], cwd=Path(__file__).parent.parent
+    )
+    for n in range(50):
+        cache.put(f"mine{n}", {"n": n}, 9e12, 60, None, None, 0.0)
+    assert child.wait(timeout=30) == 0
+    assert len(cache) == 100
+    assert cache.get("other49")["payload"] == {"n": 49}
+    assert cache.stats()["errors"] == 0
+
+
+def test_unreadable_rows_are_misses(tmp_path, disk_cache):
+    cache = disk_cache(tmp_path / "cache.db")
+    cache._db.execute(
+        "INSERT INTO responses VALUES ('bad', '{', 0, 0, NULL, NULL, 1, 0, 0)"
+    )
+    assert cache.get("bad") is None
+    assert cache.stats()["errors"] == 1
+
+
+def test_from_env(monkeypatch, tmp_path):
+    assert DiskCache.from_env() is None
+    assert ResponseCache.from_env().disk is None
+    monkeypatch.setenv("WEATHER_DISK_CACHE_PATH", str(tmp_path / "c" / "cache.db"))
+    monkeypatch.setenv("WEATHER_DISK_CACHE_MAX_MB", "1.5")
+    monkeypatch.setenv("WEATHER_DISK_CACHE_MAX_STALE", "3600")
+    cache = ResponseCache.from_env().disk
+    try:
+        assert cache.max_bytes == int(1.5 * 1024 * 1024)
+        assert cache.max_stale == 3600 and cache.decode is normalize_payload
+    finally:
+        cache.close()
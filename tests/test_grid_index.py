@@ -0,0 +1,151 @@
+"""
+Tests for the local index of forecast grid cells.
+"""
+
+import httpx
+import pytest
+
+from src.weather.geo import edge_distance, parse_rings, rings_bounds
+from src.weather.grid_index import GridCellIndex
+from src.weather.nws_client import NWSClient
+from src.weather.points_cache import PointResolution
+from src.weather.server import get_forecast_data
+
+FORECAST_URL = "https://api.weather.gov/gridpoints/LOX/154,44/forecast"
+# A grid cell about 2.5 km across
+CELL = {
+    "type": "Polygon",
+    "coordinates": [
+        [
+            [-118.26, 34.04],
+            [-118.233, 34.04],
+            [-118.233, 34.0625],
+            [-118.26, 34.0625],
+            [-118.26, 34.04],
+        ]
+    ],
+}
+POINTS_RESPONSE = {
+    "properties": {
+        "forecast": FORECAST_URL,
+        "forecastZone": "https://api.weather.gov/zones/forecast/CAZ368",
+        "gridId": "LOX",
+        "gridX": 154,
+        "gridY": 44,
+    }
+}
+FORECAST_RESPONSE = {
+    "geometry": CELL,
+    "properties": {
+        "periods": [
+            {
+                "name": "Tonight",
+                "temperature": 55,
+                "temperatureUnit": "F",
+                "windSpeed": "5 mph",
+                "windDirection": "W",
+                "detailedForecast": "Clear.",
+            }
+        ]
+    },
+}
+
+
+def test_edge_distance_is_in_metres():
+    rings = parse_rings(CELL)
+    # 0.005 degrees of latitude is about 556 m
+    assert edge_distance(rings, -118.245, 34.045) == pytest.approx(556, rel=0.01)
+    assert edge_distance((), 0.0, 0.0) == float("inf")
+    assert rings_bounds(rings) == (-118.26, 34.04, -118.233, 34.0625)
+
+
+def test_lookup_resolves_inside_cells_and_falls_back_near_edges():
+    index = GridCellIndex(margin=150)
+    resolution = PointResolution(forecast=FORECAST_URL)
+    assert index.add(resolution, CELL)
+    assert not index.add(resolution, CELL)
+    assert not index.add(PointResolution(forecast="other"), None)
+    assert index.lookup(34.05, -118.245) is resolution
+    # 0.0005 degrees (about 55 m) inside the western edge
+    assert index.lookup(34.05, -118.2595) is None
+    assert index.lookup(34.2, -118.245) is None
+    assert index.stats() == {
+        "entries": 1,
+        "hits": 1,
+        "misses": 2,
+        "edge_fallbacks": 1,
+    }
+    index.discard(FORECAST_URL)
+    assert len(index) == 0
+    assert index.lookup(34.05, -118.245) is None
+
+
+def test_disabled_index_and_max_cells():
+    disabled = GridCellIndex(enabled=False)
+    assert not disabled.add(PointResolution(forecast=FORECAST_URL), CELL)
+    assert disabled.lookup(34.05, -118.245) is None
+
+    index = GridCellIndex(max_cells=1)
+    index.add(PointResolution(forecast=FORECAST_URL), CELL)
+    shifted = {
+        "type": "Polygon",
+        "coordinates": [[[x + 1.0, y] for x, y in CELL["coordinates"][0]]],
+    }
+    index.add(PointResolution(forecast="next"), shifted)
+    assert len(index) == 1
+    assert index.lookup(34.05, -118.245) is None
+    assert index.lookup(34.05, -117.245).forecast == "next"
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("WEATHER_GRID_INDEX", "0")
+    monkeypatch.setenv("WEATHER_GRID_INDEX_MARGIN", "300")
+    index = GridCellIndex.from_env()
+    assert not index.enabled
+    assert index.margin == 300.0
+
+
+@pytest.mark.asyncio
+async def test_nearby_coordinates_skip_points_call(monkeypatch):
+    calls = []
+
+    async def fake_make_request(self, url):
+        calls.append(url)
+        if "/points/" in url:
+            return POINTS_RESPONSE
+        return FORECAST_RESPONSE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    await get_forecast_data(34.05, -118.25)
+    await get_forecast_data(34.051, -118.245)
+    await get_forecast_data(34.0405, -118.245)
+    points_calls = [url for url in calls if "/points/" in url]
+    # The second point is inside the learned cell; the third is near its edge
+    assert points_calls == [
+        "https://api.weather.gov/points/34.05,-118.25",
+        "https://api.weather.gov/points/34.0405,-118.245",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_forecast_error_forgets_cell(monkeypatch):
+    fail = False
+
+    async def fake_make_request(self, url):
+        if "/points/" in url:
+            return POINTS_RESPONSE
+        if fail:
+            request = httpx.Request("GET", url)
+            raise httpx.HTTPStatusError(
+                "gone", request=request, response=httpx.Response(404, request=request)
+            )
+        return FORECAST_RESPONSE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    client = NWSClient()
+    await get_forecast_data(34.05, -118.25, client=client)
+    assert len(client.grid_index) == 1
+    fail = True
+    with pytest.raises(httpx.HTTPStatusError):
+        await get_forecast_data(34.051, -118.245, client=client)
+    assert len(client.grid_index) == 0
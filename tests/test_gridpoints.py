@@ -0,0 +1,195 @@
+"""
+Tests for raw gridpoint decoding and the get_gridpoint_extremes tool.
+"""
+
+import json
+import time
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from src.weather.gridpoints import (
+    Gridpoint,
+    GridpointCache,
+    TimeSeries,
+    layer_extremes,
+    parse_duration,
+    parse_valid_time,
+    unit_label,
+)
+from src.weather.nws_client import NWSClient
+from src.weather.server import get_gridpoint_extremes
+
+GRID_URL = "https://api.weather.gov/gridpoints/LOX/154,44"
+POINTS_RESPONSE = {
+    "properties": {
+        "forecast": f"{GRID_URL}/forecast",
+        "forecastGridData": GRID_URL,
+    }
+}
+T0 = int(datetime(2024, 1, 1, 12, tzinfo=UTC).timestamp())
+
+
+def iso(epoch):
+    return datetime.fromtimestamp(epoch, UTC).isoformat()
+
+
+def make_payload(start, update_time="2024-01-01T11:00:00+00:00"):
+    return {
+        "properties": {
+            "updateTime": update_time,
+            "elevation": {"unitCode": "wmoUnit:m", "value": 16},
+            "windGust": {
+                "uom": "wmoUnit:km_h-1",
+                "values": [
+                    # Out of order on purpose; decoding sorts by start
+                    {"validTime": f"{iso(start + 3 * 3600)}/PT2H", "value": 55.6},
+                    {"validTime": f"{iso(start)}/PT3H", "value": 20.4},
+                    {"validTime": f"{iso(start + 5 * 3600)}/P1D", "value": None},
+                ],
+            },
+            "quantitativePrecipitation": {
+                "uom": "wmoUnit:mm",
+                "values": [{"validTime": f"{iso(start)}/PT6H", "value": 12.0}],
+            },
+            "weather": {"values": [{"validTime": f"{iso(start)}/PT1H", "value": []}]},
+        }
+    }
+
+
+def test_parse_durations_and_intervals():
+    assert parse_duration("PT1H") == 3600
+    assert parse_duration("P1DT6H") == 30 * 3600
+    assert parse_duration("PT30M") == 1800
+    with pytest.raises(ValueError):
+        parse_duration("P")
+    with pytest.raises(ValueError):
+        parse_duration("3H")
+    assert parse_valid_time("2024-01-01T12:00:00+00:00/PT3H") == (T0, 3 * 3600)
+    assert unit_label("wmoUnit:km_h-1") == "km/h"
+    assert unit_label("wmoUnit:unknown") == "unknown"
+
+
+def test_decode_layers_into_sorted_arrays():
+    gridpoint = Gridpoint.from_payload(make_payload(T0))
+    assert set(gridpoint.layers) == {"windGust", "quantitativePrecipitation"}
+    gust = gridpoint.layers["windGust"]
+    assert gust.origin == T0
+    assert gust.offsets.tolist() == [0, 3 * 3600, 5 * 3600]
+    assert gust.durations.tolist() == [3 * 3600, 2 * 3600, 86400]
+    assert gust.values.dtype == np.float32
+    assert np.isnan(gust.values[2])
+    assert gust.unit == "km/h"
+    with pytest.raises(ValueError):
+        Gridpoint.from_payload({"type": "Feature"})
+    with pytest.raises(ValueError):
+        TimeSeries.from_layer({"values": [{"validTime": "nope"}]})
+
+
+def test_hourly_resampling_and_accumulations():
+    gridpoint = Gridpoint.from_payload(make_payload(T0))
+    gust = gridpoint.layers["windGust"].hourly(T0 - 3600, 7)
+    assert np.isnan(gust[0]) and np.isnan(gust[6])
+    assert gust[1:6] == pytest.approx([20.4, 20.4, 20.4, 55.6, 55.6], abs=1e-4)
+    rain = gridpoint.layers["quantitativePrecipitation"].hourly(T0, 8)
+    assert rain[:6].tolist() == [2.0] * 6
+    assert np.isnan(rain[6:]).all()
+    assert TimeSeries.from_layer({"values": []}).hourly(T0, 2).shape == (2,)
+
+
+def test_layer_extremes():
+    gridpoint = Gridpoint.from_payload(make_payload(T0))
+    extremes = layer_extremes(gridpoint.layers["windGust"], T0, 48)
+    assert extremes == {
+        "max": 55.6,
+        "max_time": "2024-01-01T15:00:00+00:00",
+        "min": 20.4,
+        "mean": 34.5,
+    }
+    rain = layer_extremes(gridpoint.layers["quantitativePrecipitation"], T0, 48)
+    assert rain["total"] == 12.0
+    assert layer_extremes(gridpoint.layers["windGust"], T0 + 86400 * 3, 4) == {
+        "max": None,
+        "max_time": None,
+        "min": None,
+        "mean": None,
+    }
+
+
+def test_cache_reuses_decoding_until_update_time_changes():
+    cache = GridpointCache(max_entries=1)
+    first = cache.decode(GRID_URL, make_payload(T0))
+    assert cache.decode(GRID_URL, make_payload(T0)) is first
+    newer = cache.decode(GRID_URL, make_payload(T0, "2024-01-01T12:00:00+00:00"))
+    assert newer is not first
+    cache.decode("other", make_payload(T0))
+    assert len(cache) == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 3}
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_extremes_tool(monkeypatch):
+    calls = []
+    start = int(time.time()) // 3600 * 3600
+
+    async def fake_make_request(self, url):
+        calls.append(url)
+        if "/points/" in url:
+            return POINTS_RESPONSE
+        return make_payload(start)
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    text = await get_gridpoint_extremes(34.05, -118.25)
+    assert text.startswith("windGust over the next 48 hours: max 55.6 km/h at ")
+    assert calls[-1] == GRID_URL
+    data = json.loads(
+        await get_gridpoint_extremes(
+            34.05, -118.25, "quantitativePrecipitation", 6, "json"
+        )
+    )
+    assert data["total"] == 12.0 and data["unit"] == "mm"
+    # Decoded once; the second call reused it
+    assert NWSClient().gridpoint_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_extremes_errors(monkeypatch):
+    async def fake_make_request(self, url):
+        if "/points/" in url:
+            return {"properties": {"forecast": f"{GRID_URL}/forecast"}}
+        raise AssertionError("no gridpoint request expected")
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    assert "Invalid coordinates" in await get_gridpoint_extremes(91, 0)
+    assert "Invalid hours" in await get_gridpoint_extremes(34, -118, hours=0)
+    assert "Invalid hours" in await get_gridpoint_extremes(34, -118, hours=200)
+    assert "Invalid response_format" in await get_gridpoint_extremes(
+        34, -118, response_format="xml"
+    )
+    # The point resolved without a gridpoint URL or grid identifiers
+    assert "Malformed response" in await get_gridpoint_extremes(34.05, -118.25)
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_extremes_unknown_layer(monkeypatch):
+    async def fake_make_request(self, url):
+        if "/points/" in url:
+            return {
+                "properties": {
+                    "forecast": f"{GRID_URL}/forecast",
+                    "gridId": "LOX",
+                    "gridX": 154,
+                    "gridY": 44,
+                }
+            }
+        assert url == GRID_URL
+        return make_payload(T0)
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    result = await get_gridpoint_extremes(34.05, -118.25, "snowLevel")
+    assert result == (
+        "Unknown layer: snowLevel. "
+        "Available layers: quantitativePrecipitation, windGust."
+    )
+    assert "No windGust data" in await get_gridpoint_extremes(34.05, -118.25)
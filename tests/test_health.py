@@ -0,0 +1,104 @@
+"""
+Tests for the liveness and readiness routes.
+"""
+
+import asyncio
+
+import pytest
+
+from src.weather import alerts_index
+from src.weather.alerts_index import AlertsSnapshot
+from src.weather.circuit_breaker import get_shared_breakers
+from src.weather.health import (
+    LoopLagMonitor,
+    ReadinessConfig,
+    get_shared_loop_monitor,
+    readiness,
+)
+from src.weather.metrics import get_shared_metrics
+
+GRIDPOINTS = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+
+
+def test_ready_when_nothing_is_degraded():
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig())
+    assert ready
+    assert report["status"] == "ready"
+    assert report["checks"]["caches"] == {
+        "ok": True,
+        "warm": False,
+        "response_entries": 0,
+        "points_entries": 0,
+        "alerts_snapshot": "disabled",
+    }
+
+
+def test_open_circuit_makes_replica_not_ready():
+    breaker = get_shared_breakers().for_url(GRIDPOINTS)
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig())
+    assert not ready
+    upstream = report["checks"]["upstream"]
+    assert upstream["ok"] is False
+    assert upstream["endpoints"]["gridpoints"] == {
+        "state": "open",
+        "recent_calls": breaker.min_calls,
+        "recent_failures": breaker.min_calls,
+    }
+
+
+def test_loop_lag_load_and_cold_snapshot_thresholds(monkeypatch):
+    monitor = LoopLagMonitor()
+    monitor.record(2.0)
+    ready, report = readiness(monitor, ReadinessConfig(max_loop_lag=0.5))
+    assert not ready and report["checks"]["event_loop"]["ok"] is False
+
+    get_shared_metrics().tools_in_flight["get_forecast"] = 3
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig(max_in_flight=2))
+    assert not ready and report["checks"]["load"]["tool_calls_in_flight"] == 3
+
+    get_shared_metrics().tools_in_flight.clear()
+    monkeypatch.setattr(
+        alerts_index, "_shared_alerts_snapshot", AlertsSnapshot(enabled=True)
+    )
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig())
+    assert not ready and report["checks"]["caches"]["alerts_snapshot"] == "cold"
+
+
+def test_readiness_config_from_env(monkeypatch):
+    monkeypatch.setenv("WEATHER_READY_MAX_LOOP_LAG", "1.5")
+    monkeypatch.setenv("WEATHER_READY_MAX_IN_FLIGHT", "10")
+    assert ReadinessConfig.from_env() == ReadinessConfig(1.5, 10)
+    monkeypatch.setenv("WEATHER_READY_REQUIRE_WARMUP", "true")
+    assert ReadinessConfig.from_env().require_warmup
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_samples_and_stops():
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    monitor.start()
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    assert monitor._task is not None
+    await monitor.stop()
+    assert monitor._task is None
+    assert monitor.samples > 0
+
+
+@pytest.mark.asyncio
+async def test_live_and_ready_routes(test_client):
+    response = await test_client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    response = await test_client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    breaker = get_shared_breakers().for_url(GRIDPOINTS)
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    response = await test_client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert get_shared_loop_monitor().samples == 0
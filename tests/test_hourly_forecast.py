@@ -0,0 +1,167 @@
+"""
+Tests for hourly forecast summaries and the get_hourly_forecast tool.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.weather.hourly import (
+    HourlySeries,
+    crossings,
+    daily_stats,
+    summarize,
+    wind_speed_value,
+)
+from src.weather.models import ForecastPeriod
+from src.weather.nws_client import NWSClient
+from src.weather.server import fetch_forecast_periods, get_hourly_forecast
+
+HOURLY_URL = "https://api.weather.gov/gridpoints/LOX/154,44/forecast/hourly"
+POINTS_RESPONSE = {
+    "properties": {
+        "forecast": "https://api.weather.gov/gridpoints/LOX/154,44/forecast",
+        "forecastHourly": HOURLY_URL,
+    }
+}
+# Two-hourly steps from 20:00: two on the first local day, six on the next,
+# with the temperature dipping below freezing and recovering
+TEMPERATURES = [40, 38, 36, 35] + [34, 31, 30, 33]
+WINDS = ["5 mph", "10 mph", "10 to 30 mph", "15 mph"] * 2
+PRECIPITATION = [10, 20, 60, 70, None, 40, 40, 55]
+
+
+def make_period(hour, temperature, wind, precipitation):
+    day, clock = divmod(20 + hour * 2, 24)
+    return {
+        "number": hour + 1,
+        "name": "",
+        "startTime": f"2024-01-0{1 + day}T{clock:02d}:00:00-08:00",
+        "endTime": "",
+        "isDaytime": False,
+        "temperature": temperature,
+        "temperatureUnit": "F",
+        "probabilityOfPrecipitation": {
+            "unitCode": "wmoUnit:percent",
+            "value": precipitation,
+        },
+        "windSpeed": wind,
+        "windDirection": "W",
+        "shortForecast": "Clear",
+        "detailedForecast": "",
+    }
+
+
+RAW_PERIODS = [
+    make_period(hour, *values)
+    for hour, values in enumerate(zip(TEMPERATURES, WINDS, PRECIPITATION))
+]
+PERIODS = [ForecastPeriod.from_api(period) for period in RAW_PERIODS]
+
+
+def test_wind_speed_value_takes_highest_number():
+    assert wind_speed_value("10 to 15 mph") == 15.0
+    assert wind_speed_value("7 mph") == 7.0
+    assert np.isnan(wind_speed_value(""))
+
+
+def test_precipitation_probability_round_trips():
+    assert PERIODS[0].precipitation_probability == 10
+    assert PERIODS[4].precipitation_probability is None
+    restored = ForecastPeriod.from_api(PERIODS[0].to_api())
+    assert restored == PERIODS[0]
+
+
+def test_series_and_daily_stats():
+    series = HourlySeries.from_periods(PERIODS)
+    assert series.dates == ("2024-01-01", "2024-01-02")
+    assert series.days.tolist() == [0, 0, 1, 1, 1, 1, 1, 1]
+    temperature = daily_stats(series, series.temperature)
+    assert temperature["min"].tolist() == [38.0, 30.0]
+    assert temperature["max"].tolist() == [40.0, 36.0]
+    assert temperature["mean"][1] == pytest.approx(33.1667, abs=1e-3)
+    # The missing precipitation value is ignored, not counted as zero
+    precipitation = daily_stats(series, series.precipitation)
+    assert precipitation["min"].tolist() == [10.0, 40.0]
+
+
+def test_crossings_skip_missing_values():
+    values = np.array([10.0, 60.0, np.nan, 20.0, 20.0, 55.0])
+    assert crossings(values, 50.0) == [(1, True), (5, True)]
+
+
+def test_summarize_reports_days_and_crossings():
+    summary = summarize(PERIODS)
+    assert summary["hours"] == 8
+    assert summary["units"] == {"temperature": "F", "wind": "mph"}
+    assert summary["days"][0] == {
+        "date": "2024-01-01",
+        "temperature": {"min": 38.0, "max": 40.0, "mean": 39.0},
+        "wind": {"max": 10.0, "mean": 7.5},
+        "precipitation_max": 20.0,
+    }
+    found = [(c["measure"], c["direction"]) for c in summary["crossings"]]
+    assert found == [
+        ("precipitation", "above"),
+        ("wind", "above"),
+        ("wind", "below"),
+        ("temperature", "below"),
+        ("wind", "above"),
+        ("precipitation", "above"),
+        ("temperature", "above"),
+        ("wind", "below"),
+    ]
+    custom = summarize(PERIODS, temperature_threshold=35, wind_threshold=50)
+    assert [c["measure"] for c in custom["crossings"]] == [
+        "precipitation",
+        "temperature",
+        "precipitation",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_forecast_uses_hourly_url(monkeypatch):
+    calls = []
+
+    async def fake_make_request(self, url):
+        calls.append(url)
+        if "/points/" in url:
+            return POINTS_RESPONSE
+        return {"properties": {"periods": RAW_PERIODS}}
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    text = await get_hourly_forecast(34.05, -118.25)
+    assert calls[-1] == HOURLY_URL
+    assert text.startswith("Hourly forecast: 8 hours from 2024-01-01T20:00:00")
+    assert "2024-01-02: 30 to 36°F (mean 33.2°F)" in text
+    assert "temperature drops below 32°F" in text
+    data = json.loads(await get_hourly_forecast(34.05, -118.25, "json"))
+    assert len(data["days"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_forecast_errors(monkeypatch):
+    async def fake_make_request(self, url):
+        if "/points/" in url:
+            return {"properties": {"forecast": "https://example.com/forecast"}}
+        raise AssertionError("no forecast request expected")
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    assert "Invalid coordinates" in await get_hourly_forecast(91, 0)
+    assert "Invalid threshold" in await get_hourly_forecast(34, -118, "text", "x")
+    assert "Invalid response_format" in await get_hourly_forecast(34, -118, "xml")
+    # The point resolved without an hourly forecast URL
+    assert "Malformed response" in await get_hourly_forecast(34.05, -118.25)
+
+
+@pytest.mark.asyncio
+async def test_missing_forecast_url_names_the_missing_key(monkeypatch):
+    async def fake_make_request(self, url):
+        return {"properties": {"forecast": None, "forecastHourly": None}}
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    with pytest.raises(ValueError, match="missing 'forecast'"):
+        await fetch_forecast_periods(34.05, -118.25)
+    with pytest.raises(ValueError, match="missing 'forecastHourly'"):
+        await fetch_forecast_periods(34.05, -118.25, hourly=True)
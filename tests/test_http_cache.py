@@ -0,0 +1,141 @@
+"""
+Tests for the HTTP-semantics response cache.
+"""
+
+import httpx
+import pytest
+
+from src.weather.http_cache import (
+    ResponseCache,
+    freshness_lifetime,
+    parse_cache_control,
+)
+from src.weather.nws_client import NWSClient
+
+URL = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+
+
+class FakePool:
+    """Pool stand-in that replays queued responses and records request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    async def get(self, url, headers=None):
+        self.sent_headers.append(headers)
+        status, response_headers, body = self.responses.pop(0)
+        return httpx.Response(
+            status,
+            headers=response_headers,
+            json=body,
+            request=httpx.Request("GET", url),
+        )
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('public, max-age=300, s-maxage="60"') == {
+        "public": None,
+        "max-age": "300",
+        "s-maxage": "60",
+    }
+    assert parse_cache_control(None) == {}
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"cache-control": "max-age=300"}, 300.0),
+        ({"cache-control": "max-age=300, s-maxage=60"}, 60.0),
+        ({"cache-control": "max-age=300", "age": "100"}, 200.0),
+        ({"cache-control": "s-maxage, max-age=300"}, 300.0),
+        ({"cache-control": "s-maxage=soon, max-age=300"}, 300.0),
+        ({"cache-control": "max-age"}, 0.0),
+        ({"cache-control": "no-cache, max-age=300"}, 0.0),
+        ({"cache-control": "no-store"}, None),
+        ({"cache-control": "private, max-age=300"}, None),
+        (
+            {
+                "date": "Mon, 01 Jan 2024 12:00:00 GMT",
+                "expires": "Mon, 01 Jan 2024 12:05:00 GMT",
+            },
+            300.0,
+        ),
+        ({}, 0.0),
+    ],
+)
+def test_freshness_lifetime(headers, expected):
+    assert freshness_lifetime(headers, now=0.0) == expected
+
+
+def test_store_skips_uncacheable_responses():
+    cache = ResponseCache()
+    assert cache.store(URL, {}, {"a": 1}) is None
+    assert cache.store(URL, {"cache-control": "no-store"}, {"a": 1}) is None
+    assert cache.store(URL, {"etag": '"v1"'}, {"a": 1}) is not None
+    assert len(cache) == 1
+
+
+def test_memory_is_bounded_by_bytes_and_one_off_fetches_are_not_admitted():
+    cache = ResponseCache(max_bytes=10_000)
+    headers = {"cache-control": "max-age=60"}
+    for _ in range(3):
+        cache.record_access("hot")
+    cache.store("hot", headers, 1, size=3000)
+    cache.record_access("nationwide")
+    # The payload is still returned to the caller, just not kept in memory
+    assert cache.store("nationwide", headers, 2, size=9000).payload == 2
+    cache.record_access("other")
+    cache.store("other", headers, 3, size=3000)
+    assert cache.get("nationwide") is None
+    assert cache.get("hot").payload == 1 and cache.get("other").payload == 3
+    stats = cache.stats()
+    assert stats["bytes"] == 6000 and stats["max_bytes"] == 10_000
+    assert stats["evictions"] == 1 and stats["rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_upstream_call():
+    pool = FakePool((200, {"cache-control": "max-age=60"}, {"features": []}))
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    first = await client._make_request(URL)
+    second = await client._make_request(URL)
+    assert first is second
+    assert len(pool.sent_headers) == 1
+    assert client.response_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_and_304_reuses_payload():
+    pool = FakePool(
+        (
+            200,
+            {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 12:00:00 GMT"},
+            {"features": [1]},
+        ),
+        (304, {"cache-control": "max-age=60"}, None),
+    )
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    first = await client._make_request(URL)
+    second = await client._make_request(URL)
+    assert first is second
+    assert pool.sent_headers[0] is None
+    assert pool.sent_headers[1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT",
+    }
+    assert client.response_cache.stats()["revalidations"] == 1
+    assert client.response_cache.get(URL).is_fresh()
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_replaces_entry():
+    pool = FakePool(
+        (200, {"etag": '"v1"'}, {"features": [1]}),
+        (200, {"etag": '"v2"'}, {"features": [2]}),
+    )
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    await client._make_request(URL)
+    second = await client._make_request(URL)
+    assert second == {"features": [2]}
+    assert client.response_cache.get(URL).etag == '"v2"'
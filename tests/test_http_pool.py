@@ -0,0 +1,137 @@
+"""
+Tests for the shared upstream connection pool.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.weather import http_pool
+from src.weather.http_pool import PoolConfig, UpstreamPool
+from src.weather.nws_client import NWSClient
+from src.weather.server import WeatherMCP, server_lifespan
+
+
+def test_pool_config_from_env(monkeypatch):
+    monkeypatch.setenv("WEATHER_HTTP_MAX_CONNECTIONS", "50")
+    monkeypatch.setenv("WEATHER_HTTP_TIMEOUT_POINTS", "2.5")
+    monkeypatch.setenv("WEATHER_USER_AGENT", "test-agent")
+    config = PoolConfig.from_env()
+    assert config.max_connections == 50
+    assert config.endpoint_timeouts["points"] == 2.5
+    assert config.endpoint_timeouts["alerts"] == 10.0
+    assert config.user_agent == "test-agent"
+
+
+def test_timeout_for_uses_endpoint_overrides():
+    pool = UpstreamPool(
+        PoolConfig(
+            connect_timeout=1.0,
+            default_timeout=7.0,
+            endpoint_timeouts={"points": 3.0},
+        )
+    )
+    points = pool.timeout_for("https://api.weather.gov/points/1,2")
+    other = pool.timeout_for("https://api.weather.gov/zones/forecast/CAZ006")
+    assert points.read == 3.0
+    assert points.connect == 1.0
+    assert other.read == 7.0
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_client_and_sets_headers(monkeypatch):
+    clients = []
+
+    async def dummy_get(self, url, headers=None, timeout=None):
+        clients.append(self)
+        return httpx.Response(200, json={"url": url}, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", dummy_get)
+    pool = UpstreamPool(PoolConfig(user_agent="ua-test"))
+    await pool.get("https://api.weather.gov/points/1,2")
+    await pool.get("https://api.weather.gov/alerts/active?area=CA")
+    assert clients[0] is clients[1]
+    assert clients[0].headers["User-Agent"] == "ua-test"
+    assert pool.stats()["requests_total"] == 2
+    assert pool.stats()["in_flight"] == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_nws_clients_share_the_pool(monkeypatch):
+    clients = []
+
+    async def dummy_get(self, url, headers=None, timeout=None):
+        clients.append(self)
+        return httpx.Response(200, json={"ok": True}, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", dummy_get)
+    pool = UpstreamPool(PoolConfig(prewarm_connections=0))
+    await NWSClient(pool=pool)._make_request("https://api.weather.gov/points/1,2")
+    await NWSClient(pool=pool)._make_request("https://api.weather.gov/points/3,4")
+    assert clients[0] is clients[1]
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_start_and_close_are_reference_counted(monkeypatch):
+    prewarmed = []
+
+    async def dummy_get(self, url, headers=None, timeout=None):
+        prewarmed.append(url)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", dummy_get)
+    pool = UpstreamPool(PoolConfig(prewarm_connections=2))
+    await pool.start()
+    await pool.start()
+    await asyncio.sleep(0.01)
+    client = pool.client
+    await pool.aclose()
+    assert not client.is_closed
+    await pool.aclose()
+    assert client.is_closed
+    assert prewarmed == ["https://api.weather.gov/", "https://api.weather.gov/"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_failures_are_swallowed(monkeypatch, caplog):
+    async def failing_get(self, url, headers=None, timeout=None):
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", failing_get)
+    pool = UpstreamPool(PoolConfig(prewarm_connections=1))
+    await pool.prewarm()
+    assert "pre-warm failed" in caplog.text
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_app_holds_the_pool_across_sessions(monkeypatch):
+    pool = UpstreamPool(PoolConfig(prewarm_connections=0))
+    monkeypatch.setattr(http_pool, "_shared_pool", pool)
+    server = WeatherMCP("test", lifespan=server_lifespan)
+    app = server.streamable_http_app()
+    async with app.router.lifespan_context(app):
+        client = pool.client
+        # Every stateless HTTP request runs a session lifespan
+        for _ in range(3):
+            async with server_lifespan(server):
+                assert pool.client is client
+        assert not client.is_closed
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_overlapping_sessions_share_the_pool(monkeypatch):
+    pool = UpstreamPool(PoolConfig(prewarm_connections=0))
+    monkeypatch.setattr(http_pool, "_shared_pool", pool)
+    first = server_lifespan(None)
+    await first.__aenter__()
+    client = pool.client
+    async with server_lifespan(None):
+        # The first session ends while the second is still open
+        await first.__aexit__(None, None, None)
+        assert not client.is_closed
+    assert client.is_closed
@@ -0,0 +1,210 @@
+"""
+Tests for incremental, field-selective parsing of alert payloads.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.weather.http_cache import ResponseCache
+from src.weather.http_pool import UpstreamPool
+from src.weather.json_stream import FeatureStreamParser, parse_feature_stream
+from src.weather.models import Alert
+from src.weather.nws_client import NWSClient
+from src.weather.rate_limit import AdaptiveRateLimiter, RetryPolicy
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_alerts_response.json"
+URL = "https://api.weather.gov/alerts/active?area=CA"
+
+
+def parse_in_chunks(text, size, transform=lambda item: item):
+    parser = FeatureStreamParser(transform)
+    for start in range(0, len(text), size):
+        parser.feed(text[start : start + size])
+    return parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1_000_000])
+def test_parser_matches_json_loads_for_any_chunking(size):
+    data = json.loads(FIXTURE.read_text())
+    data["features"] = data["features"] * 3
+    text = json.dumps(data, indent=2)
+    assert parse_in_chunks(text, size) == data
+
+
+def test_parser_builds_alerts_per_feature():
+    data = json.loads(FIXTURE.read_text())
+    parsed = parse_in_chunks(json.dumps(data), 13, Alert.from_feature)
+    assert parsed["title"] == data["title"]
+    assert parsed["features"] == [Alert.from_feature(f) for f in data["features"]]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("{}", {}),
+        ('{"features": []}', {"features": []}),
+        (
+            '{"a": 1, "features": [1, 2], "b": true}',
+            {"a": 1, "features": [1, 2], "b": True},
+        ),
+        ('{"features": [1, null, 3]}', {"features": [1, 3]}),
+    ],
+)
+def test_parser_edge_cases(text, expected):
+    # None results from the transform drop the element
+    assert parse_in_chunks(text, 1) == expected
+
+
+@pytest.mark.parametrize(
+    "number", ["7", "-12", "2.5", "-0.125", "1e3", "6.02E+23", "1.5e-7", "0"]
+)
+def test_numbers_split_at_any_offset(number):
+    text = f'{{"a": {number}, "features": [{number}, {number}], "b": {number}}}'
+    expected = json.loads(text)
+    start = 0
+    for _ in range(4):
+        start = text.index(number, start)
+        for offset in range(start + 1, start + len(number)):
+            parser = FeatureStreamParser(lambda item: item)
+            parser.feed(text[:offset])
+            parser.feed(text[offset:])
+            assert parser.close() == expected
+        start += len(number)
+
+
+def test_parser_tracks_strings_and_escapes_across_chunks():
+    data = {
+        "title": 'brackets } ] and "quotes" \\',
+        "features": [{"text": '\\"}{[', "nested": [[{}], "]"]}, "x\\"],
+    }
+    text = json.dumps(data)
+    for size in (1, 2, 3, 5):
+        assert parse_in_chunks(text, size) == data
+
+
+def test_spanning_feature_is_decoded_once():
+    feature = {"properties": {"values": list(range(2000))}}
+    text = json.dumps({"features": [feature, feature]})
+    parser = FeatureStreamParser(lambda item: item)
+    calls = []
+    raw_decode = parser._decoder.raw_decode
+
+    def counting_raw_decode(buffer, pos):
+        calls.append(pos)
+        return raw_decode(buffer, pos)
+
+    parser._decoder.raw_decode = counting_raw_decode
+    for start in range(0, len(text), 50):
+        parser.feed(text[start : start + 50])
+    assert parser.close() == {"features": [feature, feature]}
+    # One decode for the "features" key and one per feature
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[1, 2]",
+        '{"features": [1, 2',
+        '{"features": [1,}',
+        '{"a": 1} x',
+        '{"features": [{"a": "b]',
+        '{"features": [{"a": 1]}',
+    ],
+)
+def test_parser_rejects_malformed_documents(text):
+    with pytest.raises(ValueError):
+        parse_in_chunks(text, 3)
+
+
+@pytest.mark.asyncio
+async def test_parse_feature_stream_consumes_async_chunks():
+    async def chunks():
+        for piece in ('{"features": [{"id": ', '"a"}, {"id"', ': "b"}]}'):
+            yield piece
+
+    parsed = await parse_feature_stream(chunks(), lambda feature: feature["id"])
+    assert parsed == {"features": ["a", "b"]}
+
+
+def streaming_pool(handler):
+    pool = UpstreamPool(limiter=AdaptiveRateLimiter(), retry=RetryPolicy())
+    pool._build_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_client_streams_alert_bodies_and_revalidates():
+    body = FIXTURE.read_bytes()
+    seen_headers = []
+
+    async def chunked():
+        for start in range(0, len(body), 100):
+            yield body[start : start + 100]
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match"):
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            headers={"ETag": '"v1"', "Cache-Control": "no-cache"},
+            content=chunked(),
+        )
+
+    pool = streaming_pool(handler)
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    alerts = await client.get_alerts("CA")
+    expected = json.loads(body)["features"]
+    assert [a["event"] for a in alerts] == [f["properties"]["event"] for f in expected]
+    stored = client.response_cache.get(URL)
+    assert stored.size == len(body)
+    assert all(isinstance(a, Alert) for a in stored.payload["features"])
+
+    assert await client.get_alerts("CA") == alerts
+    assert seen_headers == [None, '"v1"']
+    assert client.response_cache.revalidations == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_streamed_entries_are_weighed_by_decoded_size():
+    body = FIXTURE.read_bytes()
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip", "Cache-Control": "max-age=60"},
+            content=gzip.compress(body),
+        )
+
+    pool = streaming_pool(handler)
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    await client.get_alerts("CA")
+    # The same weight a buffered response gets from len(response.content)
+    assert client.response_cache.get(URL).size == len(body)
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_stream_raises_on_error_status():
+    pool = streaming_pool(lambda request: httpx.Response(404, content=b"missing"))
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_alerts("CA")
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_stream_raises_value_error_on_invalid_json():
+    pool = streaming_pool(lambda request: httpx.Response(200, content=b"not json"))
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    with pytest.raises(ValueError):
+        await client.get_alerts("CA")
+    await pool.aclose()
@@ -0,0 +1,90 @@
+"""
+Tests for the stub NWS server and load-test harness in ``benchmarks/``.
+"""
+
+import gc
+
+import httpx
+import pytest
+
+from benchmarks.load_test import Workload, latency_summary, percentile, run_load_test
+from benchmarks.stub_nws import StubConfig, StubNWS
+from src.weather.http_cache import ResponseCache
+from src.weather.http_pool import UpstreamPool
+from src.weather.nws_client import NWSClient
+from src.weather.rate_limit import AdaptiveRateLimiter, RetryPolicy
+from src.weather.server import get_forecast_data
+
+
+def stub_pool(stub):
+    return UpstreamPool(
+        limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+        retry=RetryPolicy(base_delay=0.0),
+        transport=httpx.ASGITransport(app=stub.app),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stub_serves_points_forecast_and_alerts():
+    stub = StubNWS(StubConfig(latency=0.0, alerts_per_state=3))
+    pool = stub_pool(stub)
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
+    periods = await get_forecast_data(38.9, -77.03, client=client)
+    assert len(periods) == stub.config.forecast_periods
+    alerts = await client.get_alerts("TX")
+    assert len(alerts) == 3
+    assert all(alert.states == {"TX"} for alert in alerts)
+    assert stub.calls == {"points": 1, "gridpoints": 1, "alerts": 1}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stub_revalidates_and_injects_errors():
+    stub = StubNWS(StubConfig(latency=0.0, error_rate=1.0))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=stub.app), base_url="http://stub"
+    ) as http:
+        response = await http.get("/alerts/active?area=CA")
+        assert response.status_code in (500, 503)
+        stub.config.error_rate = 0.0
+        response = await http.get("/alerts/active?area=CA")
+        etag = response.headers["etag"]
+        response = await http.get(
+            "/alerts/active?area=CA", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+    assert stub.statuses[304] == 1 and stub.statuses[200] == 1
+
+
+def test_percentiles_and_workload_are_deterministic():
+    values = sorted(float(v) for v in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+    assert latency_summary([0.001, 0.002])["max"] == 2.0
+    workload = Workload(locations=5)
+    assert workload.calls(1, 10) == workload.calls(1, 10)
+    assert {tool for tool, _ in workload.calls(2, 50)} == {
+        "get_forecast",
+        "get_alerts",
+    }
+
+
+# The MCP client library leaves some internal memory streams unclosed
+@pytest.mark.filterwarnings("ignore::ResourceWarning")
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+@pytest.mark.asyncio
+async def test_load_test_end_to_end():
+    report = await run_load_test(
+        clients=3,
+        calls_per_client=4,
+        stub_config=StubConfig(latency=0.0),
+        workload=Workload(locations=4),
+        nws_rate=1000,
+    )
+    results = report["results"]
+    assert results["tool_calls"] == 12
+    assert results["outcomes"] == {"ok": 12}
+    assert results["upstream"]["calls"] >= 1
+    assert set(results["latency_ms"]) == {"p50", "p95", "p99", "max", "mean"}
+    gc.collect()
@@ -0,0 +1,105 @@
+"""
+Tests for the Prometheus metrics registry and the /metrics route.
+"""
+
+import httpx
+import pytest
+
+from src.weather.http_pool import PoolConfig, UpstreamPool
+from src.weather.metrics import (
+    Histogram,
+    Metrics,
+    get_shared_metrics,
+    instrument_tool,
+    render_families,
+)
+from src.weather.nws_client import NWSClient
+from src.weather.rate_limit import AdaptiveRateLimiter, RetryPolicy
+from src.weather.server import get_alerts, mcp
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4 and histogram.sum == pytest.approx(3.65)
+
+
+def test_exposition_format_escapes_labels():
+    text = render_families(
+        [("x_total", "counter", "Help.", [("", (("k", 'a"b\\c\n'),), 2)])]
+    )
+    assert text == (
+        "# HELP x_total Help.\n# TYPE x_total counter\n"
+        'x_total{k="a\\"b\\\\c\\n"} 2\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tools_record_outcomes_and_keep_schema():
+    metrics = Metrics()
+
+    async def tool(state: str) -> str:
+        if state == "boom":
+            raise RuntimeError(state)
+        return state
+
+    wrapped = instrument_tool("tool", tool, metrics=metrics)
+    assert await wrapped("CA") == "CA"
+    with pytest.raises(RuntimeError):
+        await wrapped("boom")
+    assert metrics.tool_calls == {("tool", "ok"): 1, ("tool", "exception"): 1}
+    assert metrics.tools_in_flight["tool"] == 0
+    assert metrics.tool_latency["tool"].count == 2
+    # FastMCP derives the tool schema through the wrapper
+    schema = mcp._tool_manager.get_tool("get_alerts").parameters
+    assert set(schema["properties"]) == {"state", "response_format"}
+
+
+@pytest.mark.asyncio
+async def test_pool_records_status_latency_and_retries(monkeypatch):
+    statuses = [503, 200]
+
+    async def fake_get(self, url, headers=None, timeout=None):
+        return httpx.Response(
+            statuses.pop(0),
+            headers={"Retry-After": "0"},
+            request=httpx.Request("GET", url),
+        )
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
+    metrics = Metrics()
+    pool = UpstreamPool(
+        PoolConfig(prewarm_connections=0),
+        limiter=AdaptiveRateLimiter(rate=1000.0, burst=100),
+        retry=RetryPolicy(base_delay=0.0),
+        metrics=metrics,
+    )
+    await pool.get("https://api.weather.gov/points/1,2")
+    assert metrics.upstream_responses == {("points", "503"): 1, ("points", "200"): 1}
+    assert metrics.upstream_retries == {"points": 1}
+    assert metrics.upstream_latency["points"].count == 2
+    assert metrics.upstream_in_flight["points"] == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_exposes_tool_cache_and_pool_metrics(
+    monkeypatch, test_client
+):
+    async def fake_make_request(self, url):
+        return {"features": []}
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    await get_alerts("CA")
+    await get_alerts("ZZ")
+    response = await test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'weather_tool_calls_total{tool="get_alerts",outcome="ok"} 2' in text
+    assert 'weather_tool_duration_seconds_count{tool="get_alerts"} 2' in text
+    assert "# TYPE weather_cache_hit_ratio gauge" in text
+    assert 'weather_upstream_connections{state="open"}' in text
+    assert get_shared_metrics().tools_in_flight["get_alerts"] == 0
@@ -0,0 +1,51 @@
+"""
+Tests for the micro-benchmark runner and regression check in ``benchmarks/``.
+"""
+
+import json
+
+from benchmarks.bench_micro import (
+    BASELINE,
+    build_benchmarks,
+    compare,
+    run,
+    synthetic_alerts,
+)
+
+
+def tiny_payloads():
+    return {
+        name: json.dumps(synthetic_alerts(["CA", "TX"], 2, 100, 4)).encode()
+        for name in ("small_state", "large_state", "nationwide")
+    }
+
+
+def test_benchmarks_run_and_produce_results():
+    benchmarks = build_benchmarks(tiny_payloads())
+    for fn in benchmarks.values():
+        fn()
+    results = run(tiny_payloads(), min_time=0.0, repeat=1, only="validate", rounds=1)
+    assert set(results["benchmarks"]) == {
+        "validate_state[x10]",
+        "validate_coordinates[x5]",
+    }
+    assert results["calibration_us"] > 0
+    assert all(r["normalized"] > 0 for r in results["benchmarks"].values())
+
+
+def test_compare_reports_only_slowdowns_beyond_tolerance():
+    baseline = {"benchmarks": {"a": {"normalized": 1.0}, "b": {"normalized": 2.0}}}
+    current = {
+        "benchmarks": {
+            "a": {"normalized": 1.2},
+            "b": {"normalized": 3.2},
+            "new": {"normalized": 9.0},
+        }
+    }
+    assert compare(current, baseline, tolerance=0.25) == [("b", 1.6)]
+    assert compare(current, baseline, tolerance=1.0) == []
+
+
+def test_committed_baseline_covers_every_benchmark():
+    baseline = json.loads(BASELINE.read_text())
+    assert set(baseline["benchmarks"]) == set(build_benchmarks(tiny_payloads()))
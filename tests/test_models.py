@@ -0,0 +1,106 @@
+"""
+Tests for the typed alert and forecast period models.
+"""
+
+import dataclasses
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.weather.http_cache import ResponseCache
+from src.weather.models import Alert, ForecastPeriod, parse_forecast_payload
+from src.weather.nws_client import NWSClient, is_forecast_url
+from src.weather.server import format_alert, format_forecast
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FORECAST_URL = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+
+
+def load(name):
+    return json.loads((FIXTURES / name).read_text())
+
+
+def test_alert_from_feature():
+    feature = load("sample_alerts_response.json")["features"][0]
+    alert = Alert.from_feature(feature)
+    assert alert.event == "Small Craft Advisory"
+    assert alert.area_desc == "San Francisco, CA"
+    assert alert.zones == ("CAC075", "CAC081")
+    assert alert.states == {"CA"}
+    assert alert["areaDesc"] == alert.area_desc
+    assert Alert.coerce(alert) is alert
+    with pytest.raises(KeyError):
+        alert["geometry"]
+
+
+def test_models_are_slotted_and_frozen():
+    alert = Alert.from_feature({"properties": {"event": "Flood"}})
+    assert not hasattr(alert, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        alert.event = "Storm"
+    assert alert.headline is None and alert.zones == ()
+
+
+def test_forecast_period_from_api():
+    raw = load("sample_forecast_response.json")["properties"]["periods"][0]
+    period = ForecastPeriod.from_api(raw)
+    assert period.name == raw["name"]
+    assert period["temperatureUnit"] == raw["temperatureUnit"]
+    assert period.is_daytime == raw["isDaytime"]
+    assert not hasattr(period, "__dict__")
+
+
+def test_forecast_period_rejects_incomplete_periods():
+    with pytest.raises(ValueError, match="temperature"):
+        ForecastPeriod.from_api({"name": "Tonight"})
+    with pytest.raises(ValueError):
+        ForecastPeriod.from_api("Tonight")
+
+
+def test_parse_forecast_payload_types_periods_and_leaves_bad_payloads():
+    payload = load("sample_forecast_response.json")
+    parsed = parse_forecast_payload(payload)
+    assert all(isinstance(p, ForecastPeriod) for p in parsed["properties"]["periods"])
+    assert isinstance(payload["properties"]["periods"][0], dict)
+    bad = {"properties": {"periods": [{"name": "Tonight"}]}}
+    assert parse_forecast_payload(bad) is bad
+    assert parse_forecast_payload(None) is None
+
+
+def test_is_forecast_url():
+    assert is_forecast_url(FORECAST_URL)
+    assert is_forecast_url(FORECAST_URL + "/hourly")
+    assert not is_forecast_url("https://api.weather.gov/gridpoints/LWX/96,70")
+    assert not is_forecast_url("https://api.weather.gov/points/1,2")
+
+
+@pytest.mark.asyncio
+async def test_forecast_periods_are_typed_once_and_cached():
+    body = load("sample_forecast_response.json")
+
+    class FakePool:
+        async def get(self, url, headers=None):
+            return httpx.Response(
+                200,
+                headers={"Cache-Control": "max-age=60"},
+                json=body,
+                request=httpx.Request("GET", url),
+            )
+
+    client = NWSClient(pool=FakePool(), response_cache=ResponseCache())
+    first = await client._make_request(FORECAST_URL)
+    second = await client._make_request(FORECAST_URL)
+    assert first is second
+    assert isinstance(first["properties"]["periods"][0], ForecastPeriod)
+
+
+def test_formatters_accept_models():
+    alert = Alert.from_feature({"properties": {"event": "Flood"}})
+    text = format_alert(alert)
+    assert "Event: Flood" in text
+    assert "No headline available" in text
+    raw = load("sample_forecast_response.json")["properties"]["periods"]
+    text = format_forecast([ForecastPeriod.from_api(p) for p in raw])
+    assert raw[0]["detailedForecast"] in text
@@ -0,0 +1,101 @@
+"""
+Tests for fetching alerts for several states with one upstream request.
+"""
+
+import json
+
+import pytest
+
+from src.weather import alerts_index
+from src.weather.alerts_index import AlertsIndex, AlertsSnapshot
+from src.weather.nws_client import NWSClient
+from src.weather.server import get_alerts, get_alerts_data, mcp
+
+
+def make_feature(event, ugc):
+    return {
+        "properties": {
+            "headline": f"{event} headline",
+            "event": event,
+            "severity": "Severe",
+            "geocode": {"UGC": ugc},
+        }
+    }
+
+
+GULF = {
+    "features": [
+        make_feature("Flood Warning", ["TXC201"]),
+        make_feature("Heat Advisory", ["LAZ040", "MSZ080"]),
+        make_feature("Rip Current Statement", ["GMZ455"]),
+    ]
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    urls = []
+
+    async def fake_make_request(self, url):
+        urls.append(url)
+        return GULF
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    return urls
+
+
+@pytest.mark.asyncio
+async def test_one_combined_request_split_by_ugc_state(upstream):
+    by_state = await get_alerts_data(["TX", "MS", "LA", "AL", "TX"])
+    assert upstream == ["https://api.weather.gov/alerts/active?area=AL,LA,MS,TX"]
+    assert list(by_state) == ["TX", "MS", "LA", "AL"]
+    assert [a.event for a in by_state["TX"]] == ["Flood Warning"]
+    # An alert covering two requested states is listed under both
+    assert by_state["LA"] == by_state["MS"] == [by_state["LA"][0]]
+    assert by_state["AL"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_renders_sections_per_state(upstream):
+    text = await get_alerts(["TX", "AL"])
+    tx, al = text.split("\n===\n")
+    assert tx.startswith("Alerts for TX:\n") and "Flood Warning" in tx
+    assert al == "Alerts for AL:\nNo active alerts for state: AL"
+
+    data = json.loads(await get_alerts(["LA", "TX"], response_format="json"))
+    assert list(data["states"]) == ["LA", "TX"]
+    assert data["states"]["LA"]["alerts"][0]["event"] == "Heat Advisory"
+    assert len(upstream) == 2
+    # The single-state form is unchanged
+    assert "Alerts for" not in await get_alerts("TX")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("states", [[], ["TX", "ZZ"], ["tx"], ["TX", None]])
+async def test_invalid_state_lists_are_rejected(upstream, states):
+    assert "Invalid state code" in await get_alerts(states)
+    assert upstream == []
+
+
+@pytest.mark.asyncio
+async def test_state_lists_use_the_snapshot_and_report_failures(monkeypatch):
+    snapshot = AlertsSnapshot(enabled=True)
+    snapshot.index = AlertsIndex.build(GULF)
+    monkeypatch.setattr(alerts_index, "_shared_alerts_snapshot", snapshot)
+    by_state = await get_alerts_data(["MS", "TX"])
+    assert [a.event for a in by_state["MS"]] == ["Heat Advisory"]
+
+    async def malformed(self, url):
+        return {"features": "nope"}
+
+    snapshot.enabled = False
+    monkeypatch.setattr(NWSClient, "_make_request", malformed)
+    assert await get_alerts_data(["MS", "TX"]) is None
+    assert "Malformed response" in await get_alerts(["MS", "TX"])
+
+
+def test_tool_schema_accepts_a_state_or_a_list():
+    schema = mcp._tool_manager.get_tool("get_alerts").parameters
+    variants = schema["properties"]["state"]["anyOf"]
+    assert {"type": "string"} in variants
+    assert {"type": "array", "items": {"type": "string"}} in variants
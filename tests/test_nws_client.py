@@ -82,23 +82,24 @@ async def test_get_alerts_malformed_response(monkeypatch):
 @pytest.mark.asyncio
 async def test_get_alerts_rate_limit_retries(monkeypatch):
     """
-    RED: NWSClient.get_alerts should retry on HTTP 429 (Too Many Requests) and eventually raise after max retries.
+    NWSClient.get_alerts should retry on HTTP 429 (Too Many Requests) and eventually raise after max retries.
+    Retries now happen in the shared upstream pool, in front of every request.
     """
     import httpx
+    from src.weather.http_cache import ResponseCache
+    from src.weather.http_pool import UpstreamPool
+    from src.weather.rate_limit import AdaptiveRateLimiter, RetryPolicy
 
     call_count = {"count": 0}
 
-    class MockResponse:
-        status_code = 429
-
-    async def fake_make_request(self, url):
+    async def fake_send(self, request, stream=False):
         call_count["count"] += 1
-        raise httpx.HTTPStatusError(
-            "429 Too Many Requests", request=None, response=MockResponse()
-        )
+        return httpx.Response(429, headers={"Retry-After": "0"}, request=request)
 
-    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
-    client = NWSClient()
+    # Alerts bodies are streamed, so the pool sends a built request
+    monkeypatch.setattr(httpx.AsyncClient, "send", fake_send)
+    pool = UpstreamPool(limiter=AdaptiveRateLimiter(), retry=RetryPolicy())
+    client = NWSClient(pool=pool, response_cache=ResponseCache())
     with pytest.raises(httpx.HTTPStatusError):
         await client.get_alerts("CA")
     assert call_count["count"] > 1  # Should retry at least once
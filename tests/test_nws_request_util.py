@@ -10,6 +10,9 @@ async def test_make_request_returns_data(monkeypatch):
     """
 
     class DummyResponse:
+        headers = {}
+        content = b"{}"
+
         def __init__(self, json_data, status_code=200):
             self._json = json_data
             self.status_code = status_code
@@ -37,6 +40,9 @@ async def test_make_request_http_error(monkeypatch):
     """
 
     class DummyResponse:
+        headers = {}
+        content = b"{}"
+
         def __init__(self, status_code=500):
             self.status_code = status_code
 
@@ -62,6 +68,9 @@ async def test_make_request_invalid_json(monkeypatch):
     """
 
     class DummyResponse:
+        headers = {}
+        content = b"{}"
+
         def __init__(self, status_code=200):
             self.status_code = status_code
 
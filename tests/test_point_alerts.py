@@ -0,0 +1,184 @@
+"""
+Tests for alert polygons, the spatial index and the get_alerts_for_point tool.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.weather import alerts_index
+from src.weather.alerts_index import AlertsIndex, AlertsSnapshot
+from src.weather.geo import (
+    PolygonIndex,
+    parse_rings,
+    rings_contain,
+    rings_to_geojson,
+)
+from src.weather.models import Alert, alert_parser, normalize_payload
+from src.weather.nws_client import NWSClient
+from src.weather.points_cache import PointResolution
+from src.weather.server import get_alerts_for_point
+
+SQUARE = [[-100.0, 30.0], [-98.0, 30.0], [-98.0, 32.0], [-100.0, 32.0], [-100.0, 30.0]]
+HOLE = [[-99.5, 30.5], [-98.5, 30.5], [-98.5, 31.5], [-99.5, 31.5], [-99.5, 30.5]]
+
+
+def make_feature(event, geometry=None, ugc=()):
+    return {
+        "geometry": geometry,
+        "properties": {
+            "headline": f"{event} headline",
+            "event": event,
+            "severity": "Severe",
+            "areaDesc": "Somewhere",
+            "geocode": {"UGC": list(ugc)},
+        },
+    }
+
+
+NATIONWIDE = {
+    "features": [
+        make_feature(
+            "Flood Warning", {"type": "Polygon", "coordinates": [SQUARE]}, ["TXC201"]
+        ),
+        make_feature(
+            "Heat Advisory",
+            {"type": "Polygon", "coordinates": [SQUARE, HOLE]},
+            ["TXZ213"],
+        ),
+        make_feature("Winter Storm Warning", None, ["TXZ214"]),
+    ]
+}
+
+
+def test_parse_rings_handles_polygons_multipolygons_and_bad_input():
+    rings = parse_rings({"type": "Polygon", "coordinates": [SQUARE, HOLE]})
+    assert len(rings) == 2
+    assert rings[0].shape == (5, 2) and rings[0].dtype == np.float64
+    multi = parse_rings({"type": "MultiPolygon", "coordinates": [[SQUARE], [HOLE]]})
+    assert len(multi) == 2
+    assert parse_rings(None) == ()
+    assert parse_rings({"type": "Point", "coordinates": [0, 0]}) == ()
+    assert parse_rings({"type": "Polygon", "coordinates": [["x"]]}) == ()
+
+
+def test_polygon_index_respects_holes_and_bounding_boxes():
+    square = parse_rings({"type": "Polygon", "coordinates": [SQUARE]})
+    donut = parse_rings({"type": "Polygon", "coordinates": [SQUARE, HOLE]})
+    index = PolygonIndex([(square, "square"), ((), "empty"), (donut, "donut")])
+    assert len(index) == 2
+    assert index.query(-99.8, 30.2) == ["square", "donut"]
+    assert index.query(-99.0, 31.0) == ["square"]
+    assert index.query(-97.0, 31.0) == []
+    assert index.query(0.0, 0.0) == []
+    assert rings_contain(donut, -99.8, 31.9)
+    assert not rings_contain(donut, -99.0, 31.0)
+
+
+def test_rings_to_geojson_rebuilds_polygons():
+    far = [[x + 10.0, y] for x, y in SQUARE]
+    assert rings_to_geojson(()) is None
+    donut = rings_to_geojson(
+        parse_rings({"type": "Polygon", "coordinates": [SQUARE, HOLE]})
+    )
+    assert donut == {"type": "Polygon", "coordinates": [SQUARE, HOLE]}
+    multi = {"type": "MultiPolygon", "coordinates": [[SQUARE, HOLE], [far]]}
+    assert rings_to_geojson(parse_rings(multi)) == multi
+    # An island inside a hole is a polygon of its own
+    island = [[-99.2, 30.8], [-98.8, 30.8], [-98.8, 31.2], [-99.2, 30.8]]
+    nested = {"type": "MultiPolygon", "coordinates": [[SQUARE, HOLE], [island]]}
+    assert rings_to_geojson(parse_rings(nested)) == nested
+
+
+def test_alert_geometry_survives_serialization():
+    alert = Alert.from_feature(NATIONWIDE["features"][1], with_geometry=True)
+    restored = Alert.from_feature(
+        json.loads(json.dumps(alert.to_api())), with_geometry=True
+    )
+    assert len(restored.geometry) == 2
+    assert np.array_equal(restored.geometry[1], alert.geometry[1])
+    assert "geometry" not in Alert.from_feature(NATIONWIDE["features"][2]).to_api()
+
+
+def test_geometry_is_only_kept_for_the_nationwide_feed():
+    feature = NATIONWIDE["features"][0]
+    assert alert_parser(alerts_index.NATIONWIDE_ALERTS_URL)(feature).geometry
+    state_url = f"{alerts_index.NATIONWIDE_ALERTS_URL}?area=TX"
+    assert alert_parser(state_url)(feature).geometry == ()
+    restored = normalize_payload(state_url, {"features": [feature]})
+    assert restored["features"][0].geometry == ()
+
+
+def test_for_point_combines_polygon_and_zone_matches():
+    index = AlertsIndex.build(NATIONWIDE)
+    assert [a.event for a in index.for_point(31.0, -99.0)] == ["Flood Warning"]
+    events = [a.event for a in index.for_point(30.2, -99.8, zones=["TXZ214"])]
+    assert events == ["Flood Warning", "Heat Advisory", "Winter Storm Warning"]
+    # Zone matches only add alerts that have no polygon of their own
+    assert index.for_point(40.0, -80.0, zones=["TXZ213"]) == []
+
+
+@pytest.mark.asyncio
+async def test_tool_answers_from_snapshot_without_upstream_calls(monkeypatch):
+    async def fail_make_request(self, url):
+        raise AssertionError("no upstream call expected")
+
+    snapshot = AlertsSnapshot(enabled=True)
+    snapshot.index = AlertsIndex.build(NATIONWIDE)
+    monkeypatch.setattr(alerts_index, "_shared_alerts_snapshot", snapshot)
+    monkeypatch.setattr(NWSClient, "_make_request", fail_make_request)
+
+    result = await get_alerts_for_point(30.2, -99.8)
+    assert "Flood Warning" in result and "Heat Advisory" in result
+    assert await get_alerts_for_point(45.0, -70.0) == (
+        "No active alerts at this location."
+    )
+    data = json.loads(await get_alerts_for_point(31.0, -99.0, "json"))
+    assert [a["event"] for a in data["alerts"]] == ["Flood Warning"]
+
+
+@pytest.mark.asyncio
+async def test_tool_indexes_nationwide_alerts_once_per_payload(monkeypatch):
+    calls = []
+
+    async def fake_make_request(self, url):
+        calls.append(url)
+        return NATIONWIDE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    snapshot = alerts_index.get_shared_alerts_snapshot()
+    first = await snapshot.lookup_index()
+    # The first lookup started the refresher; the next one is answered locally
+    assert await snapshot.lookup_index() is first
+    assert calls == [alerts_index.NATIONWIDE_ALERTS_URL]
+    assert snapshot._task is not None and not snapshot._task.done()
+
+    client = NWSClient()
+    client.points_cache.put(
+        30.2,
+        -99.8,
+        PointResolution(
+            forecast="https://api.weather.gov/gridpoints/EWX/1,1/forecast",
+            forecast_zone="https://api.weather.gov/zones/forecast/TXZ214",
+        ),
+    )
+    result = await get_alerts_for_point(30.2, -99.8)
+    assert "Winter Storm Warning" in result
+    assert calls == [alerts_index.NATIONWIDE_ALERTS_URL]
+    # Peeking at the zone did not count as a points cache hit
+    assert client.points_cache.hits == client.points_cache.misses == 0
+    await snapshot.stop()
+    assert snapshot._task is None
+
+
+@pytest.mark.asyncio
+async def test_tool_rejects_bad_input_and_reports_fetch_failures(monkeypatch):
+    async def fake_make_request(self, url):
+        return {"features": "nope"}
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    assert "Invalid coordinates" in await get_alerts_for_point(91, 0)
+    assert "Invalid coordinates" in await get_alerts_for_point("x", 0)
+    assert "Invalid response_format" in await get_alerts_for_point(30, -99, "xml")
+    assert "Malformed response" in await get_alerts_for_point(30.2, -99.8)
@@ -0,0 +1,165 @@
+"""
+Tests for the points-to-gridpoint resolution cache.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.weather import points_cache
+from src.weather.nws_client import NWSClient
+from src.weather.points_cache import PointResolution, PointsCache
+from src.weather.server import get_forecast_data
+
+POINTS_RESPONSE = {
+    "properties": {
+        "forecast": "https://api.weather.gov/gridpoints/LOX/154,44/forecast",
+        "forecastHourly": (
+            "https://api.weather.gov/gridpoints/LOX/154,44/forecast/hourly"
+        ),
+        "forecastGridData": "https://api.weather.gov/gridpoints/LOX/154,44",
+        "forecastZone": "https://api.weather.gov/zones/forecast/CAZ368",
+        "gridId": "LOX",
+        "gridX": 154,
+        "gridY": 44,
+    }
+}
+FORECAST_RESPONSE = {
+    "properties": {
+        "periods": [
+            {
+                "name": "Tonight",
+                "temperature": 55,
+                "temperatureUnit": "F",
+                "windSpeed": "5 mph",
+                "windDirection": "W",
+                "detailedForecast": "Clear.",
+            }
+        ]
+    }
+}
+
+
+def test_from_points_response_extracts_urls():
+    resolution = PointResolution.from_points_response(POINTS_RESPONSE)
+    assert resolution.forecast.endswith("/forecast")
+    assert resolution.forecast_hourly.endswith("/forecast/hourly")
+    assert resolution.forecast_grid_data.endswith("/154,44")
+    assert resolution.forecast_zone.endswith("CAZ368")
+    assert (resolution.grid_id, resolution.grid_x, resolution.grid_y) == (
+        "LOX",
+        154,
+        44,
+    )
+
+
+def test_from_points_response_rejects_malformed():
+    with pytest.raises(ValueError):
+        PointResolution.from_points_response({"properties": {}})
+
+
+def test_keys_are_normalized():
+    assert PointsCache.key(34.050001, -118.25) == PointsCache.key(34.05, -118.25)
+    assert PointsCache.key(34.05, -118.25) == "34.05,-118.25"
+
+
+def test_expired_entries_are_dropped():
+    cache = PointsCache(ttl=60)
+    cache.put(1.0, 2.0, PointResolution(forecast="u", resolved_at=0.0))
+    assert cache.get(1.0, 2.0) is None
+    assert len(cache) == 0
+    assert cache.misses == 1
+
+
+def test_max_entries_evicts_oldest():
+    cache = PointsCache(max_entries=2)
+    for i in range(3):
+        cache.put(float(i), 0.0, PointResolution(forecast=f"u{i}"))
+    assert cache.get(0.0, 0.0) is None
+    assert cache.get(2.0, 0.0).forecast == "u2"
+
+
+def test_persistence_round_trip_and_compaction(tmp_path):
+    path = tmp_path / "points.jsonl"
+    cache = PointsCache(path=path)
+    cache.put(1.0, 2.0, PointResolution(forecast="old"))
+    cache.put(1.0, 2.0, PointResolution(forecast="new"))
+    cache.put(3.0, 4.0, PointResolution(forecast="stale", resolved_at=0.0))
+    cache.flush()
+    assert len(path.read_text().splitlines()) == 3
+
+    reloaded = PointsCache(path=path)
+    assert reloaded.get(1.0, 2.0).forecast == "new"
+    assert reloaded.get(3.0, 4.0) is None
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["forecast"] for line in lines] == ["new"]
+
+
+def test_invalidate_survives_restart(tmp_path):
+    path = tmp_path / "points.jsonl"
+    cache = PointsCache(path=path)
+    cache.put(1.0, 2.0, PointResolution(forecast="bad"))
+    cache.put(3.0, 4.0, PointResolution(forecast="good"))
+    cache.invalidate(1.0, 2.0)
+    cache.invalidate(5.0, 6.0)
+    cache.close()
+    assert len(path.read_text().splitlines()) == 3
+
+    reloaded = PointsCache(path=path)
+    assert reloaded.get(1.0, 2.0) is None
+    assert reloaded.get(3.0, 4.0).forecast == "good"
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["forecast"] for line in lines] == ["good"]
+
+
+def test_superseded_lines_trigger_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(points_cache, "COMPACT_MIN_LINES", 4)
+    path = tmp_path / "points.jsonl"
+    cache = PointsCache(path=path)
+    cache.put(1.0, 2.0, PointResolution(forecast="kept"))
+    for i in range(6):
+        cache.put(3.0, 4.0, PointResolution(forecast=f"v{i}"))
+    cache.flush()
+    # The fifth superseded line rewrote the file with the two live entries
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["forecast"] for line in lines] == ["kept", "v5"]
+    cache.put(5.0, 6.0, PointResolution(forecast="next"))
+    cache.close()
+    assert len(path.read_text().splitlines()) == 3
+    assert PointsCache(path=path).get(3.0, 4.0).forecast == "v5"
+
+
+@pytest.mark.asyncio
+async def test_repeat_forecast_skips_points_call(monkeypatch):
+    urls = []
+
+    async def fake_make_request(self, url):
+        urls.append(url)
+        return POINTS_RESPONSE if "/points/" in url else FORECAST_RESPONSE
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    await get_forecast_data(34.05, -118.25)
+    await get_forecast_data(34.05, -118.25)
+    assert urls == [
+        "https://api.weather.gov/points/34.05,-118.25",
+        POINTS_RESPONSE["properties"]["forecast"],
+        POINTS_RESPONSE["properties"]["forecast"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_forecast_error_invalidates_resolution(monkeypatch):
+    calls = {"forecast": 0}
+
+    async def fake_make_request(self, url):
+        if "/points/" in url:
+            return POINTS_RESPONSE
+        calls["forecast"] += 1
+        raise httpx.HTTPStatusError("gone", request=None, response=None)
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    client = NWSClient(points_cache=PointsCache())
+    with pytest.raises(httpx.HTTPStatusError):
+        await get_forecast_data(34.05, -118.25, client=client)
+    assert client.points_cache.get(34.05, -118.25) is None
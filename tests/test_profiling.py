@@ -0,0 +1,140 @@
+"""
+Tests for per-call phase timings, the slow-call log and sampled cProfile.
+"""
+
+import asyncio
+import json
+import logging
+import pstats
+
+import httpx
+import pytest
+
+from src.weather import profiling
+from src.weather.http_pool import UpstreamPool
+from src.weather.nws_client import NWSClient
+from src.weather.profiling import CallProfile, Profiler, phase
+from src.weather.server import get_forecast, make_nws_request, mcp
+
+POINTS = {
+    "properties": {"forecast": "https://api.weather.gov/gridpoints/MTR/85,105/forecast"}
+}
+FORECAST = {
+    "properties": {
+        "periods": [
+            {
+                "name": "Tonight",
+                "temperature": 50,
+                "temperatureUnit": "F",
+                "windSpeed": "5 mph",
+                "windDirection": "W",
+                "detailedForecast": "Clear.",
+            }
+        ]
+    }
+}
+
+
+@pytest.fixture
+def fake_nws(monkeypatch):
+    async def fake_make_request(self, url):
+        return POINTS if "/points/" in url else FORECAST
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+
+
+def test_phase_is_a_no_op_outside_profiled_calls():
+    with phase("points"):
+        pass
+    profile = CallProfile("tool")
+    token = profiling._current.set(profile)
+    try:
+        with phase("decode"):
+            pass
+        with phase("decode"):
+            pass
+    finally:
+        profiling._current.reset(token)
+    assert set(profile.phases) == {"decode"}
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_are_logged_with_phase_breakdown(
+    monkeypatch, caplog, fake_nws
+):
+    monkeypatch.setattr(profiling, "_shared_profiler", Profiler(slow_call_seconds=0))
+    with caplog.at_level(logging.WARNING, logger="weather.slow_calls"):
+        assert "Tonight" in await get_forecast(37.77, -122.42)
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "slow_call"
+    assert record["tool"] == "get_forecast"
+    assert set(record["phases_ms"]) == {"validation", "points", "forecast", "format"}
+    assert record["duration_ms"] >= sum(
+        record["phases_ms"][p] for p in ("validation", "points", "forecast")
+    )
+
+
+@pytest.mark.asyncio
+async def test_fast_calls_and_disabled_profiler_log_nothing(caplog, fake_nws):
+    profiler = Profiler(slow_call_seconds=60)
+    with caplog.at_level(logging.WARNING, logger="weather.slow_calls"):
+        await profiler.call("get_forecast", get_forecast, 37.77, -122.42)
+        await Profiler().call("get_forecast", get_forecast, 37.77, -122.42)
+    assert profiler.slow_calls == 0
+    assert not caplog.records
+    assert not Profiler(sample_rate=1.0).enabled  # no directory to write to
+
+
+@pytest.mark.asyncio
+async def test_sampled_calls_write_cprofile_stats(tmp_path, fake_nws):
+    profiler = Profiler(sample_rate=1.0, profile_dir=tmp_path / "profiles")
+    await profiler.call("get_forecast", get_forecast, 37.77, -122.42)
+    files = list((tmp_path / "profiles").glob("get_forecast-*.prof"))
+    assert len(files) == 1 and profiler.sampled == 1
+    assert pstats.Stats(str(files[0])).total_calls > 0
+
+
+@pytest.mark.asyncio
+async def test_overlapping_calls_are_not_sampled(tmp_path):
+    profiler = Profiler(sample_rate=1.0, profile_dir=tmp_path)
+    first_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow():
+        first_started.set()
+        await release.wait()
+
+    async def quick():
+        release.set()
+
+    first = asyncio.create_task(profiler.call("slow", slow))
+    await first_started.wait()
+    # Starts while the first call's sample is active, so neither is kept
+    await profiler.call("quick", quick)
+    await first
+    assert profiler.sampled == 0 and profiler.discarded == 1
+    assert not list(tmp_path.glob("*.prof"))
+    await profiler.call("quick", quick)
+    assert profiler.sampled == 1
+
+
+def test_profiler_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEATHER_SLOW_CALL_MS", "250")
+    monkeypatch.setenv("WEATHER_PROFILE_SAMPLE_RATE", "0.01")
+    monkeypatch.setenv("WEATHER_PROFILE_DIR", str(tmp_path))
+    profiler = Profiler.from_env()
+    assert profiler.slow_call_seconds == 0.25
+    assert profiler.sample_rate == 0.01 and profiler.enabled
+    schema = mcp._tool_manager.get_tool("get_forecast").parameters
+    assert set(schema["properties"]) == {"latitude", "longitude", "response_format"}
+
+
+@pytest.mark.asyncio
+async def test_make_nws_request_logs_failures(monkeypatch, caplog):
+    async def failing_get(self, url, headers=None):
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(UpstreamPool, "get", failing_get)
+    with caplog.at_level(logging.WARNING, logger="src.weather.server"):
+        assert await make_nws_request("https://api.weather.gov/points/1,2") is None
+    assert "NWS request failed for https://api.weather.gov/points/1,2" in caplog.text
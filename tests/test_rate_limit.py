@@ -0,0 +1,129 @@
+"""
+Tests for the adaptive rate limiter, retry policy and their use in the pool.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from src.weather.http_pool import PoolConfig, UpstreamPool
+from src.weather.rate_limit import (
+    AdaptiveRateLimiter,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("Mon, 01 Jan 2024 12:00:10 GMT", now=1704110400.0) == (
+        10.0
+    )
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    limiter = AdaptiveRateLimiter(rate=100.0, burst=2)
+    started = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+    # Two tokens are available immediately, the next two take ~10ms each
+    assert time.monotonic() - started >= 0.015
+    assert limiter.waits >= 1
+
+
+@pytest.mark.asyncio
+async def test_throttle_halves_rate_pauses_and_recovers():
+    limiter = AdaptiveRateLimiter(rate=10.0, burst=10, increase=1.0)
+    limiter.on_throttle(retry_after=0.05)
+    assert limiter.rate == 5.0
+    started = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - started >= 0.04
+    limiter.on_success()
+    assert limiter.rate == 6.0
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 10.0
+
+
+def test_retry_policy_limits():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_elapsed=10.0)
+    assert 0.0 <= policy.next_delay(0, elapsed=0.0) <= 1.0
+    assert policy.next_delay(2, elapsed=0.0) is None
+    assert policy.next_delay(0, elapsed=9.5, retry_after=1.0) is None
+    assert policy.next_delay(0, elapsed=0.0, retry_after=2.0) == 2.0
+
+
+def test_retry_budget_is_shared_and_refilled_by_requests():
+    policy = RetryPolicy(budget_ratio=0.5, budget_cap=1.0, base_delay=0.0)
+    assert policy.next_delay(0, elapsed=0.0) is not None
+    assert policy.next_delay(0, elapsed=0.0) is None
+    assert policy.budget_exhausted == 1
+    policy.record_request()
+    policy.record_request()
+    assert policy.next_delay(0, elapsed=0.0) is not None
+
+
+def make_pool():
+    return UpstreamPool(
+        PoolConfig(prewarm_connections=0),
+        limiter=AdaptiveRateLimiter(rate=1000.0, burst=100),
+        retry=RetryPolicy(base_delay=0.0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_retries_throttled_responses(monkeypatch):
+    statuses = [429, 503, 200]
+
+    async def fake_get(self, url, headers=None, timeout=None):
+        return httpx.Response(
+            statuses.pop(0),
+            headers={"Retry-After": "0"},
+            request=httpx.Request("GET", url),
+        )
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
+    pool = make_pool()
+    response = await pool.get("https://api.weather.gov/points/1,2")
+    assert response.status_code == 200
+    assert pool.stats()["retries_total"] == 2
+    assert pool.limiter.throttled == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_retries_transport_errors_then_raises(monkeypatch):
+    calls = {"count": 0}
+
+    async def failing_get(self, url, headers=None, timeout=None):
+        calls["count"] += 1
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", failing_get)
+    pool = make_pool()
+    with pytest.raises(httpx.ConnectError):
+        await pool.get("https://api.weather.gov/points/1,2")
+    assert calls["count"] == pool.retry.max_attempts
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_retry_client_errors(monkeypatch):
+    calls = {"count": 0}
+
+    async def fake_get(self, url, headers=None, timeout=None):
+        calls["count"] += 1
+        return httpx.Response(404, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
+    pool = make_pool()
+    response = await pool.get("https://api.weather.gov/points/1,2")
+    assert response.status_code == 404
+    assert calls["count"] == 1
+    await pool.aclose()
@@ -0,0 +1,133 @@
+"""
+Tests for access-frequency tracking and refresh-ahead scheduling.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.weather.http_cache import AccessCounter, ResponseCache
+from src.weather.nws_client import NWSClient
+from src.weather.refresh import RefreshScheduler
+from tests.test_http_cache import FakePool
+
+BASE = "https://api.weather.gov/gridpoints/LWX"
+FORECAST = {"properties": {"periods": []}}
+
+
+def forecast_url(n):
+    return f"{BASE}/{n},70/forecast"
+
+
+def test_access_scores_decay_and_rank():
+    counter = AccessCounter(half_life=10.0)
+    for _ in range(4):
+        counter.record("a", now=0.0)
+    counter.record("b", now=0.0)
+    assert counter.score("a", now=10.0) == pytest.approx(2.0)
+    assert counter.score("missing") == 0.0
+    assert counter.hottest(1.0, now=0.0) == [("a", 4.0), ("b", 1.0)]
+    assert counter.hottest(1.0, now=10.0) == [("a", 2.0)]
+
+
+def test_access_counter_forgets_cold_keys():
+    counter = AccessCounter(half_life=1.0, max_keys=10)
+    for n in range(10):
+        counter.record(f"old{n}", now=0.0)
+    counter.record("hot", now=100.0)
+    assert len(counter) == 1 and counter.score("hot", now=100.0) == 1.0
+    for n in range(20):
+        counter.record(f"k{n}", now=200.0 + n)
+    assert len(counter) <= 10
+
+
+def test_leads_are_spread_and_bounded_by_lifetime():
+    scheduler = RefreshScheduler(lead=20.0, jitter=0.5)
+    leads = {scheduler.lead_for(forecast_url(n), 300.0) for n in range(50)}
+    assert len(leads) == 50
+    assert all(10.0 <= lead <= 20.0 for lead in leads)
+    assert scheduler.lead_for(forecast_url(1), 8.0) <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_tick_revalidates_hot_entries_near_expiry():
+    cache = ResponseCache()
+    now = time.time()
+    hot, cold, later, uncacheable = (forecast_url(n) for n in range(4))
+    for url in (hot, cold, later):
+        cache.store(url, {"cache-control": "max-age=60", "etag": '"v1"'}, FORECAST)
+    cache.store(uncacheable, {"etag": '"v1"'}, FORECAST)
+    cache.peek(later).fresh_until = now + 50
+    for url in (hot, hot, hot, later, later, later, uncacheable, uncacheable, cold):
+        cache.access.record(url)
+    for url in (hot, cold):
+        cache.peek(url).fresh_until = now + 1
+
+    pool = FakePool((304, {"cache-control": "max-age=60"}, None))
+    client = NWSClient(pool=pool, response_cache=cache)
+    scheduler = RefreshScheduler(lead=15.0)
+    assert await scheduler.tick(client, rate=20.0) == 1
+    assert pool.sent_headers == [{"If-None-Match": '"v1"'}]
+    assert cache.peek(hot).fresh_until > now + 50
+    assert cache.stats()["revalidations"] == 1
+    # Refreshing is not counted as a request or a miss
+    assert cache.access.score(hot) < 3.0 and cache.misses == 0
+    assert scheduler.stats() == {"refreshes": 1, "failures": 0, "deferred": 0}
+
+
+@pytest.mark.asyncio
+async def test_refreshes_are_capped_by_the_rate_limit_share():
+    cache = ResponseCache()
+    urls = [forecast_url(n) for n in range(5)]
+    for n, url in enumerate(urls):
+        cache.store(url, {"cache-control": "max-age=1"}, FORECAST, now=time.time() - 1)
+        for _ in range(6 - n):
+            cache.access.record(url)
+    pool = FakePool(*[(200, {"cache-control": "max-age=60"}, FORECAST)] * 2)
+    client = NWSClient(pool=pool, response_cache=cache)
+    scheduler = RefreshScheduler(interval=4.0, share=0.25, min_score=1.0)
+    # 2 requests/second * 4 seconds * 25% = 2 refreshes per pass
+    assert await scheduler.tick(client, rate=2.0) == 2
+    assert cache.peek(urls[0]).lifetime == 60 and cache.peek(urls[1]).lifetime == 60
+    assert cache.peek(urls[2]).lifetime == 1
+    assert scheduler.deferred == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_counted(monkeypatch):
+    cache = ResponseCache()
+    url = forecast_url(1)
+    cache.store(url, {"cache-control": "max-age=1"}, FORECAST, now=time.time() - 1)
+    for _ in range(3):
+        cache.access.record(url)
+
+    async def failing_fetch(self, url, key, refresh=False, entry=None):
+        raise ValueError("bad body")
+
+    monkeypatch.setattr(NWSClient, "_fetch", failing_fetch)
+    scheduler = RefreshScheduler()
+    await scheduler.tick(NWSClient(pool=FakePool(), response_cache=cache), rate=20)
+    assert scheduler.failures == 1 and scheduler.refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_from_env_and_lifecycle(monkeypatch):
+    assert not RefreshScheduler.from_env().enabled
+    monkeypatch.setenv("WEATHER_REFRESH_AHEAD", "1")
+    monkeypatch.setenv("WEATHER_REFRESH_LEAD", "30")
+    monkeypatch.setenv("WEATHER_REFRESH_MIN_HITS", "5")
+    monkeypatch.setenv("WEATHER_REFRESH_SHARE", "0.1")
+    scheduler = RefreshScheduler.from_env()
+    assert scheduler.enabled and scheduler.lead == 30
+    assert scheduler.min_score == 5 and scheduler.share == 0.1
+
+    scheduler.interval = 0.001
+    scheduler.start()
+    scheduler.start()
+    await asyncio.sleep(0.01)
+    await scheduler.stop()
+    assert scheduler._task is not None
+    await scheduler.stop()
+    assert scheduler._task is None
+    RefreshScheduler().start()
@@ -0,0 +1,122 @@
+"""
+Tests for the text/JSON renderers and their memoization.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.weather import render
+from src.weather.models import Alert, ForecastPeriod
+from src.weather.nws_client import NWSClient
+from src.weather.render import (
+    RenderCache,
+    add_json_fields,
+    alert_text,
+    render_alerts,
+    render_forecast,
+    render_message,
+)
+from src.weather.server import get_alerts, get_forecast
+
+FIXTURES = Path(__file__).parent / "fixtures"
+POINTS = {
+    "properties": {"forecast": "https://api.weather.gov/gridpoints/MTR/85,105/forecast"}
+}
+
+
+def load(name):
+    return json.loads((FIXTURES / name).read_text())
+
+
+def sample_alerts():
+    return [
+        Alert.from_feature(f) for f in load("sample_alerts_response.json")["features"]
+    ]
+
+
+def sample_periods():
+    raw = load("sample_forecast_response.json")["properties"]["periods"]
+    return [ForecastPeriod.from_api(p) for p in raw]
+
+
+def test_text_has_no_indentation():
+    text = render_alerts(sample_alerts())
+    assert text.startswith("Headline: ")
+    assert all(not line.startswith(" ") for line in text.splitlines())
+    forecast = render_forecast(sample_periods())
+    assert forecast.count("\n---\n") == min(5, len(sample_periods())) - 1
+    assert all(not line.startswith(" ") for line in forecast.splitlines())
+
+
+def test_alert_text_placeholders():
+    text = alert_text(Alert.from_feature({"properties": {}}))
+    assert "Headline: No headline available" in text
+    assert "Instructions: No specific instructions provided" in text
+
+
+def test_json_output_is_compact_and_omits_missing_fields():
+    alerts = [Alert.from_feature({"properties": {"event": "Flood"}})]
+    rendered = render_alerts(alerts, "json")
+    assert rendered == '{"alerts":[{"event":"Flood"}]}'
+    periods = json.loads(render_forecast(sample_periods(), "json"))["periods"]
+    assert len(periods) == min(5, len(sample_periods()))
+    assert set(periods[0]) == {"name", "temperature", "unit", "wind", "forecast"}
+
+
+def test_render_cache_reuses_strings_for_the_same_objects():
+    cache = RenderCache(max_entries=2)
+    alerts = sample_alerts()
+    first = cache.render("alerts", "text", alerts)
+    assert cache.render("alerts", "text", list(alerts)) is first
+    # Equal but distinct objects come from a new payload version
+    assert cache.render("alerts", "text", sample_alerts()) == first
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 2}
+    cache.render("alerts", "json", alerts)
+    assert len(cache) == 2
+
+
+def test_messages_and_json_fields():
+    assert render_message("oops") == "oops"
+    assert json.loads(render_message("oops", "json", error=True)) == {
+        "message": "oops",
+        "error": True,
+    }
+    assert add_json_fields('{"a":1}', stale=3) == '{"stale":3,"a":1}'
+    assert add_json_fields("{}", stale=3) == '{"stale":3}'
+    assert add_json_fields('{"a":1}') == '{"a":1}'
+
+
+@pytest.mark.asyncio
+async def test_tools_support_json_output(monkeypatch):
+    alerts = load("sample_alerts_response.json")
+    forecast = load("sample_forecast_response.json")
+
+    async def fake_make_request(self, url):
+        if "/alerts/" in url:
+            return alerts
+        return POINTS if "/points/" in url else forecast
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    data = json.loads(await get_alerts("CA", response_format="json"))
+    assert data["alerts"][0]["event"] == "Small Craft Advisory"
+    data = json.loads(await get_forecast(37.77, -122.42, response_format="json"))
+    assert data["periods"][0]["name"] == forecast["properties"]["periods"][0]["name"]
+    data = json.loads(await get_forecast(999, 0, response_format="json"))
+    assert data["error"] is True
+    assert "Invalid response_format" in await get_alerts("CA", response_format="xml")
+    assert "Invalid response_format" in await get_forecast(1, 2, response_format="")
+
+
+@pytest.mark.asyncio
+async def test_repeat_alerts_reuse_rendered_output(monkeypatch):
+    payload = {"features": sample_alerts()}
+
+    async def fake_make_request(self, url):
+        return payload
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    first = await get_alerts("CA")
+    assert await get_alerts("CA") is first
+    assert render.get_shared_render_cache().hits == 1
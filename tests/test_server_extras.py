@@ -12,6 +12,7 @@ from src.weather.server import (
     get_forecast_data,
 )
 from src.weather.nws_client import NWSClient
+from src.weather.http_pool import UpstreamPool, get_shared_pool
 
 
 @pytest.mark.asyncio
@@ -35,50 +36,34 @@ async def test_make_nws_request_errors(monkeypatch, error_type, error_value):
                 raise error_value
             return {}
 
-    class DummyClient:
-        async def __aenter__(self):
-            return self
+    async def dummy_get(self, url, headers=None):
+        if error_type in ("request", "generic"):
+            raise error_value
+        return DummyResponse()
 
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
-
-        async def get(self, url, headers=None, timeout=None):
-            return DummyResponse()
-
-    monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
+    monkeypatch.setattr(UpstreamPool, "get", dummy_get)
     assert await make_nws_request("http://dummy") is None
 
 
 @pytest.mark.asyncio
-async def test_make_nws_request_request_error(monkeypatch):
-    class DummyClient:
-        async def __aenter__(self):
-            return self
+async def test_make_nws_request_uses_shared_pool(monkeypatch):
+    seen = []
 
-        async def __aexit__(self, exc_type, exc, tb):
+    class DummyResponse:
+        def raise_for_status(self):
             pass
 
-        async def get(self, url, headers=None, timeout=None):
-            raise httpx.RequestError("network")
-
-    monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
-    assert await make_nws_request("http://dummy") is None
-
-
-@pytest.mark.asyncio
-async def test_make_nws_request_generic_error(monkeypatch):
-    class DummyClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
+        def json(self):
+            return {"ok": True}
 
-        async def get(self, url, headers=None, timeout=None):
-            raise Exception("oops")
+    async def dummy_get(self, url, headers=None):
+        seen.append(self)
+        return DummyResponse()
 
-    monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
-    assert await make_nws_request("http://dummy") is None
+    monkeypatch.setattr(UpstreamPool, "get", dummy_get)
+    assert await make_nws_request("http://dummy") == {"ok": True}
+    assert await make_nws_request("http://dummy") == {"ok": True}
+    assert seen[0] is seen[1] is get_shared_pool()
 
 
 @pytest.mark.asyncio
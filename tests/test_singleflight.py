@@ -0,0 +1,99 @@
+"""
+Tests for coalescing of identical in-flight requests.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.weather.http_cache import ResponseCache
+from src.weather.nws_client import NWSClient
+from src.weather.singleflight import SingleFlight, canonical_url
+
+
+def test_canonical_url_sorts_query_and_lowercases_host():
+    assert canonical_url("HTTPS://API.Weather.gov/alerts?b=2&a=1") == (
+        "https://api.weather.gov/alerts?a=1&b=2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def work():
+        calls.append(1)
+        await release.wait()
+        return {"value": 42}
+
+    waiters = [asyncio.create_task(flights.do("k", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_shared_call_running():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flights.do("k", work))
+    second = asyncio.create_task(flights.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flights.do("k", work), flights.do("k", work), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_nws_client_coalesces_identical_urls():
+    class SlowPool:
+        calls = 0
+
+        async def get(self, url, headers=None):
+            SlowPool.calls += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200, json={"features": []}, request=httpx.Request("GET", url)
+            )
+
+    client = NWSClient(
+        pool=SlowPool(), response_cache=ResponseCache(), singleflight=SingleFlight()
+    )
+    results = await asyncio.gather(
+        *(
+            client._make_request(
+                "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+            )
+            for _ in range(10)
+        )
+    )
+    assert SlowPool.calls == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,107 @@
+"""
+Tests for the size-aware W-TinyLFU cache and its hit-ratio benchmark.
+"""
+
+import random
+
+from benchmarks.bench_cache import LRUCache, load_trace, run, synthetic_trace
+from src.weather.tinylfu import FrequencySketch, WTinyLFUCache
+
+
+def test_sketch_counts_saturate_and_age():
+    sketch = FrequencySketch(width=64)
+    for _ in range(20):
+        sketch.increment("hot")
+    sketch.increment("warm")
+    assert sketch.frequency("hot") == 15
+    assert sketch.frequency("warm") >= 1
+    assert sketch.frequency("never") <= 1
+    sketch.reset()
+    assert sketch.frequency("hot") == 7 and sketch.resets == 1
+
+
+def test_sketch_halves_after_sample_size():
+    sketch = FrequencySketch(width=16)
+    for n in range(sketch.sample_size):
+        sketch.increment(n)
+    assert sketch.resets == 1
+
+
+def test_hot_entries_survive_a_huge_one_off_fetch():
+    cache = WTinyLFUCache(max_weight=1000)
+    for key in "abcd":
+        cache.put(key, key, 200)
+        for _ in range(3):
+            cache.get(key)
+    assert cache.put("nationwide", "big", 900)
+    assert cache.get("nationwide") is None
+    assert all(cache.get(key) == key for key in "abcd")
+    assert cache.rejections == 1 and cache.weight == 800
+    # Larger than the whole cache: refused outright
+    assert not cache.put("huge", "x", 5000)
+    assert "huge" not in cache
+
+
+def test_frequent_newcomer_displaces_cold_entries():
+    cache = WTinyLFUCache(max_weight=1000)
+    for key in "abcd":
+        cache.put(key, key, 240)
+    for _ in range(5):
+        cache.get("new")
+    cache.put("new", "new", 400)
+    assert cache.peek("new") == "new"
+    assert cache.weight <= 1000
+    assert cache.evictions == 2 and cache.stats()["evicted_bytes"] == 480
+
+
+def test_probation_hits_are_promoted_and_replacement_keeps_position():
+    cache = WTinyLFUCache(max_weight=1000, protected_share=0.5)
+    for key in "abc":
+        cache.put(key, 1, 300)
+    cache.get("a")
+    cache.get("b")
+    assert list(cache._protected) == ["b"] and "a" in cache._probation
+    cache.put("b", 2, 320)
+    assert cache.peek("b") == 2 and "b" in cache._protected
+    assert cache.weight == 920
+    assert cache.pop("b") == 2 and cache.pop("b") is None
+    cache.clear()
+    assert len(cache) == 0 and cache.weight == 0
+
+
+def test_weight_bound_holds_under_random_operations():
+    rng = random.Random(7)
+    cache = WTinyLFUCache(max_weight=50_000)
+    for _ in range(20_000):
+        key = rng.randint(0, 300)
+        if rng.random() < 0.6:
+            cache.get(key)
+        elif rng.random() < 0.95:
+            cache.put(key, key, rng.randint(1, 20_000))
+        else:
+            cache.pop(key)
+        assert cache.weight <= cache.max_weight
+    counted = sum(
+        weight
+        for segment in (cache._window, cache._probation, cache._protected)
+        for _, weight in segment.values()
+    )
+    assert counted == cache.weight
+
+
+def test_tinylfu_beats_lru_on_synthetic_traces(tmp_path):
+    traces = {
+        kind: synthetic_trace(kind, requests=10_000, seed=3)
+        for kind in ("zipf+nationwide", "zipf+scan")
+    }
+    for row in run(traces, [8.0]):
+        assert row["w_tinylfu"]["hit_ratio"] > row["lru"]["hit_ratio"]
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"key": "a", "size": 10}\n\n{"key": "a", "size": 10}\n')
+    assert load_trace(path) == [("a", 10), ("a", 10)]
+    lru = LRUCache(100)
+    assert not lru.put("big", 1, 200)
+    lru.put("a", 1, 60)
+    lru.put("a", 2, 60)
+    lru.put("b", 3, 60)
+    assert lru.get("a") is None and lru.get("b") == 3
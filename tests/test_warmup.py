@@ -0,0 +1,133 @@
+"""
+Tests for pre-warming caches from a configured hot set.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.weather import warmup
+from src.weather.health import LoopLagMonitor, ReadinessConfig, readiness
+from src.weather.nws_client import NWSClient
+from src.weather.warmup import DISABLED, DONE, PENDING, HotSet, Warmup
+
+FORECAST_URL = "https://api.weather.gov/gridpoints/LWX/96,70/forecast"
+POINTS = {"properties": {"forecast": FORECAST_URL}}
+FORECAST = {"properties": {"periods": []}}
+ALERTS = {"features": []}
+
+
+@pytest.fixture
+def fake_nws(monkeypatch):
+    """Record upstream URLs, tracking peak concurrency."""
+    calls = {"urls": [], "active": 0, "peak": 0}
+
+    async def fake_make_request(self, url):
+        calls["urls"].append(url)
+        calls["active"] += 1
+        calls["peak"] = max(calls["peak"], calls["active"])
+        await asyncio.sleep(0.001)
+        calls["active"] -= 1
+        if "area=ZZ" in url:
+            raise httpx.ConnectError("down")
+        if "/points/" in url:
+            return POINTS
+        return ALERTS if "/alerts/" in url else FORECAST
+
+    monkeypatch.setattr(NWSClient, "_make_request", fake_make_request)
+    return calls
+
+
+def test_hot_set_skips_invalid_and_duplicate_entries():
+    hot_set = HotSet.from_dict(
+        {
+            "coordinates": [
+                [38.9, -77.0],
+                {"latitude": 40.7, "longitude": -74.0},
+                [38.9, -77.0],
+                [95, 0],
+                ["x", 1],
+                {"latitude": 1},
+            ],
+            "states": ["CA", "ca", 5, "ZZ", "CA", "TX"],
+        }
+    )
+    assert hot_set.coordinates == [(38.9, -77.0), (40.7, -74.0)]
+    assert hot_set.states == ["CA", "TX"]
+    assert len(hot_set) == 4
+    assert Warmup(HotSet()).state == DISABLED
+
+
+@pytest.mark.asyncio
+async def test_warmup_prefetches_with_bounded_concurrency(fake_nws):
+    hot_set = HotSet([(30.0 + n, -90.0) for n in range(6)], ["CA", "TX", "ZZ"])
+    prewarm = Warmup(hot_set, concurrency=2)
+    await prewarm.run()
+    assert fake_nws["peak"] <= 2
+    urls = fake_nws["urls"]
+    assert sum("/points/" in url for url in urls) == 6
+    assert urls.count(FORECAST_URL) == 6
+    assert sum("/alerts/active?area=" in url for url in urls) == 3
+    progress = prewarm.progress()
+    assert progress["state"] == DONE
+    assert (progress["total"], progress["completed"], progress["failed"]) == (
+        9,
+        8,
+        1,
+    )
+    # Point resolutions are now answered locally
+    client = NWSClient()
+    await client.resolve_point(30.0, -90.0)
+    assert sum("/points/" in url for url in fake_nws["urls"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_warmup_and_can_wait_for_it(monkeypatch, fake_nws):
+    prewarm = Warmup(HotSet([(38.9, -77.0)], ["CA"]))
+    monkeypatch.setattr(warmup, "_shared_warmup", prewarm)
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig())
+    assert ready and report["checks"]["warmup"]["state"] == PENDING
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig(require_warmup=True))
+    assert not ready and report["checks"]["warmup"]["ok"] is False
+
+    prewarm.start()
+    await prewarm._task
+    ready, report = readiness(LoopLagMonitor(), ReadinessConfig(require_warmup=True))
+    assert ready
+    assert report["checks"]["warmup"]["completed"] == 2
+    await prewarm.stop()
+    assert prewarm.state == DONE
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_an_unfinished_warmup(monkeypatch):
+    started = asyncio.Event()
+
+    async def hanging_request(self, url):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(NWSClient, "_make_request", hanging_request)
+    prewarm = Warmup(HotSet(states=["CA"]))
+    prewarm.start()
+    prewarm.start()
+    await started.wait()
+    await prewarm.stop()
+    assert prewarm._task is not None
+    await prewarm.stop()
+    assert prewarm._task is None and prewarm.state == PENDING
+
+
+def test_from_env(monkeypatch, tmp_path, caplog):
+    assert Warmup.from_env().state == DISABLED
+    path = tmp_path / "hot.json"
+    path.write_text(json.dumps({"coordinates": [[38.9, -77.0]], "states": ["CA"]}))
+    monkeypatch.setenv("WEATHER_WARMUP_FILE", str(path))
+    monkeypatch.setenv("WEATHER_WARMUP_CONCURRENCY", "16")
+    prewarm = Warmup.from_env()
+    assert prewarm.concurrency == 16 and len(prewarm.hot_set) == 2
+    monkeypatch.setenv("WEATHER_WARMUP_FILE", str(tmp_path / "missing.json"))
+    assert Warmup.from_env().state == DISABLED
+    assert "not loaded" in caplog.text